@@ -8,26 +8,44 @@ This package provides services for generating AI summaries of video content:
 - Background task management
 """
 
-# Lazy imports to avoid NumPy compatibility issues on startup
+# Lazy imports to avoid NumPy compatibility issues on startup.
+# Resolved classes are cached so later calls skip the import machinery.
+_AUDIO_CLS = None
+_TRANSCRIPTION_CLS = None
+_SUMMARIZATION_CLS = None
+_TASK_QUEUE_GETTER = None
+
 def get_audio_service():
     """Lazy import of AudioExtractionService"""
-    from .audio_extraction import AudioExtractionService
-    return AudioExtractionService
+    global _AUDIO_CLS
+    if _AUDIO_CLS is None:
+        from .audio_extraction import AudioExtractionService
+        _AUDIO_CLS = AudioExtractionService
+    return _AUDIO_CLS
 
 def get_transcription_service():
     """Lazy import of TranscriptionService"""
-    from .transcription import TranscriptionService
-    return TranscriptionService
+    global _TRANSCRIPTION_CLS
+    if _TRANSCRIPTION_CLS is None:
+        from .transcription import TranscriptionService
+        _TRANSCRIPTION_CLS = TranscriptionService
+    return _TRANSCRIPTION_CLS
 
 def get_summarization_service():
     """Lazy import of SummarizationService"""
-    from .summarization import SummarizationService
-    return SummarizationService
+    global _SUMMARIZATION_CLS
+    if _SUMMARIZATION_CLS is None:
+        from .summarization import SummarizationService
+        _SUMMARIZATION_CLS = SummarizationService
+    return _SUMMARIZATION_CLS
 
 def get_task_queue():
     """Lazy import of TaskQueue"""
-    from .task_queue import TaskQueue, get_task_queue
-    return get_task_queue()
+    global _TASK_QUEUE_GETTER
+    if _TASK_QUEUE_GETTER is None:
+        from .task_queue import get_task_queue as _get_task_queue
+        _TASK_QUEUE_GETTER = _get_task_queue
+    return _TASK_QUEUE_GETTER()
 
 __all__ = [
     'get_audio_service',
@@ -3,24 +3,91 @@ Audio Extraction Service
 
 Extracts audio from video files using ffmpeg for transcription processing.
 """
+import functools
 import os
 import re
+import shutil
 import subprocess
+import sys
 import tempfile
 import logging
-from typing import Dict, Optional, List
+import threading
+import wave
+from collections import deque
+from typing import Any, Dict, Optional, List, NamedTuple, Tuple, Iterable, Iterator
 from pathlib import Path
 
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional; stdlib json parses the same output
+    import json as _json
+
 logger = logging.getLogger(__name__)
 
+# Duration line in ffmpeg stderr, e.g. "Duration: 00:02:30.45"
+_DURATION_RE = re.compile(r'Duration: (\d{2}):(\d{2}):(\d{2})\.(\d{2})')
+# Characters not allowed in generated audio filenames
+_UNSAFE_CHARS_RE = re.compile(r'[^\w\-_.]')
+# Header line that starts each input's block in ffmpeg stderr, e.g. "Input #1, mov,mp4,..."
+_INPUT_RE = re.compile(r'Input #(\d+),')
+# Number of trailing stderr lines kept for error reporting
+_STDERR_TAIL_LINES = 20
+# Priority wrappers for ffmpeg, resolved once (either may be missing in slim images)
+_NICE = shutil.which('nice')
+_IONICE = shutil.which('ionice')
+# Known ffmpeg failures, matched in a single pass over stderr
+_FFMPEG_ERROR_RE = re.compile(
+    r'(?P<not_found>No such file or directory)'
+    r'|(?P<no_audio>Stream map.*?matches no streams)'
+    r'|(?P<corrupted>Invalid data found when processing input)'
+    r'|(?P<permission>Permission denied)'
+    r'|(?P<decoder>Decoder.*?not found)',
+    re.DOTALL
+)
+_FFMPEG_ERROR_MESSAGES = {
+    'not_found': "Video file not found or cannot be accessed",
+    'no_audio': "No audio track found in video file",
+    'corrupted': "Video file appears to be corrupted or in unsupported format",
+    'permission': "Permission denied accessing video file",
+    'decoder': "Video format not supported by ffmpeg",
+}
+
+
+class AudioResult(NamedTuple):
+    """Outcome of an audio extraction"""
+    success: bool
+    audio_path: Optional[str]
+    duration_seconds: Optional[float]
+    error: Optional[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict form, for callers that still expect the old result shape"""
+        return self._asdict()
+
+
+# Shared results for the fixed-message failures
+_NO_AUDIO_RESULT = AudioResult(False, None, None, 'No audio track found in video file')
+_EMPTY_OUTPUT_RESULT = AudioResult(
+    False, None, None, 'Audio extraction produced empty file - video may have no audio track'
+)
+
 
 class AudioExtractionService:
     """Service for extracting audio from video files using ffmpeg"""
     
     def __init__(self):
         self.temp_dir = tempfile.gettempdir()
+        # Keep ffmpeg from taking every core and starving the web worker on the
+        # same host; audio-only decode is mostly I/O bound so this costs little
+        self.threads = int(os.environ.get("FFMPEG_THREADS", max(1, (os.cpu_count() or 2) // 2)))
+        # Run ffmpeg under nice/ionice (POSIX only)
+        self.nice = os.environ.get("FFMPEG_NICE", "1") != "0"
+        # Output directories already created/verified, so makedirs runs once per dir
+        self._known_dirs: set = set()
         
-    def extract_audio(self, video_path: str, output_dir: str = None, timeout: int = 300) -> Dict[str, any]:
+    def extract_audio(self, video_path: str, output_dir: str = None, timeout: int = 300,
+                      threads: Optional[int] = None, nice: Optional[bool] = None,
+                      video_info: Optional[Dict[str, any]] = None) -> AudioResult:
         """
         Extract audio from video file using ffmpeg
         
@@ -28,114 +95,233 @@ class AudioExtractionService:
             video_path: Path to the input video file
             output_dir: Directory to save extracted audio (default: temp dir)
             timeout: Maximum processing time in seconds
+            threads: ffmpeg -threads cap (default: self.threads; 0 for no cap)
+            nice: Run ffmpeg at lower CPU/IO priority (default: self.nice)
+            video_info: Result of get_video_info() the caller already has;
+                skips the existence check and probe
             
         Returns:
-            Dict with success status, audio path, duration, and any errors
+            AudioResult with success status, audio path, duration, and any errors
         """
         try:
-            # Validate input file exists
-            if not os.path.exists(video_path):
-                return {
-                    'success': False,
-                    'audio_path': None,
-                    'duration_seconds': None,
-                    'error': f'Video file not found: {video_path}'
-                }
+            if video_info is None:
+                # Validate input file exists
+                try:
+                    stat = os.stat(video_path)
+                except FileNotFoundError:
+                    return AudioResult(False, None, None, f'Video file not found: {video_path}')
+                
+                # Probe first: audioless videos are rejected without running ffmpeg,
+                # and the probed duration replaces stderr parsing
+                video_info = self.get_video_info(video_path, stat=stat)
+            if video_info['success'] and not video_info['has_audio']:
+                logger.info(f"No audio stream in {video_path}, skipping extraction")
+                return _NO_AUDIO_RESULT
+            if not video_info['success']:
+                logger.warning(f"ffprobe failed for {video_path}, parsing duration from ffmpeg output")
             
-            output_dir = output_dir or self.temp_dir
+            # Ensure output directory exists
+            output_dir = self._ensure_output_dir(output_dir or self.temp_dir)
             
             # Generate safe output filename
             safe_filename = self._get_safe_filename(video_path)
             audio_path = os.path.join(output_dir, safe_filename)
             
-            # Ensure output directory exists
-            os.makedirs(output_dir, exist_ok=True)
-            
             # ffmpeg command to extract audio as WAV (good for Whisper)
-            cmd = [
-                'ffmpeg',
-                '-i', video_path,
-                '-vn',  # No video
-                '-acodec', 'pcm_s16le',  # PCM 16-bit little-endian
-                '-ar', '16000',  # 16kHz sample rate (optimal for Whisper)
-                '-ac', '1',  # Mono
-                '-y',  # Overwrite output file if it exists
-                audio_path
-            ]
+            cmd = self._ffmpeg_prefix(threads, nice) + ['-nostdin']
+            if video_info['success']:
+                # Duration is already known, so only errors are needed on stderr
+                cmd.extend(['-nostats', '-loglevel', 'error'])
+            cmd.extend(['-i', video_path, '-vn'])  # No video
+            cmd.extend(self._get_audio_codec_args(video_info))
+            cmd.extend(['-y', audio_path])  # Overwrite output file if it exists
             
             logger.info(f"Extracting audio from {video_path} to {audio_path}")
             
             # Run ffmpeg with timeout
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            returncode, durations, stderr_tail = self._run_ffmpeg(cmd, timeout)
             
-            if result.returncode != 0:
-                error_msg = self._parse_ffmpeg_error(result.stderr)
+            if returncode != 0:
+                error_msg = self._parse_ffmpeg_error(stderr_tail)
                 logger.error(f"FFmpeg failed: {error_msg}")
-                return {
-                    'success': False,
-                    'audio_path': None,
-                    'duration_seconds': None,
-                    'error': error_msg
-                }
+                return AudioResult(False, None, None, error_msg)
             
             # Check if output file was created and has content
-            if not os.path.exists(audio_path) or os.path.getsize(audio_path) == 0:
-                return {
-                    'success': False,
-                    'audio_path': None,
-                    'duration_seconds': None,
-                    'error': 'Audio extraction produced empty file - video may have no audio track'
-                }
+            if self._get_file_size(audio_path) == 0:
+                return _EMPTY_OUTPUT_RESULT
             
-            # Parse duration from ffmpeg output
-            duration = self._parse_duration(result.stderr)
+            if video_info['success']:
+                duration = video_info['duration']
+            else:
+                duration = durations.get(0)
             
             logger.info(f"Successfully extracted audio: {audio_path} ({duration}s)")
             
-            return {
-                'success': True,
-                'audio_path': audio_path,
-                'duration_seconds': duration,
-                'error': None
-            }
+            return AudioResult(True, audio_path, duration, None)
             
         except subprocess.TimeoutExpired:
             logger.error(f"Audio extraction timeout after {timeout}s")
-            return {
-                'success': False,
-                'audio_path': None,
-                'duration_seconds': None,
-                'error': f'Audio extraction timeout after {timeout} seconds'
-            }
+            return AudioResult(False, None, None, f'Audio extraction timeout after {timeout} seconds')
         except Exception as e:
             logger.error(f"Audio extraction failed: {str(e)}")
-            return {
-                'success': False,
-                'audio_path': None,
-                'duration_seconds': None,
-                'error': f'Audio extraction failed: {str(e)}'
-            }
-    
-    def _get_safe_filename(self, video_path: str) -> str:
-        """Generate a safe filename for the extracted audio file"""
-        base_name = os.path.basename(video_path)
-        name_without_ext = os.path.splitext(base_name)[0]
+            return AudioResult(False, None, None, f'Audio extraction failed: {str(e)}')
+
+    def extract_audio_segments(self, video_path: str, output_dir: str = None, segment_seconds: int = 60,
+                               timeout: int = 300,
+                               video_info: Optional[Dict[str, any]] = None,
+                               overlap_seconds: float = 0) -> Iterator[Tuple[float, float, str]]:
+        """
+        Extract audio as consecutive fixed-length WAV segments
+
+        ffmpeg's segment muxer reports each segment on stdout as soon as it is
+        closed, so callers can start transcribing the first chunk while the
+        rest of the file is still being decoded.
+
+        Args:
+            video_path: Path to the input video file
+            output_dir: Directory for the segment files (default: temp dir)
+            segment_seconds: Target segment length in seconds
+            timeout: Maximum ffmpeg run time in seconds
+            video_info: Result of get_video_info() the caller already has;
+                skips the existence check and probe
+            overlap_seconds: Prepend this much of the previous segment's audio
+                to each segment, so words cut at a boundary appear whole in
+                one of the two
+
+        Yields:
+            (start_seconds, end_seconds, segment_path) in playback order; with
+            overlap, start_seconds includes the prepended audio
+
+        Raises:
+            FileNotFoundError: if the video file does not exist
+            RuntimeError: if the video has no audio or ffmpeg fails
+        """
+        if video_info is None:
+            try:
+                stat = os.stat(video_path)
+            except FileNotFoundError:
+                raise FileNotFoundError(f'Video file not found: {video_path}') from None
+            video_info = self.get_video_info(video_path, stat=stat)
+        if video_info['success'] and not video_info['has_audio']:
+            raise RuntimeError(_NO_AUDIO_RESULT.error)
+
+        output_dir = self._ensure_output_dir(output_dir or self.temp_dir)
+        stem = os.path.splitext(self._get_safe_filename(video_path))[0]
+        cmd = self._ffmpeg_prefix() + [
+            '-nostdin', '-nostats', '-loglevel', 'error',
+            '-i', video_path,
+            '-vn'
+        ]
+        cmd.extend(self._get_audio_codec_args(video_info))
+        cmd.extend([
+            '-f', 'segment',
+            '-segment_time', str(segment_seconds),
+            '-reset_timestamps', '1',
+            '-segment_list', 'pipe:1',
+            '-segment_list_type', 'csv',
+            '-y', os.path.join(output_dir, f'{stem}_%05d.wav')
+        ])
+
+        logger.info(f"Extracting {segment_seconds}s audio segments from {video_path} to {output_dir}")
+
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        tail = deque(maxlen=_STDERR_TAIL_LINES)
+        reader = threading.Thread(target=lambda: tail.extend(proc.stderr), daemon=True)
+        reader.start()
+        killer = threading.Timer(timeout, proc.kill)
+        killer.daemon = True
+        killer.start()
+        try:
+            yielded = False
+            prev_tail = b''
+            # One "name,start,end" line per finished segment
+            for line in proc.stdout:
+                name, start, end = line.strip().rsplit(',', 2)
+                segment_path = os.path.join(output_dir, name)
+                start = float(start)
+                if overlap_seconds > 0:
+                    prev_tail, prepended = self._prepend_overlap(segment_path, prev_tail, overlap_seconds)
+                    start -= prepended
+                yielded = True
+                yield start, float(end), segment_path
+            proc.wait()
+            reader.join(timeout=5)
+            if proc.returncode != 0:
+                if not killer.is_alive():
+                    raise RuntimeError(f'Audio extraction timeout after {timeout} seconds')
+                raise RuntimeError(self._parse_ffmpeg_error(''.join(tail)))
+            if not yielded:
+                raise RuntimeError(_EMPTY_OUTPUT_RESULT.error)
+        finally:
+            killer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+
+    @staticmethod
+    def _prepend_overlap(segment_path: str, prev_tail: bytes, overlap_seconds: float) -> Tuple[bytes, float]:
+        """
+        Rewrite a WAV segment with prev_tail in front of its own frames
+
+        Returns:
+            (this segment's last overlap_seconds of frames, seconds prepended)
+        """
+        with wave.open(segment_path, 'rb') as wav:
+            params = wav.getparams()
+            frames = wav.readframes(params.nframes)
+        frame_bytes = params.sampwidth * params.nchannels
+        tail_bytes = int(overlap_seconds * params.framerate) * frame_bytes
+        if prev_tail:
+            with wave.open(segment_path, 'wb') as wav:
+                wav.setparams(params)
+                wav.writeframes(prev_tail + frames)
+        return (frames[-tail_bytes:] if tail_bytes else b''), len(prev_tail) / (frame_bytes * params.framerate)
+
+    def _ffmpeg_prefix(self, threads: Optional[int] = None, nice: Optional[bool] = None) -> List[str]:
+        """Build the ffmpeg argv prefix with priority wrappers and thread cap"""
+        threads = self.threads if threads is None else threads
+        nice = self.nice if nice is None else nice
+        
+        prefix = []
+        if nice and sys.platform != 'win32':
+            if _IONICE:
+                prefix.extend([_IONICE, '-c', '2', '-n', '7'])  # Lowest best-effort IO priority
+            if _NICE:
+                prefix.extend([_NICE, '-n', '10'])
+        prefix.append('ffmpeg')
+        if threads:
+            prefix.extend(['-threads', str(threads)])
+        return prefix
+
+    def _get_audio_codec_args(self, video_info: Dict[str, any]) -> List[str]:
+        """Build ffmpeg audio args, skipping conversions the source doesn't need"""
+        if not video_info.get('success'):
+            # Unknown source format: always convert to 16kHz mono PCM
+            return ['-acodec', 'pcm_s16le', '-ar', '16000', '-ac', '1']
         
-        # Replace unsafe characters with underscores
-        safe_name = re.sub(r'[^\w\-_.]', '_', name_without_ext)
+        needs_resample = video_info.get('audio_sample_rate') != 16000
+        needs_downmix = video_info.get('audio_channels') != 1
+        if video_info.get('audio_codec') == 'pcm_s16le' and not needs_resample and not needs_downmix:
+            # Already what Whisper wants; just remux into the WAV container
+            return ['-c:a', 'copy']
         
-        return f"{safe_name}.wav"
+        args = ['-acodec', 'pcm_s16le']  # PCM 16-bit little-endian
+        if needs_resample:
+            args.extend(['-ar', '16000'])  # 16kHz sample rate (optimal for Whisper)
+        if needs_downmix:
+            args.extend(['-ac', '1'])  # Mono
+        return args
+
+    def _get_safe_filename(self, video_path: str) -> str:
+        """Generate a safe filename for the extracted audio file"""
+        return _safe_filename(video_path)
     
     def _parse_duration(self, ffmpeg_output: str) -> Optional[float]:
         """Parse duration from ffmpeg stderr output"""
         try:
             # Look for duration in format: Duration: 00:02:30.45
-            duration_match = re.search(r'Duration: (\d{2}):(\d{2}):(\d{2})\.(\d{2})', ffmpeg_output)
+            duration_match = _DURATION_RE.search(ffmpeg_output)
             if duration_match:
                 hours, minutes, seconds, centiseconds = map(int, duration_match.groups())
                 total_seconds = hours * 3600 + minutes * 60 + seconds + centiseconds / 100
@@ -144,81 +330,197 @@ class AudioExtractionService:
         except Exception as e:
             logger.warning(f"Could not parse duration: {e}")
             return None
-    
+
+    def _run_ffmpeg(self, cmd: List[str], timeout: int) -> Tuple[int, Dict[int, float], str]:
+        """
+        Run ffmpeg and consume its stderr line by line while it runs
+        
+        Only per-input durations and the last few stderr lines are kept, so memory
+        stays flat however much progress output a long video produces.
+        
+        Args:
+            cmd: ffmpeg argv
+            timeout: Maximum processing time in seconds
+            
+        Returns:
+            Tuple of (return code, durations keyed by input number, stderr tail)
+            
+        Raises:
+            subprocess.TimeoutExpired: if ffmpeg runs longer than ``timeout``
+        """
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace',
+            bufsize=1
+        )
+        durations: Dict[int, float] = {}
+        tail = deque(maxlen=_STDERR_TAIL_LINES)
+        
+        def read_stderr():
+            input_no = 0
+            for line in proc.stderr:
+                tail.append(line)
+                input_match = _INPUT_RE.search(line)
+                if input_match:
+                    input_no = int(input_match.group(1))
+                elif input_no not in durations and 'Duration:' in line:
+                    duration = self._parse_duration(line)
+                    if duration is not None:
+                        durations[input_no] = duration
+        
+        reader = threading.Thread(target=read_stderr, daemon=True)
+        reader.start()
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            reader.join(timeout=5)
+            if not reader.is_alive():
+                proc.stderr.close()
+        
+        return proc.returncode, durations, ''.join(tail)
+
     def _parse_ffmpeg_error(self, stderr: str) -> str:
         """Parse ffmpeg error messages to provide user-friendly feedback"""
         if not stderr:
             return "Unknown ffmpeg error"
         
         # Common error patterns
-        if "No such file or directory" in stderr:
-            return "Video file not found or cannot be accessed"
-        elif "Stream map" in stderr and "matches no streams" in stderr:
-            return "No audio track found in video file"
-        elif "Invalid data found when processing input" in stderr:
-            return "Video file appears to be corrupted or in unsupported format"
-        elif "Permission denied" in stderr:
-            return "Permission denied accessing video file"
-        elif "Decoder" in stderr and "not found" in stderr:
-            return "Video format not supported by ffmpeg"
-        else:
-            # Return the last line of stderr which usually contains the main error
-            lines = stderr.strip().split('\n')
-            return lines[-1] if lines else stderr[:200]
+        match = _FFMPEG_ERROR_RE.search(stderr)
+        if match:
+            return _FFMPEG_ERROR_MESSAGES[match.lastgroup]
+        
+        # Return the last line of stderr which usually contains the main error
+        last_line = stderr.strip().rpartition('\n')[2]
+        return last_line or stderr[:200]
+    
+    def _ensure_output_dir(self, output_dir: str) -> str:
+        """Create output_dir on first use and return its normalized path"""
+        output_dir = os.path.realpath(output_dir)
+        if output_dir not in self._known_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            # Per-job temp dirs are never reused, so keep the set from growing forever
+            if len(self._known_dirs) >= 256:
+                self._known_dirs.clear()
+            self._known_dirs.add(output_dir)
+        return output_dir
+    
+    def _get_file_size(self, file_path: str) -> int:
+        """Return file size with a single stat, treating a missing file as empty"""
+        try:
+            return os.stat(file_path).st_size
+        except OSError:
+            return 0
     
     def cleanup_temp_files(self, file_paths: List[str]) -> None:
         """Clean up temporary audio files"""
         for file_path in file_paths:
             try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    logger.debug(f"Cleaned up temporary file: {file_path}")
+                os.remove(file_path)
+                logger.debug(f"Cleaned up temporary file: {file_path}")
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 logger.warning(f"Could not clean up {file_path}: {e}")
     
-    def get_video_info(self, video_path: str) -> Dict[str, any]:
-        """Get basic information about a video file using ffprobe"""
+    def get_video_info(self, video_path: str, stat: Optional[os.stat_result] = None) -> Dict[str, any]:
+        """Get basic information about a video file using ffprobe
+        
+        Pass stat when the caller has just stat'ed the file to skip a second syscall.
+        """
         try:
-            cmd = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
-                video_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
-                import json
-                info = json.loads(result.stdout)
-                
-                # Extract useful information
-                format_info = info.get('format', {})
-                streams = info.get('streams', [])
-                
-                audio_streams = [s for s in streams if s.get('codec_type') == 'audio']
-                video_streams = [s for s in streams if s.get('codec_type') == 'video']
-                
-                return {
-                    'success': True,
-                    'duration': float(format_info.get('duration', 0)),
-                    'size_bytes': int(format_info.get('size', 0)),
-                    'has_audio': len(audio_streams) > 0,
-                    'has_video': len(video_streams) > 0,
-                    'audio_codec': audio_streams[0].get('codec_name') if audio_streams else None,
-                    'video_codec': video_streams[0].get('codec_name') if video_streams else None,
-                    'error': None
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': f'ffprobe failed: {result.stderr}'
-                }
-                
+            # Probe results are cached per file version, so repeat lookups of an
+            # unchanged file don't spawn ffprobe again
+            stat = stat or os.stat(video_path)
+            return dict(_probe_video(video_path, stat.st_mtime_ns, stat.st_size))
+        except _FfprobeError as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
         except Exception as e:
             return {
                 'success': False,
                 'error': f'Video info extraction failed: {str(e)}'
             }
+
+
+@functools.lru_cache(maxsize=4096)
+def _safe_filename(video_path: str) -> str:
+    """Generate a safe WAV filename from a video path (pure, so memoized)"""
+    # One right-scan each for the separator and extension dot
+    sep = max(video_path.rfind('/'), video_path.rfind(os.sep))
+    base_name = video_path[sep + 1:]
+    dot = base_name.rfind('.')
+    name_without_ext = base_name if dot <= 0 else base_name[:dot]
+    
+    # Replace unsafe characters with underscores
+    safe_name = _UNSAFE_CHARS_RE.sub('_', name_without_ext)
+    
+    return f"{safe_name}.wav"
+
+
+def pcm_chunks_to_array(chunks: Iterable[bytes]):
+    """Convert s16le PCM chunks (e.g. WAV frames or an ffmpeg pipe) to a float32 array for Whisper"""
+    import numpy as np  # Lazy import to avoid NumPy issues on startup
+    
+    arrays = [np.frombuffer(chunk, dtype=np.int16) for chunk in chunks]
+    if not arrays:
+        return np.zeros(0, dtype=np.float32)
+    # Scale in place so only one full-size float copy is ever allocated
+    samples = np.concatenate(arrays).astype(np.float32)
+    samples *= 1 / 32768.0
+    return samples
+
+
+class _FfprobeError(Exception):
+    """ffprobe exited with an error (raised so failures are not cached)"""
+
+
+@functools.lru_cache(maxsize=1024)
+def _probe_video(video_path: str, mtime_ns: int, size: int) -> Dict[str, any]:
+    """Run ffprobe on a video; mtime_ns and size only key the cache"""
+    cmd = [
+        'ffprobe',
+        '-v', 'quiet',
+        '-of', 'json=compact=1',
+        '-show_format',
+        '-show_streams',
+        video_path
+    ]
+    
+    # Keep stdout as bytes: both orjson and json parse bytes without a decode step
+    result = subprocess.run(cmd, capture_output=True, timeout=30)
+    
+    if result.returncode != 0:
+        raise _FfprobeError(f'ffprobe failed: {result.stderr.decode(errors="replace")}')
+    
+    info = _json.loads(result.stdout)
+    
+    # Extract useful information
+    format_info = info.get('format', {})
+    streams = info.get('streams', [])
+    
+    audio_streams = [s for s in streams if s.get('codec_type') == 'audio']
+    video_streams = [s for s in streams if s.get('codec_type') == 'video']
+    
+    audio_stream = audio_streams[0] if audio_streams else {}
+    
+    return {
+        'success': True,
+        'duration': float(format_info.get('duration', 0)),
+        'size_bytes': int(format_info.get('size', 0)),
+        'has_audio': len(audio_streams) > 0,
+        'has_video': len(video_streams) > 0,
+        'audio_codec': audio_stream.get('codec_name'),
+        'audio_sample_rate': int(audio_stream['sample_rate']) if audio_stream.get('sample_rate') else None,
+        'audio_channels': audio_stream.get('channels'),
+        'video_codec': video_streams[0].get('codec_name') if video_streams else None,
+        'error': None
+    }
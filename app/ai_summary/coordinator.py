@@ -8,18 +8,127 @@ Orchestrates the complete video summarization workflow:
 4. Store results in database
 """
 import os
+import functools
+import json
 import logging
+import queue
+import re
 import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import closing
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from pathlib import Path
-from sqlalchemy import or_
+from sqlalchemy import and_, func, or_, update
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json reads and writes the same data
+    orjson = None
 
 # Lazy imports to avoid NumPy issues on startup
 # Services will be imported only when get_coordinator() is called
 
 logger = logging.getLogger(__name__)
 
+# Statuses after which no further writes are expected for a summary
+_TERMINAL_STATUSES = ('completed', 'failed', 'no_audio')
+
+# Keys of list_video_summaries entries, in the order of its query's columns
+_SUMMARY_LIST_FIELDS = ('video_path', 'status', 'generated_at', 'processing_time_seconds', 'has_summary', 'error_message')
+
+# 16kHz mono 16-bit PCM, the format extracted for Whisper
+_WAV_BYTES_PER_SECOND = 16000 * 2
+
+# Keywords that make a segment a likely jump point in the heuristic fallback
+_JUMP_KW = re.compile(
+    r"intro|introduction|overview|setup|install|configure|demo|example|concept|definition|"
+    r"recap|summary|conclusion|best practice|tip|troubleshoot|issue",
+    re.I
+)
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to a JSON string, with orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            pass  # e.g. numpy scalars, which orjson rejects but json handles as floats
+    return json.dumps(obj)
+
+
+def _version_display_label(version: int, generated_at: datetime, processing_time_seconds: Optional[float]) -> str:
+    """Format the version picker label, e.g. 'v3 • 01/02/25 • 1.5m'"""
+    date = generated_at.strftime('%m/%d/%y') if hasattr(generated_at, 'strftime') else str(generated_at)
+    label = f"v{version} • {date}"
+    if processing_time_seconds is not None:
+        label += f" • {round(processing_time_seconds / 60, 1)}m"
+    return label
+
+
+def _load_jump_points(jump_points_json: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+    """Decode a stored jump_points_json column; None for rows that predate it"""
+    if not jump_points_json:
+        return None
+    try:
+        return (orjson or json).loads(jump_points_json)
+    except ValueError:
+        return None
+
+
+def _heuristic_jump_points(segments: List[Dict[str, Any]], max_points: int = 8, pool: int = 20) -> List[Dict[str, Any]]:
+    """
+    Pick spaced, keyword-biased jump points from Whisper segments
+    
+    Each non-empty segment scores 2 for a keyword hit plus up to 1 for length;
+    the best `pool` are kept (earlier segments win ties), put in time order and
+    evenly downsampled to `max_points`.
+    """
+    import numpy as np  # Lazy: keep NumPy off the startup path
+    
+    starts: List[int] = []
+    texts: List[str] = []
+    for seg in segments or []:
+        try:
+            s = float(seg.get('start', 0))
+            text = (seg.get('text') or '').strip()
+        except Exception:
+            continue
+        if text:
+            starts.append(int(max(0, round(s))))
+            texts.append(text)
+    if not texts:
+        return []
+    
+    n = len(texts)
+    has_kw = np.fromiter((_JUMP_KW.search(t) is not None for t in texts), dtype=np.float64, count=n)
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.float64, count=n)
+    scores = 2.0 * has_kw + np.minimum(1.0, lengths / 200.0)
+    
+    if n > pool:
+        # O(n) top-k: everything above the pool-th best score, then the earliest ties
+        threshold = np.partition(scores, n - pool)[n - pool]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:pool - len(above)]
+        top = np.sort(np.concatenate([above, ties]))
+    else:
+        top = np.arange(n)
+    # Time order; equal start seconds keep the higher-scored segment first
+    top = sorted(top.tolist(), key=lambda i: (starts[i], -scores[i]))
+    
+    # Downsample evenly to at most max_points
+    if len(top) > max_points:
+        step = max(1, len(top) // max_points)
+        top = top[::step][:max_points]
+    return [{
+        'seconds': starts[i],
+        'title': texts[i].split('. ')[0].strip()[:100] or 'Jump'
+    } for i in top]
+
 
 class VideoSummaryCoordinator:
     """Coordinates the complete video summarization workflow"""
@@ -28,11 +137,26 @@ class VideoSummaryCoordinator:
         # Lazy initialization - services created on first access
         self._audio_service = None
         self._transcription_service = None
+        self._cpu_pool = None
         self._summarization_service = None
         self._task_queue = None
         
         # Configuration
         self.temp_audio_cleanup = True
+        self.whisper_model_name = "base"
+        # >0 runs Whisper in that many worker processes instead of in this one, so
+        # transcription never competes with the web server for the GIL
+        self.transcribe_workers = int(os.environ.get("TRANSCRIBE_WORKERS", "0"))
+        # Audio is transcribed in chunks of this length while ffmpeg is still decoding
+        self.audio_chunk_seconds = int(os.environ.get("AUDIO_CHUNK_SECONDS", "60"))
+        # Each chunk also gets this much of the previous one, so boundary words aren't cut
+        self.audio_overlap_seconds = float(os.environ.get("AUDIO_OVERLAP_SECONDS", "2"))
+        # tmpfs for extracted WAV segments; empty string disables it
+        self.audio_tmpfs_dir = os.environ.get("AUDIO_TMPFS_DIR", "/dev/shm")
+        # Repeated writes of an unchanged status within this window are skipped
+        self.status_flush_interval = 5.0
+        self._last_status_flush: Dict[int, tuple] = {}
+        self._status_lock = threading.Lock()
         
         logger.info("VideoSummaryCoordinator initialized with lazy loading.")
         
@@ -40,24 +164,48 @@ class VideoSummaryCoordinator:
     def audio_service(self):
         """Lazy load AudioExtractionService"""
         if self._audio_service is None:
-            from .audio_extraction import AudioExtractionService
-            self._audio_service = AudioExtractionService()
+            self._audio_service = _shared_audio_service()
         return self._audio_service
     
     @property
     def transcription_service(self):
         """Lazy load TranscriptionService"""
         if self._transcription_service is None:
-            from .transcription import TranscriptionService
-            self._transcription_service = TranscriptionService(model_name="base")
+            self._transcription_service = _shared_transcription_service(self.whisper_model_name)
         return self._transcription_service
     
+    @property
+    def cpu_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Lazy create the transcription process pool (None when disabled)"""
+        if self._cpu_pool is None and self.transcribe_workers > 0:
+            import multiprocessing
+            # spawn: forking a process that may already hold torch/CUDA state is unsafe
+            self._cpu_pool = ProcessPoolExecutor(
+                max_workers=self.transcribe_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_transcription_worker,
+                initargs=(self.whisper_model_name,)
+            )
+        return self._cpu_pool
+    
+    def _submit_transcription(self, audio_path: str) -> Future:
+        """
+        Transcribe with timestamps in the process pool if enabled, else in this thread
+        
+        Returns a future either way; without a pool it is already resolved.
+        """
+        pool = self.cpu_pool
+        if pool is not None:
+            return pool.submit(_transcribe_in_worker, audio_path)
+        future = Future()
+        future.set_result(self.transcription_service.transcribe_with_timestamps(audio_path))
+        return future
+    
     @property
     def summarization_service(self):
         """Lazy load SummarizationService"""
         if self._summarization_service is None:
-            from .summarization import SummarizationService
-            self._summarization_service = SummarizationService()
+            self._summarization_service = _shared_summarization_service()
         return self._summarization_service
     
     @property
@@ -84,55 +232,57 @@ class VideoSummaryCoordinator:
         """
         try:
             # Validate video file exists
-            if not os.path.exists(video_path):
-                def _short_model(name: str) -> str:
-                    try:
-                        if not name:
-                            return ''
-                        short = name.split('+')[-1]
-                        return short.replace('-instruct', '')
-                    except Exception:
-                        return name or ''
-
-                def _format_date(dt) -> str:
-                    try:
-                        d = dt.strftime('%m/%d/%y')
-                        return d
-                    except Exception:
-                        return ''
-
-                # Helper fallbacks
-                def _fallback_model(v_row):
-                    try:
-                        return v_row.model_used or video_summary.model_used
-                    except Exception:
-                        return video_summary.model_used
-
+            try:
+                os.stat(video_path)
+            except FileNotFoundError:
                 return {
                     'success': False,
                     'error': f'Video file not found: {video_path}'
                 }
             
-            # Check if summary already exists or create new one (atomic operation)
-            from ..database import SessionLocal, VideoSummary
-            db = SessionLocal()
-            try:
-                existing = db.query(VideoSummary).filter(
-                    VideoSummary.video_path == video_path
-                ).first()
-                
-                if existing:
-                    if existing.status == 'completed' and not force:
-                        return {
-                            'success': False,
-                            'error': 'Summary already exists for this video',
-                            'existing_summary': {
-                                'status': existing.status,
-                                'summary': existing.summary,
-                                'generated_at': existing.generated_at.isoformat()
+            # Create the summary row or reset it to pending in one atomic statement.
+            # Unless forced, rows that are completed or already running are left alone
+            from ..database import SessionLocal, VideoSummary, video_path_hash
+            path_key = video_path_hash(video_path)
+            with SessionLocal() as db:
+                try:
+                    if db.get_bind().dialect.name == 'postgresql':
+                        from sqlalchemy.dialects.postgresql import insert
+                    else:
+                        from sqlalchemy.dialects.sqlite import insert
+                    now = datetime.utcnow()
+                    stmt = insert(VideoSummary).values(
+                        video_path=video_path,
+                        video_path_hash=path_key,
+                        status='pending',
+                        generated_at=now
+                    )
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[VideoSummary.video_path_hash],
+                        set_={'status': 'pending', 'error_message': None, 'generated_at': now},
+                        where=None if force else or_(
+                            VideoSummary.status.is_(None),
+                            VideoSummary.status.notin_(['completed', 'pending', 'processing'])
+                        )
+                    ).returning(VideoSummary.id)
+                    row = db.execute(stmt).first()
+                    db.commit()
+                    
+                    if row is None:
+                        # Conflict update was skipped: report what is already there
+                        existing = db.query(VideoSummary).filter(
+                            VideoSummary.video_path_hash == path_key
+                        ).first()
+                        if existing.status == 'completed':
+                            return {
+                                'success': False,
+                                'error': 'Summary already exists for this video',
+                                'existing_summary': {
+                                    'status': existing.status,
+                                    'summary': existing.summary,
+                                    'generated_at': existing.generated_at.isoformat()
+                                }
                             }
-                        }
-                    elif existing.status in ['pending', 'processing'] and not force:
                         return {
                             'success': False,
                             'error': 'Summary generation already in progress for this video',
@@ -141,34 +291,16 @@ class VideoSummaryCoordinator:
                                 'generated_at': existing.generated_at.isoformat()
                             }
                         }
-                    # For force or failed/no_audio we reset to pending
-                    existing.status = 'pending'
-                    existing.error_message = None
-                    existing.generated_at = datetime.utcnow()
-                    db.commit()
-                    db.refresh(existing)
-                    summary_id = existing.id
-                    logger.info(f"(Re)starting summary for {video_path} (ID: {summary_id}) force={force}")
-                else:
-                    # No existing record, create new one
-                    video_summary = VideoSummary(
-                        video_path=video_path,
-                        status='pending'
-                    )
-                    db.add(video_summary)
-                    db.commit()
-                    db.refresh(video_summary)
-                    summary_id = video_summary.id
-                    logger.info(f"Created new summary record for {video_path} (ID: {summary_id})")
-            except Exception as e:
-                db.rollback()
-                logger.error(f"Database error in start_video_summary: {e}")
-                return {
-                    'success': False,
-                    'error': f'Database error: {str(e)}'
-                }
-            finally:
-                db.close()
+                    
+                    summary_id = row.id
+                    logger.info(f"Queued summary record for {video_path} (ID: {summary_id}) force={force}")
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Database error in start_video_summary: {e}")
+                    return {
+                        'success': False,
+                        'error': f'Database error: {str(e)}'
+                    }
             
             # Add task to queue
             task_data = {
@@ -233,8 +365,8 @@ class VideoSummaryCoordinator:
         """
         
         logger.info(f"Processing video summary for {video_path}")
-        start_time = datetime.utcnow()
-        temp_files = []
+        start_time = time.monotonic()
+        whisper_label = f"whisper-{self.whisper_model_name}"
         
         try:
             # Update database status
@@ -242,193 +374,144 @@ class VideoSummaryCoordinator:
             if progress_callback:
                 progress_callback('Starting video analysis...', 0)
             
-            # Step 1: Extract audio
+            # Steps 1-2: Extract and transcribe audio, overlapped chunk by chunk
             if progress_callback:
                 progress_callback('🎵 Extracting audio from video file...', 5)
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                if progress_callback:
-                    progress_callback('🔧 Setting up audio extraction with FFmpeg...', 8)
-                
-                audio_result = self.audio_service.extract_audio(video_path, temp_dir)
-                
-                if progress_callback:
-                    progress_callback('✅ Audio extraction completed', 15)
-                
-                if not audio_result['success']:
-                    # Handle no audio case specifically
-                    if 'no audio' in audio_result['error'].lower():
-                        self._update_summary_status(
-                            summary_id, 'no_audio', 
-                            error_message='Video file has no audio track'
-                        )
-                        return {
-                            'success': False,
-                            'error': 'Video has no audio track',
-                            'status': 'no_audio'
-                        }
-                    else:
-                        raise Exception(f"Audio extraction failed: {audio_result['error']}")
-                
-                audio_path = audio_result['audio_path']
-                audio_duration = audio_result['duration_seconds']
-                temp_files.append(audio_path)
-                
-                logger.info(f"Extracted audio: {audio_duration}s")
-                
-                # Step 2: Transcribe audio
-                if progress_callback:
-                    progress_callback(f'🎤 Loading Whisper AI model ({self.transcription_service.model_name})...', 20)
-                
-                if progress_callback:
-                    progress_callback(f'🗣️ Transcribing {audio_duration:.1f}s of audio to text...', 25)
-                
-                transcription_result = self.transcription_service.transcribe_with_timestamps(audio_path)
-                
-                if progress_callback:
-                    progress_callback('✅ Audio transcription completed', 50)
-                
-                if not transcription_result['success']:
-                    raise Exception(f"Transcription failed: {transcription_result['error']}")
-                
-                transcript = transcription_result['transcript']
-                detected_language = transcription_result.get('language', 'unknown')
-                segments = transcription_result.get('segments', [])
-                
-                logger.info(f"Transcribed audio ({detected_language}): {len(transcript)} characters")
-                
-                # Step 3: Generate summary
-                if progress_callback:
-                    progress_callback(f'📝 Preparing transcript ({len(transcript)} characters)...', 55)
-                
-                if progress_callback:
-                    progress_callback('🤖 Loading Ollama language model...', 60)
-                
-                if progress_callback:
-                    progress_callback('🧠 Generating comprehensive AI summary...', 65)
-                
-                summary_result = self.summarization_service.summarize_transcript(transcript, model_name=model_name)
-                
-                if progress_callback:
-                    progress_callback('✅ AI summary generation completed', 85)
-                
-                if not summary_result['success']:
-                    raise Exception(f"Summarization failed: {summary_result['error']}")
-                
-                summary_text = summary_result['summary']
-                model_used = f"whisper-{self.transcription_service.model_name}+{summary_result.get('model_used', 'llama3.2:7b')}"
-                
-                logger.info(f"Generated summary: {len(summary_text)} characters")
-                
-                # Step 4: Store results
-                if progress_callback:
-                    progress_callback('💾 Saving summary to database...', 90)
-                
-                if progress_callback:
-                    progress_callback('🔄 Finalizing and cleaning up...', 95)
-                
-                processing_time = (datetime.utcnow() - start_time).total_seconds()
+            if progress_callback:
+                progress_callback(f'🎤 Loading Whisper AI model ({self.whisper_model_name})...', 8)
+            
+            transcription_result = self._transcribe_in_chunks(video_path, progress_callback)
+            
+            if not transcription_result['success']:
+                error = transcription_result['error']
+                if transcription_result.get('stage') != 'audio':
+                    raise Exception(f"Transcription failed: {error}")
+                # Handle no audio case specifically
+                if 'no audio' in error.lower():
+                    self._update_summary_status(
+                        summary_id, 'no_audio', 
+                        error_message='Video file has no audio track'
+                    )
+                    return {
+                        'success': False,
+                        'error': 'Video has no audio track',
+                        'status': 'no_audio'
+                    }
+                raise Exception(f"Audio extraction failed: {error}")
+            
+            if progress_callback:
+                progress_callback('✅ Audio transcription completed', 50)
+            
+            transcript = transcription_result['transcript']
+            detected_language = transcription_result.get('language', 'unknown')
+            segments = transcription_result.get('segments', [])
+            audio_duration = transcription_result['audio_duration']
+            
+            logger.info(f"Transcribed {audio_duration}s of audio ({detected_language}): {len(transcript)} characters")
+            
+            # Step 3: Generate summary
+            if progress_callback:
+                progress_callback(f'📝 Preparing transcript ({len(transcript)} characters)...', 55)
+            
+            if progress_callback:
+                progress_callback('🤖 Loading Ollama language model...', 60)
+            
+            if progress_callback:
+                progress_callback('🧠 Generating comprehensive AI summary...', 65)
+            
+            summary_result = self.summarization_service.summarize_transcript(transcript, model_name=model_name)
+            
+            if progress_callback:
+                progress_callback('✅ AI summary generation completed', 85)
+            
+            if not summary_result['success']:
+                raise Exception(f"Summarization failed: {summary_result['error']}")
+            
+            summary_text = summary_result['summary']
+            model_used = f"{whisper_label}+{summary_result.get('model_used', 'llama3.2:7b')}"
+            
+            logger.info(f"Generated summary: {len(summary_text)} characters")
+            
+            # Step 4: Store results
+            if progress_callback:
+                progress_callback('💾 Saving summary to database...', 90)
+            
+            if progress_callback:
+                progress_callback('🔄 Finalizing and cleaning up...', 95)
+            
+            processing_time = time.monotonic() - start_time
+            
+            # Update database with results
+            from ..database import SessionLocal, VideoSummary, VideoSummaryVersion
+            with SessionLocal() as db:
+                video_summary = db.query(VideoSummary).filter(
+                    VideoSummary.id == summary_id
+                ).first()
                 
-                # Update database with results
-                from ..database import SessionLocal, VideoSummary, VideoSummaryVersion
-                db = SessionLocal()
-                try:
-                    video_summary = db.query(VideoSummary).filter(
-                        VideoSummary.id == summary_id
-                    ).first()
-                    
-                    if video_summary:
-                        video_summary.summary = summary_text
-                        # Build curated jump points using the LLM with heuristic fallback
-                        from json import dumps as _dumps
+                if video_summary:
+                    video_summary.summary = summary_text
+                    # Build curated jump points using the LLM with heuristic fallback
+                    ai_jump_points = []
+                    try:
+                        ai_jump_points = self.summarization_service.generate_jump_points(
+                            segments=segments,
+                            transcript=transcript,
+                            model_name=model_name,
+                            max_points=10
+                        ) or []
+                    except Exception:
                         ai_jump_points = []
-                        try:
-                            ai_jump_points = self.summarization_service.generate_jump_points(
-                                segments=segments,
-                                transcript=transcript,
-                                model_name=model_name,
-                                max_points=10
-                            ) or []
-                        except Exception:
-                            ai_jump_points = []
-
-                        # Heuristic fallback: pick up to 8 spaced, keyword-biased moments
-                        if not ai_jump_points:
-                            import re
-                            kw = re.compile(r"intro|introduction|overview|setup|install|configure|demo|example|concept|definition|recap|summary|conclusion|best practice|tip|troubleshoot|issue", re.I)
-                            candidates = []
-                            for seg in segments or []:
-                                try:
-                                    s = float(seg.get('start', 0))
-                                    text = (seg.get('text') or '').strip()
-                                except Exception:
-                                    continue
-                                if not text:
-                                    continue
-                                score = 0
-                                if kw.search(text):
-                                    score += 2
-                                score += min(1.0, len(text) / 200.0)
-                                candidates.append((score, int(max(0, round(s))), text))
-                            # Sort by score desc, then spread across time
-                            candidates.sort(key=lambda x: -x[0])
-                            top = candidates[:20]
-                            top.sort(key=lambda x: x[1])
-                            # Downsample evenly to at most 8
-                            if len(top) > 8:
-                                step = max(1, len(top) // 8)
-                                top = top[::step][:8]
-                            ai_jump_points = [{
-                                'seconds': t,
-                                'title': (txt.split('. ')[0] if txt else '').strip()[:100] or 'Jump'
-                            } for _, t, txt in top]
-
-                        video_summary.transcript = transcript
-                        if ai_jump_points:
-                            video_summary.transcript += f"\n\n[JUMP_POINTS]{_dumps(ai_jump_points)}"
-                        video_summary.status = 'completed'
-                        video_summary.model_used = model_used
-                        video_summary.processing_time_seconds = processing_time
-                        video_summary.audio_duration_seconds = audio_duration
-                        video_summary.error_message = None
-                        # Create a new version row
-                        # Next version = (current max version for this path) + 1
-                        current_max = db.query(VideoSummaryVersion).filter(
-                            VideoSummaryVersion.video_path == video_summary.video_path
-                        ).order_by(VideoSummaryVersion.version.desc()).first()
-                        next_ver = (current_max.version + 1) if current_max else 1
-                        db.add(VideoSummaryVersion(
-                            video_path=video_summary.video_path,
-                            version=next_ver,
-                            summary=summary_text,
-                            # Persist transcript including embedded curated jump points for this version
-                            transcript=video_summary.transcript,
-                            model_used=model_used,
-                            processing_time_seconds=processing_time
-                        ))
-                        
-                        db.commit()
-                        logger.info(f"Saved summary to database (ID: {summary_id})")
-                finally:
-                    db.close()
-                
-                # Cleanup temp files
-                if self.temp_audio_cleanup:
-                    self.audio_service.cleanup_temp_files(temp_files)
-                
-                if progress_callback:
-                    progress_callback('Completed successfully', 100)
-                
-                return {
-                    'success': True,
-                    'summary_id': summary_id,
-                    'summary': summary_text,
-                    'transcript_length': len(transcript),
-                    'processing_time': processing_time,
-                    'audio_duration': audio_duration,
-                    'language': detected_language,
-                    'model_used': model_used
-                }
+
+                    # Heuristic fallback: pick up to 8 spaced, keyword-biased moments
+                    if not ai_jump_points:
+                        ai_jump_points = _heuristic_jump_points(segments)
+
+                    jump_points_json = _dumps(ai_jump_points) if ai_jump_points else None
+                    video_summary.transcript = transcript
+                    video_summary.jump_points_json = jump_points_json
+                    video_summary.status = 'completed'
+                    video_summary.model_used = model_used
+                    video_summary.processing_time_seconds = processing_time
+                    video_summary.audio_duration_seconds = audio_duration
+                    video_summary.error_message = None
+                    # Create a new version row
+                    # Next version = (current max version for this path) + 1
+                    current_max = db.query(func.max(VideoSummaryVersion.version)).filter(
+                        VideoSummaryVersion.video_path_hash == video_summary.video_path_hash
+                    ).scalar()
+                    next_ver = (current_max or 0) + 1
+                    generated_at = datetime.utcnow()
+                    db.add(VideoSummaryVersion(
+                        video_path=video_summary.video_path,
+                        version=next_ver,
+                        summary=summary_text,
+                        transcript=transcript,
+                        jump_points_json=jump_points_json,
+                        model_used=model_used,
+                        processing_time_seconds=processing_time,
+                        generated_at=generated_at,
+                        display_label=_version_display_label(next_ver, generated_at, processing_time)
+                    ))
+                    
+                    db.commit()
+                    logger.info(f"Saved summary to database (ID: {summary_id})")
+            with self._status_lock:
+                self._last_status_flush.pop(summary_id, None)
+            
+            if progress_callback:
+                progress_callback('Completed successfully', 100)
+            
+            return {
+                'success': True,
+                'summary_id': summary_id,
+                'summary': summary_text,
+                'transcript_length': len(transcript),
+                'processing_time': processing_time,
+                'audio_duration': audio_duration,
+                'language': detected_language,
+                'model_used': model_used
+            }
         
         except Exception as e:
             logger.error(f"Video summary processing failed: {e}")
@@ -439,33 +522,208 @@ class VideoSummaryCoordinator:
                 error_message=str(e)
             )
             
-            # Cleanup temp files
-            if self.temp_audio_cleanup:
-                self.audio_service.cleanup_temp_files(temp_files)
-            
             return {
                 'success': False,
                 'error': str(e),
                 'summary_id': summary_id
             }
     
-    def _update_summary_status(self, summary_id: int, status: str, progress: str = None, error_message: str = None):
-        """Update database summary status"""
+    def _transcribe_in_chunks(self, video_path: str, progress_callback=None) -> Dict[str, Any]:
+        """
+        Probe the video and transcribe it through a scratch directory
+        
+        The WAV segments go to tmpfs when it has room for them, so the handoff
+        from ffmpeg to Whisper never touches the disk.
+        
+        Returns:
+            See _transcribe_segments
+        """
+        # One stat and one (cached) probe serve scratch sizing, extraction and progress
         try:
-            from ..database import SessionLocal, VideoSummary
-            db = SessionLocal()
+            video_info = self.audio_service.get_video_info(video_path, stat=os.stat(video_path))
+        except FileNotFoundError:
+            return {'success': False, 'stage': 'audio', 'error': f'Video file not found: {video_path}'}
+        
+        with tempfile.TemporaryDirectory(dir=self._audio_scratch_root(video_info.get('duration'))) as temp_dir:
+            return self._transcribe_segments(video_path, temp_dir, video_info, progress_callback)
+    
+    def _audio_scratch_root(self, duration: Optional[float]) -> Optional[str]:
+        """
+        Pick the parent directory for extracted audio
+        
+        Returns audio_tmpfs_dir if it can hold the whole file as 16kHz mono
+        16-bit PCM (ffmpeg may run ahead of transcription), otherwise None so
+        tempfile falls back to the default disk-backed location.
+        """
+        root = self.audio_tmpfs_dir
+        if not root or not duration or not os.path.isdir(root):
+            return None
+        try:
+            st = os.statvfs(root)
+        except OSError:
+            return None
+        needed = duration * _WAV_BYTES_PER_SECOND * 1.5
+        if st.f_bavail * st.f_frsize < needed:
+            logger.info(f"Not enough room in {root} for {duration:.0f}s of audio, using disk")
+            return None
+        return root
+    
+    def _transcribe_segments(self, video_path: str, temp_dir: str, video_info: Dict[str, Any],
+                             progress_callback=None) -> Dict[str, Any]:
+        """
+        Extract and transcribe audio as a two-stage pipeline
+        
+        ffmpeg writes fixed-length WAV segments on a producer thread while this
+        thread transcribes the ones already finished, so Whisper starts after the
+        first chunk instead of after the whole file has been decoded. With a
+        process pool, up to transcribe_workers chunks are transcribed at once;
+        results are still collected in order. Segment timestamps are shifted
+        back onto the video timeline. Consecutive chunks overlap by
+        audio_overlap_seconds; segments transcribed twice are kept only from
+        the chunk whose side of the overlap's midpoint they are centred on.
+        
+        Returns:
+            Transcription dict (transcript, language, segments) plus audio_duration;
+            on failure 'stage' tells audio extraction errors from transcription ones
+        """
+        chunks = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        done = object()
+        
+        def put(item) -> bool:
+            # Give up if the consumer has bailed out, instead of blocking forever
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
             try:
-                video_summary = db.query(VideoSummary).filter(
-                    VideoSummary.id == summary_id
-                ).first()
+                with closing(self.audio_service.extract_audio_segments(
+                    video_path, temp_dir, segment_seconds=self.audio_chunk_seconds,
+                    video_info=video_info, overlap_seconds=self.audio_overlap_seconds
+                )) as segment_iter:
+                    for item in segment_iter:
+                        if not put(item):
+                            return
+            except Exception as e:
+                put(e)
+            put(done)
+        
+        producer = threading.Thread(target=produce, name='audio-segments', daemon=True)
+        producer.start()
+        
+        # One [segments, transcript] pair per collected chunk; the transcript is
+        # only kept for backends that return no segments to rebuild it from
+        pieces: List[list] = []
+        language = None
+        audio_duration = 0.0
+        prev_end = None
+        total_duration = video_info.get('duration') or 0
+        # (chunk_start, chunk_end, chunk_path, future), oldest first
+        in_flight = deque()
+        max_in_flight = max(1, self.transcribe_workers)
+        
+        def collect(chunk_start, chunk_end, chunk_path, future) -> Optional[str]:
+            """Fold one finished chunk into the results; returns an error message on failure"""
+            nonlocal language, audio_duration, prev_end
+            result = future.result()
+            if self.temp_audio_cleanup:
+                self.audio_service.cleanup_temp_files([chunk_path])
+            if not result['success']:
+                return result['error']
+            
+            chunk_segments = result.get('segments') or []
+            for seg in chunk_segments:
+                seg['start'] = seg.get('start', 0) + chunk_start
+                seg['end'] = seg.get('end', 0) + chunk_start
+                for word in seg.get('words') or []:
+                    if isinstance(word, dict):
+                        word['start'] = word.get('start', 0) + chunk_start
+                        word['end'] = word.get('end', 0) + chunk_start
+            if pieces and chunk_start < prev_end:
+                seam = (chunk_start + prev_end) / 2
+                pieces[-1][0] = [seg for seg in pieces[-1][0] if seg['start'] + seg['end'] < 2 * seam]
+                kept = [seg for seg in chunk_segments if seg['start'] + seg['end'] >= 2 * seam]
+            else:
+                kept = chunk_segments
+            pieces.append([kept, None if chunk_segments else result.get('transcript')])
+            language = language or result.get('language')
+            audio_duration = prev_end = chunk_end
+            return None
+        
+        try:
+            while True:
+                item = chunks.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    return {'success': False, 'stage': 'audio', 'error': str(item)}
                 
-                if video_summary:
-                    video_summary.status = status
-                    if error_message:
-                        video_summary.error_message = error_message
-                    db.commit()
-            finally:
-                db.close()
+                chunk_start, chunk_end, chunk_path = item
+                if progress_callback:
+                    percent = 10 + int(40 * chunk_start / total_duration) if total_duration else 25
+                    progress_callback(f'🗣️ Transcribing audio from {chunk_start:.0f}s to {chunk_end:.0f}s...', min(percent, 49))
+                in_flight.append((chunk_start, chunk_end, chunk_path, self._submit_transcription(chunk_path)))
+                if len(in_flight) >= max_in_flight:
+                    error = collect(*in_flight.popleft())
+                    if error:
+                        return {'success': False, 'stage': 'transcription', 'error': error}
+            while in_flight:
+                error = collect(*in_flight.popleft())
+                if error:
+                    return {'success': False, 'stage': 'transcription', 'error': error}
+        finally:
+            stop.set()
+            for *_, future in in_flight:
+                future.cancel()
+            producer.join(timeout=5)
+        
+        texts = (
+            ''.join(seg.get('text', '') for seg in segs).strip() if text is None else text
+            for segs, text in pieces
+        )
+        return {
+            'success': True,
+            'transcript': ' '.join(text for text in texts if text),
+            'language': language or 'unknown',
+            'segments': [seg for segs, _ in pieces for seg in segs],
+            'audio_duration': audio_duration,
+            'error': None
+        }
+    
+    def _update_summary_status(self, summary_id: int, status: str, progress: str = None, error_message: str = None):
+        """
+        Update database summary status
+        
+        Progress text stays in memory on the task; the row is only written on a
+        status change, when an error is recorded, or once status_flush_interval
+        has passed since the last write.
+        """
+        now = time.monotonic()
+        with self._status_lock:
+            last = self._last_status_flush.get(summary_id)
+            if (last and last[0] == status and not error_message
+                    and now - last[1] < self.status_flush_interval):
+                return
+            if status in _TERMINAL_STATUSES:
+                self._last_status_flush.pop(summary_id, None)
+            else:
+                self._last_status_flush[summary_id] = (status, now)
+        try:
+            from ..database import SessionLocal, VideoSummary
+            values = {'status': status}
+            if error_message:
+                values['error_message'] = error_message
+            with SessionLocal() as db:
+                # Single UPDATE; no need to load the row first
+                db.execute(
+                    update(VideoSummary).where(VideoSummary.id == summary_id).values(**values)
+                )
+                db.commit()
         except Exception as e:
             logger.error(f"Failed to update summary status: {e}")
     
@@ -476,92 +734,85 @@ class VideoSummaryCoordinator:
     def find_active_task_for_video(self, video_path: str) -> Optional[str]:
         """Find an active (pending/processing) task id for a given video path"""
         try:
-            # Lazy import to avoid circulars
-            from .task_queue import TaskStatus
-            tq = self.task_queue
-            for tid, task in list(tq.tasks.items()):
-                if task.task_type != 'video_summary':
-                    continue
-                if task.data.get('video_path') != video_path:
-                    continue
-                if task.status in (TaskStatus.PENDING, TaskStatus.PROCESSING):
-                    return tid
-            return None
+            return self.task_queue.find_active_task(video_path)
         except Exception:
             return None
     
     def get_video_summary(self, video_path: str) -> Optional[Dict[str, Any]]:
         """Get completed summary for a video"""
         try:
-            from ..database import SessionLocal, VideoSummary, VideoSummaryVersion
-            db = SessionLocal()
-            try:
-                # Try exact path first, then fallback to suffix match to handle base-dir changes
-                rel = video_path.split('/')[-1] if '/' in video_path else video_path
-                video_summary = db.query(VideoSummary).filter(
+            from ..database import SessionLocal, VideoSummary, VideoSummaryVersion, video_basename, video_path_hash
+            with SessionLocal() as db:
+                # Try exact path first, then fallback to basename match to handle base-dir changes.
+                # One query: the summary rows joined to their versions, newest summary first
+                rel = video_basename(video_path)
+                rows = db.query(VideoSummary, VideoSummaryVersion).outerjoin(
+                    VideoSummaryVersion,
+                    VideoSummaryVersion.video_path_hash == VideoSummary.video_path_hash
+                ).filter(
                     or_(
-                        VideoSummary.video_path == video_path,
-                        VideoSummary.video_path.like(f"%/{rel}"),
-                        VideoSummary.video_path.like(f"%\\{rel}")
+                        VideoSummary.video_path_hash == video_path_hash(video_path),
+                        VideoSummary.video_basename == rel
                     )
-                ).order_by(VideoSummary.generated_at.desc()).first()
+                ).order_by(
+                    VideoSummary.generated_at.desc(),
+                    VideoSummaryVersion.version.desc()
+                ).all()
                 
-                if not video_summary:
+                if not rows:
                     return None
+                video_summary = rows[0][0]
+                versions_list = [v for s, v in rows if v is not None and s.id == video_summary.id]
+                first_version = None
+                
                 # Ensure at least v1 exists if we have a completed summary but no versions yet
-                versions_q = db.query(VideoSummaryVersion).filter(
-                    VideoSummaryVersion.video_path == video_path
-                ).order_by(VideoSummaryVersion.version.desc())
-                versions_list = versions_q.all()
                 if (video_summary.summary and video_summary.status == 'completed' and not versions_list):
-                    db.add(VideoSummaryVersion(
+                    first_version = VideoSummaryVersion(
                         video_path=video_summary.video_path,
                         version=1,
                         summary=video_summary.summary,
                         transcript=video_summary.transcript,
+                        jump_points_json=video_summary.jump_points_json,
                         model_used=video_summary.model_used
-                    ))
-                    db.commit()
-                    versions_list = versions_q.all()
+                    )
+                    db.add(first_version)
+                    # Flush only: committing now would expire every loaded row and
+                    # cost a refresh SELECT for each object read below
+                    db.flush()
+                    versions_list = [first_version]
 
-                # Build versions list and attach processing time for the latest version if available
-                latest_version = None
-                versions_list = versions_q.all()
-                if versions_list:
-                    latest_version = versions_list[0].version
+                # Attach processing time for the latest version if available
+                latest_version = versions_list[0].version if versions_list else None
+                versions = []
+                for v in versions_list:
+                    proc_time = v.processing_time_seconds if v.processing_time_seconds is not None else (
+                        video_summary.processing_time_seconds if v.version == latest_version else None
+                    )
+                    versions.append({
+                        'version': v.version,
+                        'generated_at': v.generated_at.isoformat(),
+                        'model_used': (v.model_used or video_summary.model_used),
+                        'display_model': (v.model_used or video_summary.model_used),
+                        'processing_time_seconds': proc_time,
+                        'display_label': v.display_label or _version_display_label(v.version, v.generated_at, proc_time)
+                    })
 
-                return {
+                result = {
                     'video_path': video_summary.video_path,
                     'summary': video_summary.summary,
                     'transcript': video_summary.transcript,
+                    'jump_points': _load_jump_points(video_summary.jump_points_json),
                     'status': video_summary.status,
                     'error_message': video_summary.error_message,
                     'model_used': video_summary.model_used,
                     'generated_at': video_summary.generated_at.isoformat(),
                     'processing_time_seconds': video_summary.processing_time_seconds,
                     'audio_duration_seconds': video_summary.audio_duration_seconds,
-                    'versions': [
-                        {
-                            'version': v.version,
-                            'generated_at': v.generated_at.isoformat(),
-                            'model_used': (v.model_used or video_summary.model_used),
-                            'display_model': (v.model_used or video_summary.model_used),
-                            'processing_time_seconds': (v.processing_time_seconds if v.processing_time_seconds is not None else (video_summary.processing_time_seconds if latest_version and v.version == latest_version else None)),
-                            'display_label': (
-                                f"v{v.version} • "
-                                f"{(v.generated_at.strftime('%m/%d/%y') if hasattr(v.generated_at, 'strftime') else str(v.generated_at))}"
-                                + (
-                                    f" • {round(((v.processing_time_seconds if v.processing_time_seconds is not None else (video_summary.processing_time_seconds or 0)))/60, 1)}m"
-                                    if ((v.processing_time_seconds is not None) or (latest_version and v.version == latest_version and video_summary.processing_time_seconds))
-                                    else ''
-                                )
-                            )
-                        }
-                        for v in versions_list
-                    ]
+                    'versions': versions
                 }
-            finally:
-                db.close()
+                if first_version is not None:
+                    db.commit()
+                return result
         except Exception as e:
             logger.error(f"Failed to get video summary: {e}")
             return None
@@ -569,30 +820,22 @@ class VideoSummaryCoordinator:
     def list_versions_for_video(self, video_path: str) -> List[Dict[str, Any]]:
         """Return version metadata for a video, tolerant to base path changes."""
         try:
-            from ..database import SessionLocal, VideoSummaryVersion, VideoSummary
-            db = SessionLocal()
-            try:
-                rel = video_path.split('/')[-1] if '/' in video_path else video_path
-                versions = db.query(VideoSummaryVersion).filter(
+            from ..database import SessionLocal, VideoSummaryVersion, VideoSummary, video_basename, video_path_hash
+            with SessionLocal() as db:
+                rel = video_basename(video_path)
+                # Versions joined to their summary row, which supplies fallbacks for older rows
+                rows = db.query(VideoSummaryVersion, VideoSummary).outerjoin(
+                    VideoSummary,
+                    VideoSummary.video_path_hash == VideoSummaryVersion.video_path_hash
+                ).filter(
                     or_(
-                        VideoSummaryVersion.video_path == video_path,
-                        VideoSummaryVersion.video_path.like(f"%/{rel}"),
-                        VideoSummaryVersion.video_path.like(f"%\\{rel}")
+                        VideoSummaryVersion.video_path_hash == video_path_hash(video_path),
+                        VideoSummaryVersion.video_basename == rel
                     )
                 ).order_by(VideoSummaryVersion.version.desc()).all()
-                # Also try to fetch latest processing time from VideoSummary if available
-                latest = db.query(VideoSummary).filter(
-                    or_(
-                        VideoSummary.video_path == video_path,
-                        VideoSummary.video_path.like(f"%/{rel}"),
-                        VideoSummary.video_path.like(f"%\\{rel}")
-                    )
-                ).order_by(VideoSummary.generated_at.desc()).first()
-                latest_ver = None
-                if versions:
-                    latest_ver = versions[0].version
+                latest_ver = rows[0][0].version if rows else None
                 result = []
-                for v in versions:
+                for v, latest in rows:
                     # Fallback model name if version row missing it
                     model_name = v.model_used or (latest.model_used if latest else None)
                     # Prefer per-version processing time if present; otherwise fallback to latest if matching version
@@ -604,11 +847,10 @@ class VideoSummaryCoordinator:
                         'generated_at': v.generated_at.isoformat(),
                         'model_used': model_name,
                         'display_model': model_name,
-                        'processing_time_seconds': proc_time
+                        'processing_time_seconds': proc_time,
+                        'display_label': v.display_label or _version_display_label(v.version, v.generated_at, proc_time)
                     })
                 return result
-            finally:
-                db.close()
         except Exception as e:
             logger.error(f"Failed to list versions for video: {e}")
             return []
@@ -616,18 +858,15 @@ class VideoSummaryCoordinator:
     def get_video_summary_version(self, video_path: str, version: int) -> Optional[Dict[str, Any]]:
         """Get a specific version of the summary for a video"""
         try:
-            from ..database import SessionLocal, VideoSummaryVersion
-            from sqlalchemy import or_
-            db = SessionLocal()
-            try:
+            from ..database import SessionLocal, VideoSummaryVersion, video_basename, video_path_hash
+            with SessionLocal() as db:
                 # Tolerant match: exact path or suffix match to handle base-dir changes
-                rel = video_path.split('/')[-1] if '/' in video_path else video_path
+                rel = video_basename(video_path)
                 v = db.query(VideoSummaryVersion).filter(
                     VideoSummaryVersion.version == version,
                     or_(
-                        VideoSummaryVersion.video_path == video_path,
-                        VideoSummaryVersion.video_path.like(f"%/{rel}"),
-                        VideoSummaryVersion.video_path.like(f"%\\{rel}")
+                        VideoSummaryVersion.video_path_hash == video_path_hash(video_path),
+                        VideoSummaryVersion.video_basename == rel
                     )
                 ).first()
                 if not v:
@@ -636,12 +875,11 @@ class VideoSummaryCoordinator:
                     'video_path': v.video_path,
                     'summary': v.summary,
                     'transcript': v.transcript,
+                    'jump_points': _load_jump_points(v.jump_points_json),
                     'model_used': v.model_used,
                     'generated_at': v.generated_at.isoformat(),
                     'version': v.version
                 }
-            finally:
-                db.close()
         except Exception as e:
             logger.error(f"Failed to get summary version: {e}")
             return None
@@ -649,28 +887,24 @@ class VideoSummaryCoordinator:
     def delete_video_summary(self, video_path: str) -> Dict[str, Any]:
         """Delete a video summary"""
         try:
-            from ..database import SessionLocal, VideoSummary
-            db = SessionLocal()
-            try:
-                video_summary = db.query(VideoSummary).filter(
-                    VideoSummary.video_path == video_path
-                ).first()
+            from ..database import SessionLocal, VideoSummary, video_path_hash
+            with SessionLocal() as db:
+                # Single DELETE; no need to load the row first
+                deleted = db.query(VideoSummary).filter(
+                    VideoSummary.video_path_hash == video_path_hash(video_path)
+                ).delete(synchronize_session=False)
+                db.commit()
                 
-                if not video_summary:
+                if not deleted:
                     return {
                         'success': False,
                         'error': 'Summary not found'
                     }
                 
-                db.delete(video_summary)
-                db.commit()
-                
                 return {
                     'success': True,
                     'message': 'Summary deleted successfully'
                 }
-            finally:
-                db.close()
         except Exception as e:
             logger.error(f"Failed to delete video summary: {e}")
             return {
@@ -682,28 +916,28 @@ class VideoSummaryCoordinator:
         """List video summaries with optional filtering"""
         try:
             from ..database import SessionLocal, VideoSummary
-            db = SessionLocal()
-            try:
-                query = db.query(VideoSummary).order_by(VideoSummary.generated_at.desc())
+            with SessionLocal() as db:
+                # Select only the listed columns; the summary text itself is never
+                # transferred, just whether it is non-empty
+                query = db.query(
+                    VideoSummary.video_path,
+                    VideoSummary.status,
+                    VideoSummary.generated_at,
+                    VideoSummary.processing_time_seconds,
+                    and_(VideoSummary.summary.isnot(None), VideoSummary.summary != '').label('has_summary'),
+                    VideoSummary.error_message
+                ).order_by(VideoSummary.generated_at.desc())
                 
                 if status:
                     query = query.filter(VideoSummary.status == status)
                 
-                summaries = query.limit(limit).all()
-                
-                return [
-                    {
-                        'video_path': s.video_path,
-                        'status': s.status,
-                        'generated_at': s.generated_at.isoformat(),
-                        'processing_time_seconds': s.processing_time_seconds,
-                        'has_summary': bool(s.summary),
-                        'error_message': s.error_message
-                    }
-                    for s in summaries
-                ]
-            finally:
-                db.close()
+                result = []
+                for row in query.limit(limit):
+                    item = dict(zip(_SUMMARY_LIST_FIELDS, row))
+                    item['generated_at'] = row.generated_at.isoformat()
+                    item['has_summary'] = bool(row.has_summary)
+                    result.append(item)
+                return result
         except Exception as e:
             logger.error(f"Failed to list video summaries: {e}")
             return []
@@ -712,31 +946,32 @@ class VideoSummaryCoordinator:
         """Get summary generation statistics"""
         try:
             from ..database import SessionLocal, VideoSummary
-            from sqlalchemy import func
             
-            db = SessionLocal()
-            try:
-                # Count by status
-                status_counts = db.query(
+            with SessionLocal() as db:
+                # One pass over the table: per-status row counts plus the processing
+                # time sum and non-NULL count that AVG would use
+                rows = db.query(
                     VideoSummary.status,
-                    func.count(VideoSummary.id).label('count')
+                    func.count(VideoSummary.id),
+                    func.sum(VideoSummary.processing_time_seconds),
+                    func.count(VideoSummary.processing_time_seconds)
                 ).group_by(VideoSummary.status).all()
                 
-                status_dict = {status: count for status, count in status_counts}
+                status_dict = {status: count for status, count, _, _ in rows}
                 
                 # Processing time statistics
-                avg_processing_time = db.query(
-                    func.avg(VideoSummary.processing_time_seconds)
-                ).filter(VideoSummary.status == 'completed').scalar() or 0
-                
-                total_processing_time = db.query(
-                    func.sum(VideoSummary.processing_time_seconds)
-                ).filter(VideoSummary.status == 'completed').scalar() or 0
+                total_processing_time = 0
+                avg_processing_time = 0
+                for status, _, time_sum, time_count in rows:
+                    if status == 'completed' and time_count:
+                        total_processing_time = time_sum
+                        avg_processing_time = time_sum / time_count
                 
-                # Count videos with audio
-                videos_with_audio = db.query(VideoSummary).filter(
-                    VideoSummary.status != 'no_audio'
-                ).count()
+                # Count videos with audio (NULL status never matched != 'no_audio' either)
+                videos_with_audio = sum(
+                    count for status, count in status_dict.items()
+                    if status is not None and status != 'no_audio'
+                )
                 
                 return {
                     'total_summaries': sum(status_dict.values()),
@@ -749,8 +984,6 @@ class VideoSummaryCoordinator:
                     'videos_with_audio': videos_with_audio,
                     'status_breakdown': status_dict
                 }
-            finally:
-                db.close()
         except Exception as e:
             logger.error(f"Failed to get summary statistics: {e}")
             return {
@@ -759,6 +992,57 @@ class VideoSummaryCoordinator:
             }
 
 
+# Services are shared by every coordinator in the process, so the Whisper model
+# is loaded (and held in RAM/VRAM) once. The lock stops two threads that miss
+# the cache together from both loading it.
+_services_lock = threading.Lock()
+
+
+def _locked_cache(func):
+    cached = functools.lru_cache(maxsize=1)(func)
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        with _services_lock:
+            return cached(*args)
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+@_locked_cache
+def _shared_audio_service():
+    from .audio_extraction import AudioExtractionService
+    return AudioExtractionService()
+
+
+@_locked_cache
+def _shared_transcription_service(model_name: str):
+    from .transcription import TranscriptionService
+    return TranscriptionService(model_name=model_name)
+
+
+@_locked_cache
+def _shared_summarization_service():
+    from .summarization import SummarizationService
+    return SummarizationService()
+
+
+# Per-process TranscriptionService for pool workers, loaded once by the initializer
+_worker_transcriber = None
+
+
+def _init_transcription_worker(model_name: str) -> None:
+    """Process pool initializer: load the Whisper model before the first job"""
+    global _worker_transcriber
+    _worker_transcriber = _shared_transcription_service(model_name)
+    _worker_transcriber.model  # model loading is lazy; do it now
+
+
+def _transcribe_in_worker(audio_path: str) -> Dict[str, Any]:
+    """Process pool job: timestamped transcription with the worker's warm model"""
+    return _worker_transcriber.transcribe_with_timestamps(audio_path)
+
+
 # Global coordinator instance
 _coordinator = None
 
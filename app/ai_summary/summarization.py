@@ -1,17 +1,156 @@
 """
 Summarization Service
 
-Generates summaries from text using Ollama (local LLM).
+Generates summaries from text using Ollama (local LLM), or a TensorRT-LLM
+server (trtllm-serve, OpenAI-compatible API) when TRTLLM_ENDPOINT is set.
 """
+import asyncio
 import os
+import re
 import requests
 import logging
-import json
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from operator import itemgetter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # orjson is optional; json.loads takes the same bytes
+    from json import loads as _loads
 
 logger = logging.getLogger(__name__)
 
+# _post_process_summary patterns, compiled once
+_ECHO_PREFIXES = ("Summary:", "Key Points:", "Here is", "Here are", "This video", "The video")
+# Applied one after another: earlier removals can change what later ones match
+_UNWANTED_PHRASES = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'the summary of the transcript in the requested format:?\s*',
+        r'here is the summary of the transcript:?\s*',
+        r'here\'s the summary:?\s*',
+        r'summary of the transcript:?\s*',
+        r'here is a comprehensive summary:?\s*',
+        r'here\'s a comprehensive summary:?\s*',
+        r'based on the transcript:?\s*',
+        r'transcript summary:?\s*'
+    )
+]
+_INTRO = re.compile(r'^(Here is|Here are|This is|The following|Below are).*?:', re.IGNORECASE)
+_BULLET_DASH = re.compile(r'^[-*]\s*', re.MULTILINE)
+_BULLET_NUM = re.compile(r'^\d+\.\s*', re.MULTILINE)
+_SENTENCE_END = re.compile(r'[.!?]+\s+')
+_MULTI_BLANK = re.compile(r'\n\s*\n\s*\n')
+_MULTI_SPACE = re.compile(r' +')
+_BULLET_JOIN = re.compile(r'([.!?])\s*•')
+
+# extract_key_topics: one substring alternation per topic. Kept per topic rather
+# than one combined pattern, since a combined scan would consume "data" in
+# "database" and miss the Database topic.
+_TOPIC_KEYWORDS = {
+    "Programming": ["code", "programming", "software", "development", "algorithm"],
+    "Machine Learning": ["machine learning", "ml", "ai", "neural", "model", "training"],
+    "Web Development": ["web", "html", "css", "javascript", "frontend", "backend"],
+    "Data Science": ["data", "analysis", "statistics", "visualization", "dataset"],
+    "DevOps": ["deployment", "docker", "kubernetes", "ci/cd", "infrastructure"],
+    "Security": ["security", "authentication", "encryption", "vulnerability"],
+    "Database": ["database", "sql", "query", "table", "schema"],
+    "Cloud": ["cloud", "aws", "azure", "gcp", "serverless"],
+    "Mobile": ["mobile", "ios", "android", "app", "flutter", "react native"],
+    "Design": ["design", "ui", "ux", "interface", "user experience"]
+}
+_TOPIC_PATTERNS = [
+    (topic, re.compile('|'.join(map(re.escape, keywords))))
+    for topic, keywords in _TOPIC_KEYWORDS.items()
+]
+
+# generate_jump_points patterns
+_WS_TO_SPACE = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
+_JSON_ARRAY = re.compile(r"\[[\s\S]*\]")
+_JUMP_KEYWORDS = re.compile(
+    "intro|introduction|overview|setup|install|configure|demo|example|concept|definition|"
+    "recap|summary|conclusion|next steps|best practice|tip|gotcha|issue|troubleshoot"
+)
+
+# Transcript characters kept in the summary prompt (increased from 8000 for more
+# detail); longer transcripts keep the first and last half of this budget
+_PROMPT_TRANSCRIPT_CHARS = 15000
+_PROMPT_TRANSCRIPT_HALF = _PROMPT_TRANSCRIPT_CHARS // 2
+
+# Sampling settings for summaries (sync and async paths)
+_SUMMARY_SAMPLING = {'temperature': 0.4, 'top_p': 0.9, 'stop': ["</summary>", "\n\n---"]}
+
+
+def _make_session() -> requests.Session:
+    """HTTP session with keep-alive pooling and a short retry on connect failures"""
+    session = requests.Session()
+    # POST isn't retried after the request was sent (urllib3's default), so a
+    # slow generation is never submitted twice
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                          max_retries=Retry(total=2, backoff_factor=0.2))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _completion_result(result: Dict[str, any], started: float) -> Dict[str, any]:
+    """Normalise an OpenAI-style /v1/completions response from TensorRT-LLM"""
+    choices = result.get('choices') or [{}]
+    return {
+        'ok': True,
+        'text': choices[0].get('text') or '',
+        'tokens': (result.get('usage') or {}).get('completion_tokens', 0),
+        'seconds': time.monotonic() - started,
+        'error': None
+    }
+
+
+class _OllamaStream:
+    """Accumulates Ollama's NDJSON /api/generate stream, one line at a time"""
+    
+    def __init__(self, stop: Optional[List[str]] = None):
+        self.stop = stop or []
+        self.longest_stop = max((len(s) for s in self.stop), default=0)
+        self.parts: List[str] = []
+        self.tail = ''
+        self.final: Dict[str, any] = {}
+        self.error = None
+    
+    def feed(self, line) -> bool:
+        """Add one line; True once the caller should stop reading"""
+        chunk = _loads(line)
+        if chunk.get('error'):
+            self.error = chunk['error']
+            return True
+        piece = chunk.get('response', '')
+        self.parts.append(piece)
+        if chunk.get('done'):
+            self.final = chunk
+            return True
+        if self.stop and piece:
+            # Only the last few characters can complete a stop sequence
+            self.tail = (self.tail + piece)[-(self.longest_stop + len(piece)):]
+            return any(s in self.tail for s in self.stop)
+        return False
+    
+    def result(self, started: float) -> Dict[str, any]:
+        if self.error:
+            return {'ok': False, 'error': f"Ollama API error: {self.error}"}
+        text = ''.join(self.parts)
+        for s in self.stop:
+            # Ollama strips stop sequences itself; this covers an early break
+            text = text.split(s, 1)[0]
+        total_duration = self.final.get('total_duration')
+        return {
+            'ok': True,
+            'text': text,
+            'tokens': self.final.get('eval_count', len(self.parts)),
+            'seconds': total_duration / 1000000000 if total_duration else time.monotonic() - started,
+            'error': None
+        }
+
 
 class SummarizationService:
     """Service for generating summaries using Ollama"""
@@ -29,6 +168,19 @@ class SummarizationService:
         self.model_name = os.environ.get("OLLAMA_MODEL", model_name)
         self.max_transcript_length = 50000  # ~50k characters max
         self.timeout = 2700  # 45 minutes timeout
+        # Optional TensorRT-LLM backend; when unset everything goes to Ollama
+        self.trtllm_endpoint = (os.environ.get("TRTLLM_ENDPOINT") or "").rstrip("/") or None
+        # Ollama defaults to a 2k context, which silently truncates our ~4k token prompt
+        self.num_ctx = int(os.environ.get("OLLAMA_NUM_CTX", "8192"))
+        self.num_predict = int(os.environ.get("OLLAMA_NUM_PREDICT", "3500"))
+        self.num_gpu = os.environ.get("OLLAMA_NUM_GPU")
+        # One pooled session so health checks, summaries and jump points reuse connections
+        self._session = _make_session()
+        # (monotonic time, endpoint, result) of the last healthy backend probe
+        self._health_cache = None
+        self.health_cache_ttl = 5.0
+        # httpx.AsyncClient for summarize_transcript_async, created on first use
+        self._aclient = None
     
     def summarize_transcript(self, transcript: str, model_name: str = None) -> Dict[str, any]:
         """
@@ -42,105 +194,64 @@ class SummarizationService:
             Dict with success status, summary text, and any errors
         """
         try:
-            # Validate input
-            if not transcript or not transcript.strip():
-                return {
-                    'success': False,
-                    'summary': None,
-                    'error': 'Empty transcript provided'
-                }
-            
-            transcript = transcript.strip()
+            failure, model, prompt = self._prepare_summary(transcript, model_name)
+            if failure:
+                return failure
             
-            # Check transcript length
-            if len(transcript) > self.max_transcript_length:
-                return {
-                    'success': False,
-                    'summary': None,
-                    'error': f'Transcript too long: {len(transcript)} characters (max {self.max_transcript_length})'
-                }
-            
-            # Use provided model or default
-            model = model_name or self.model_name
-            
-            # Check if Ollama is available
-            health_check = self.check_ollama_health()
+            # Check if the LLM backend is available
+            health_check = self.check_backend_health()
             if not health_check['healthy']:
-                return {
-                    'success': False,
-                    'summary': None,
-                    'error': f'Ollama service unavailable: {health_check["error"]}'
-                }
-            
-            # Create summarization prompt
-            prompt = self._create_summary_prompt(transcript)
+                return self._backend_unavailable(health_check)
             
-            logger.info(f"Generating summary using {model} for {len(transcript)} characters")
-            
-            # Call Ollama API
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.4,
-                        "top_p": 0.9,
-                        "max_tokens": 3500,  # More detailed summaries for 13B
-                        "stop": ["</summary>", "\n\n---"]
-                    }
-                },
-                timeout=self.timeout
-            )
-            
-            if response.status_code != 200:
-                error_msg = f"Ollama API error: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                return {
-                    'success': False,
-                    'summary': None,
-                    'error': error_msg
-                }
-            
-            result = response.json()
-            summary_text = result.get('response', '').strip()
-            
-            if not summary_text:
-                return {
-                    'success': False,
-                    'summary': None,
-                    'error': 'Model returned empty summary'
-                }
-            
-            # Post-process the summary
-            processed_summary = self._post_process_summary(summary_text)
-            
-            logger.info(f"Successfully generated summary: {len(processed_summary)} characters")
-            
-            return {
-                'success': True,
-                'summary': processed_summary,
-                'model_used': model,
-                'tokens_used': result.get('eval_count', 0),
-                'processing_time': result.get('total_duration', 0) / 1000000000,  # Convert to seconds
-                'error': None
-            }
+            result = self._generate(model, prompt, **_SUMMARY_SAMPLING, max_tokens=self.num_predict)
+            return self._summary_result(result, model)
             
         except requests.exceptions.Timeout:
-            logger.error(f"Summarization timeout after {self.timeout}s")
+            return self._summary_timeout()
+        except requests.exceptions.ConnectionError:
+            return self._summary_connection_failed()
+        except Exception as e:
+            logger.error(f"Summarization failed: {str(e)}")
             return {
                 'success': False,
                 'summary': None,
-                'error': f'Summarization timeout after {self.timeout} seconds'
+                'error': f'Summarization failed: {str(e)}'
             }
-        except requests.exceptions.ConnectionError:
-            logger.error("Connection to Ollama service failed")
+    
+    async def summarize_transcript_async(self, transcript: str, model_name: str = None) -> Dict[str, any]:
+        """
+        Async variant of summarize_transcript for callers on an event loop
+        
+        Requests go through a shared httpx.AsyncClient, so several summaries can
+        be in flight at once and Ollama's own parallelism (OLLAMA_NUM_PARALLEL)
+        decides throughput instead of the number of caller threads. Returns the
+        same dict as summarize_transcript.
+        """
+        try:
+            import httpx  # Lazy import: only the async path needs it
+        except ImportError:
             return {
                 'success': False,
                 'summary': None,
-                'error': 'Connection to Ollama service failed'
+                'error': 'Async summarization requires httpx'
             }
+        try:
+            failure, model, prompt = self._prepare_summary(transcript, model_name)
+            if failure:
+                return failure
+            
+            # Usually answered from the health cache; otherwise keep the blocking probe off the loop
+            health_check = await asyncio.to_thread(self.check_backend_health)
+            if not health_check['healthy']:
+                return self._backend_unavailable(health_check)
+            
+            result = await self._agenerate(model, prompt, **_SUMMARY_SAMPLING, max_tokens=self.num_predict)
+            return self._summary_result(result, model)
+            
+        except httpx.TimeoutException:
+            return self._summary_timeout()
+        except httpx.TransportError:
+            return self._summary_connection_failed()
         except Exception as e:
             logger.error(f"Summarization failed: {str(e)}")
             return {
@@ -149,17 +260,205 @@ class SummarizationService:
                 'error': f'Summarization failed: {str(e)}'
             }
     
+    def _prepare_summary(self, transcript: str, model_name: Optional[str]) -> Tuple[Optional[Dict[str, any]], str, str]:
+        """
+        Validate the transcript locally and build the prompt, before any network I/O
+        
+        Returns:
+            (failure dict or None, model, prompt)
+        """
+        model = model_name or self.model_name
+        # Strip only once
+        transcript = transcript.strip() if transcript else ''
+        if not transcript:
+            return {
+                'success': False,
+                'summary': None,
+                'error': 'Empty transcript provided'
+            }, model, ''
+        
+        # Check transcript length
+        if len(transcript) > self.max_transcript_length:
+            return {
+                'success': False,
+                'summary': None,
+                'error': f'Transcript too long: {len(transcript)} characters (max {self.max_transcript_length})'
+            }, model, ''
+        
+        logger.info(f"Generating summary using {model} for {len(transcript)} characters")
+        return None, model, self._create_summary_prompt(transcript)
+    
+    def _backend_unavailable(self, health_check: Dict[str, any]) -> Dict[str, any]:
+        return {
+            'success': False,
+            'summary': None,
+            'error': f'{self._backend_label()} service unavailable: {health_check["error"]}'
+        }
+    
+    def _summary_timeout(self) -> Dict[str, any]:
+        logger.error(f"Summarization timeout after {self.timeout}s")
+        return {
+            'success': False,
+            'summary': None,
+            'error': f'Summarization timeout after {self.timeout} seconds'
+        }
+    
+    def _summary_connection_failed(self) -> Dict[str, any]:
+        self._health_cache = None
+        logger.error(f"Connection to {self._backend_label()} service failed")
+        return {
+            'success': False,
+            'summary': None,
+            'error': f'Connection to {self._backend_label()} service failed'
+        }
+    
+    def _summary_result(self, result: Dict[str, any], model: str) -> Dict[str, any]:
+        """Turn a _generate/_agenerate result into the summarize_transcript response"""
+        if not result['ok']:
+            logger.error(result['error'])
+            return {
+                'success': False,
+                'summary': None,
+                'error': result['error']
+            }
+        
+        summary_text = result['text'].strip()
+        
+        if not summary_text:
+            return {
+                'success': False,
+                'summary': None,
+                'error': 'Model returned empty summary'
+            }
+        
+        # Post-process the summary
+        processed_summary = self._post_process_summary(summary_text)
+        
+        logger.info(f"Successfully generated summary: {len(processed_summary)} characters")
+        
+        return {
+            'success': True,
+            'summary': processed_summary,
+            'model_used': model,
+            'tokens_used': result['tokens'],
+            'processing_time': result['seconds'],
+            'error': None
+        }
+    
+    def _backend_label(self) -> str:
+        return "TensorRT-LLM" if self.trtllm_endpoint else "Ollama"
+    
+    def _generate_request(self, model: str, prompt: str, temperature: float, top_p: float,
+                          max_tokens: int, stop: Optional[List[str]]) -> Tuple[str, Dict[str, any]]:
+        """URL and JSON body for one completion on the configured backend"""
+        if self.trtllm_endpoint:
+            payload = {
+                "model": os.environ.get("TRTLLM_MODEL", model),
+                "prompt": prompt,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "top_p": top_p
+            }
+            if stop:
+                payload["stop"] = stop
+            return f"{self.trtllm_endpoint}/v1/completions", payload
+        
+        options = {
+            "temperature": temperature,
+            "top_p": top_p,
+            "num_predict": max_tokens,
+            "num_ctx": self.num_ctx
+        }
+        if stop:
+            options["stop"] = stop
+        if self.num_gpu:
+            options["num_gpu"] = int(self.num_gpu)
+        # Stream so we return as soon as Ollama reports done (or a stop sequence
+        # shows up) instead of waiting for the connection to close
+        return f"{self.ollama_url}/api/generate", {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "options": options
+        }
+    
+    def _api_error(self, status_code: int, text: str) -> Dict[str, any]:
+        self._health_cache = None
+        return {'ok': False, 'error': f"{self._backend_label()} API error: {status_code} - {text}"}
+    
+    def _generate(self, model: str, prompt: str, temperature: float, top_p: float,
+                  max_tokens: int, stop: Optional[List[str]] = None,
+                  timeout: Optional[int] = None) -> Dict[str, any]:
+        """
+        Run a single completion on the configured backend (streamed from Ollama)
+        
+        Returns:
+            Dict with ok flag, generated text, tokens generated, seconds taken and error
+        """
+        url, payload = self._generate_request(model, prompt, temperature, top_p, max_tokens, stop)
+        started = time.monotonic()
+        with self._session.post(url, json=payload, timeout=timeout or self.timeout,
+                                stream=not self.trtllm_endpoint) as response:
+            if response.status_code != 200:
+                return self._api_error(response.status_code, response.text)
+            if self.trtllm_endpoint:
+                return _completion_result(_loads(response.content), started)
+            stream = _OllamaStream(stop)
+            for line in response.iter_lines():
+                if line and stream.feed(line):
+                    break
+        return stream.result(started)
+    
+    async def _agenerate(self, model: str, prompt: str, temperature: float, top_p: float,
+                         max_tokens: int, stop: Optional[List[str]] = None,
+                         timeout: Optional[int] = None) -> Dict[str, any]:
+        """Async counterpart of _generate, over the shared httpx.AsyncClient"""
+        url, payload = self._generate_request(model, prompt, temperature, top_p, max_tokens, stop)
+        started = time.monotonic()
+        async with self._async_client().stream('POST', url, json=payload, timeout=timeout or self.timeout) as response:
+            if response.status_code != 200:
+                await response.aread()
+                return self._api_error(response.status_code, response.text)
+            if self.trtllm_endpoint:
+                return _completion_result(_loads(await response.aread()), started)
+            stream = _OllamaStream(stop)
+            async for line in response.aiter_lines():
+                if line and stream.feed(line):
+                    break
+        return stream.result(started)
+    
+    def _async_client(self):
+        """
+        Lazily create the shared httpx.AsyncClient
+        
+        The client's connection pool belongs to the event loop that first uses
+        it, so use the async methods from one long-lived loop (the app's).
+        Ollama speaks plain HTTP/1.1, so keep-alive rather than HTTP/2 is what
+        saves the connection setup.
+        """
+        if self._aclient is None:
+            import httpx
+            self._aclient = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+            )
+        return self._aclient
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was created"""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+    
     def _create_summary_prompt(self, transcript: str) -> str:
         """Create an effective prompt for comprehensive summarization"""
-        # Increase transcript size for more detailed summaries
-        max_chars = 15000  # Increased from 8000 for more detail
-        if len(transcript) > max_chars:
+        limited_transcript = transcript
+        if len(transcript) > _PROMPT_TRANSCRIPT_CHARS:
             # Take first part and last part to capture intro and conclusion
-            first_part = transcript[:max_chars//2]
-            last_part = transcript[-(max_chars//2):]
-            limited_transcript = f"{first_part}\n\n[... content truncated ...]\n\n{last_part}"
-        else:
-            limited_transcript = transcript
+            limited_transcript = (
+                f"{transcript[:_PROMPT_TRANSCRIPT_HALF]}\n\n[... content truncated ...]\n\n"
+                f"{transcript[-_PROMPT_TRANSCRIPT_HALF:]}"
+            )
             
         return f"""You are a world‑class technical explainer. Read the transcript and produce a rich, structured, highly useful summary. Do not add any preface like “here is the summary”. Start with the sections below. Use short, information‑dense bullets.
 
@@ -204,58 +503,43 @@ Transcript:
     
     def _post_process_summary(self, raw_summary: str) -> str:
         """Clean and format the generated summary"""
-        import re
-        
         # Remove common artifacts
         summary = raw_summary.strip()
         
         # Remove prompt echoes
-        for prefix in ["Summary:", "Key Points:", "Here is", "Here are", "This video", "The video"]:
-            if summary.startswith(prefix):
-                summary = summary[len(prefix):].strip()
+        if summary.startswith(_ECHO_PREFIXES):
+            for prefix in _ECHO_PREFIXES:
+                if summary.startswith(prefix):
+                    summary = summary[len(prefix):].strip()
         
         # Remove specific unwanted phrases
-        unwanted_phrases = [
-            r'the summary of the transcript in the requested format:?\s*',
-            r'here is the summary of the transcript:?\s*',
-            r'here\'s the summary:?\s*',
-            r'summary of the transcript:?\s*',
-            r'here is a comprehensive summary:?\s*',
-            r'here\'s a comprehensive summary:?\s*',
-            r'based on the transcript:?\s*',
-            r'transcript summary:?\s*'
-        ]
-        
-        for phrase in unwanted_phrases:
-            summary = re.sub(phrase, '', summary, flags=re.IGNORECASE)
+        for phrase in _UNWANTED_PHRASES:
+            summary = phrase.sub('', summary)
         
         # Remove introductory phrases at the start
-        summary = re.sub(r'^(Here is|Here are|This is|The following|Below are).*?:', '', summary, flags=re.IGNORECASE).strip()
+        summary = _INTRO.sub('', summary).strip()
         
         # Ensure bullet points are properly formatted
         # Convert various bullet formats to consistent bullets
-        summary = re.sub(r'^[-*]\s*', '• ', summary, flags=re.MULTILINE)
-        summary = re.sub(r'^\d+\.\s*', '• ', summary, flags=re.MULTILINE)
+        summary = _BULLET_DASH.sub('• ', summary)
+        summary = _BULLET_NUM.sub('• ', summary)
         
         # If no bullets exist, try to create them from sentences/paragraphs
         if '•' not in summary and len(summary) > 100:
             # Split long paragraphs into bullet points
-            sentences = re.split(r'[.!?]+\s+', summary)
+            sentences = _SENTENCE_END.split(summary)
             if len(sentences) > 2:
-                bullets = []
-                for sentence in sentences:
-                    sentence = sentence.strip()
-                    if len(sentence) > 20:  # Skip very short fragments
-                        bullets.append(f"• {sentence}")
+                # Skip very short fragments
+                bullets = [f"• {sentence}" for sentence in map(str.strip, sentences) if len(sentence) > 20]
                 if bullets:
                     summary = '\n'.join(bullets)
         
         # Clean up excessive whitespace
-        summary = re.sub(r'\n\s*\n\s*\n', '\n\n', summary)
-        summary = re.sub(r' +', ' ', summary)
+        summary = _MULTI_BLANK.sub('\n\n', summary)
+        summary = _MULTI_SPACE.sub(' ', summary)
         
         # Ensure bullet points start on new lines
-        summary = re.sub(r'([.!?])\s*•', r'\1\n•', summary)
+        summary = _BULLET_JOIN.sub(r'\1\n•', summary)
         
         return summary.strip()
     
@@ -263,10 +547,10 @@ Transcript:
         """Check if Ollama service is available and healthy"""
         try:
             # Check if service is running
-            response = requests.get(f"{self.ollama_url}/api/tags", timeout=10)
+            response = self._session.get(f"{self.ollama_url}/api/tags", timeout=10)
             
             if response.status_code == 200:
-                models_data = response.json()
+                models_data = _loads(response.content)
                 available_models = [model['name'] for model in models_data.get('models', [])]
                 
                 return {
@@ -297,17 +581,50 @@ Transcript:
                 'error': f'Health check failed: {str(e)}'
             }
     
+    def check_backend_health(self) -> Dict[str, any]:
+        """
+        Check whichever LLM backend summaries are routed to
+        
+        A healthy result is reused for health_cache_ttl seconds so a summary
+        followed by jump point generation probes the backend once. Failed
+        generate calls drop the cached result.
+        """
+        endpoint = self.trtllm_endpoint or self.ollama_url
+        cached = self._health_cache
+        if cached and cached[1] == endpoint and time.monotonic() - cached[0] < self.health_cache_ttl:
+            return cached[2]
+        health = self._probe_backend_health()
+        self._health_cache = (time.monotonic(), endpoint, health) if health['healthy'] else None
+        return health
+    
+    def _probe_backend_health(self) -> Dict[str, any]:
+        if not self.trtllm_endpoint:
+            return self.check_ollama_health()
+        try:
+            response = self._session.get(f"{self.trtllm_endpoint}/health", timeout=10)
+            if response.status_code == 200:
+                return {'healthy': True, 'error': None}
+            return {
+                'healthy': False,
+                'error': f'TensorRT-LLM returned status {response.status_code}'
+            }
+        except requests.exceptions.RequestException as e:
+            return {
+                'healthy': False,
+                'error': f'Cannot connect to TensorRT-LLM service: {e}'
+            }
+    
     def get_model_info(self, model_name: str) -> Optional[Dict[str, any]]:
         """Get information about a specific model"""
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.ollama_url}/api/show",
                 json={"name": model_name},
                 timeout=30
             )
             
             if response.status_code == 200:
-                return response.json()
+                return _loads(response.content)
             else:
                 return None
                 
@@ -324,30 +641,10 @@ Transcript:
         if not summary:
             return []
         
-        topics = []
-        
         # Simple keyword-based topic extraction
         # In production, you might want to use more sophisticated NLP
-        topic_keywords = {
-            "Programming": ["code", "programming", "software", "development", "algorithm"],
-            "Machine Learning": ["machine learning", "ml", "ai", "neural", "model", "training"],
-            "Web Development": ["web", "html", "css", "javascript", "frontend", "backend"],
-            "Data Science": ["data", "analysis", "statistics", "visualization", "dataset"],
-            "DevOps": ["deployment", "docker", "kubernetes", "ci/cd", "infrastructure"],
-            "Security": ["security", "authentication", "encryption", "vulnerability"],
-            "Database": ["database", "sql", "query", "table", "schema"],
-            "Cloud": ["cloud", "aws", "azure", "gcp", "serverless"],
-            "Mobile": ["mobile", "ios", "android", "app", "flutter", "react native"],
-            "Design": ["design", "ui", "ux", "interface", "user experience"]
-        }
-        
         summary_lower = summary.lower()
-        
-        for topic, keywords in topic_keywords.items():
-            if any(keyword in summary_lower for keyword in keywords):
-                topics.append(topic)
-        
-        return topics
+        return [topic for topic, pattern in _TOPIC_PATTERNS if pattern.search(summary_lower)]
     
     def pull_model(self, model_name: str) -> Dict[str, any]:
         """Pull/download a model to Ollama"""
@@ -363,7 +660,7 @@ Transcript:
                     'cached': True
                 }
             
-            response = requests.post(
+            response = self._session.post(
                 f"{self.ollama_url}/api/pull",
                 json={"name": model_name, "stream": False},
                 timeout=600  # 10 minutes for model download
@@ -403,32 +700,31 @@ Transcript:
             # Build concise candidates from segments into ~20s windows with short snippets
             candidates = []
             acc_text = []
+            acc_len = 0  # running total of len(acc_text items), so windows stay O(n)
             window_start = None
-            last_end = None
             for seg in segments or []:
                 try:
                     s = float(seg.get('start', 0))
                     e = float(seg.get('end', s))
-                    text = (seg.get('text') or '').strip()
+                    text = (seg.get('text') or '').strip().translate(_WS_TO_SPACE)
                 except Exception:
                     continue
                 if window_start is None:
                     window_start = s
                 acc_text.append(text)
-                last_end = e
-                long_enough = (e - window_start) >= 20 or sum(len(t) for t in acc_text) >= 220
-                if long_enough:
-                    snippet = ' '.join(acc_text)
-                    snippet = snippet.replace('\n', ' ').strip()
+                acc_len += len(text)
+                if (e - window_start) >= 20 or acc_len >= 220:
+                    snippet = ' '.join(acc_text).strip()
                     if snippet:
                         candidates.append({
                             'seconds': int(max(0, round(window_start))),
                             'snippet': snippet[:220]
                         })
                     acc_text = []
+                    acc_len = 0
                     window_start = None
             if window_start is not None and acc_text:
-                snippet = ' '.join(acc_text).replace('\n', ' ').strip()
+                snippet = ' '.join(acc_text).strip()
                 if snippet:
                     candidates.append({'seconds': int(max(0, round(window_start))), 'snippet': snippet[:220]})
 
@@ -442,49 +738,33 @@ Transcript:
                 return []
 
             # Prepare prompt
-            def fmt_ts(sec: int) -> str:
-                m = sec // 60
-                s = sec % 60
-                return f"{m}:{str(s).zfill(2)}"
-
-            lines = [f"{fmt_ts(c['seconds'])} — {c['snippet']}" for c in candidates]
+            candidate_lines = "\n".join(
+                f"{c['seconds'] // 60}:{c['seconds'] % 60:02d} — {c['snippet']}" for c in candidates
+            )
             guide = (
                 "Select 6–12 truly significant moments that a viewer would want to jump to. "
                 "Prefer topic changes, key demos, definitions, steps starting points, and conclusions. "
                 "Spread them across the video (don’t cluster). "
                 "Respond ONLY as JSON array with objects: {\"seconds\": <int>, \"title\": \"short label\"}."
             )
+            context = (transcript or '')[:2000]
             prompt = (
-                f"Transcript context (optional, truncated):\n{(transcript or '')[:2000]}\n\n"
-                f"Candidate moments (time — snippet):\n" + "\n".join(lines) + "\n\n" + guide
+                f"Transcript context (optional, truncated):\n{context}\n\n"
+                f"Candidate moments (time — snippet):\n{candidate_lines}\n\n{guide}"
             )
 
             # Check health
-            health = self.check_ollama_health()
+            health = self.check_backend_health()
             model = model_name or self.model_name
             if health.get('healthy'):
-                resp = requests.post(
-                    f"{self.ollama_url}/api/generate",
-                    json={
-                        "model": model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.2,
-                            "top_p": 0.9,
-                            "max_tokens": 800
-                        }
-                    },
-                    timeout=600
-                )
-                if resp.status_code == 200:
-                    text = resp.json().get('response', '')
+                resp = self._generate(model, prompt, temperature=0.2, top_p=0.9, max_tokens=800, timeout=600)
+                if resp['ok']:
+                    text = resp['text']
                     # Extract first JSON array
-                    import re
-                    m = re.search(r"\[[\s\S]*\]", text)
+                    m = _JSON_ARRAY.search(text)
                     if m:
                         try:
-                            arr = json.loads(m.group(0))
+                            arr = _loads(m.group(0))
                             out = []
                             for item in arr:
                                 if not isinstance(item, dict):
@@ -494,7 +774,7 @@ Transcript:
                                 if sec >= 0 and title:
                                     out.append({"seconds": sec, "title": title[:100]})
                             # Enforce size limits and ordering
-                            out = sorted(out, key=lambda x: x['seconds'])
+                            out.sort(key=itemgetter('seconds'))
                             if len(out) > max_points:
                                 # Evenly downsample
                                 step = max(1, len(out) // max_points)
@@ -505,18 +785,15 @@ Transcript:
                             pass
 
             # Fallback heuristic: evenly spaced key windows with keyword bias
-            keywords = ("intro|introduction|overview|setup|install|configure|demo|example|concept|definition|"
-                        "recap|summary|conclusion|next steps|best practice|tip|gotcha|issue|troubleshoot")
-            import re
             scored = []
             for c in candidates:
                 snip = c['snippet'].lower()
                 score = 0
-                if re.search(keywords, snip):
+                if _JUMP_KEYWORDS.search(snip):
                     score += 2
                 score += len(snip) / 200.0  # prefer meatier windows
                 scored.append((score, c))
-            scored.sort(key=lambda x: -x[0])
+            scored.sort(key=itemgetter(0), reverse=True)  # stable, like sorting on -score
             # Take top 3 by score, then fill remaining evenly
             top = [c for _, c in scored[:3]]
             remaining = [c for _, c in scored[3:]]
@@ -525,7 +802,10 @@ Transcript:
                 step = max(1, len(remaining) // need)
                 top.extend(remaining[::step][:need])
             # Sort and label
-            top = sorted({c['seconds']: c for c in top}.values(), key=lambda x: x['seconds'])
+            # One candidate per second (the last one wins, as a dict would keep it)
+            seen = set()
+            top = [c for c in reversed(top) if not (c['seconds'] in seen or seen.add(c['seconds']))]
+            top.sort(key=itemgetter('seconds'))
             out = []
             for c in top:
                 title = c['snippet'].split('. ')[0].strip()
@@ -5,12 +5,13 @@ Simple in-memory task queue for background AI summary processing.
 """
 import uuid
 import asyncio
+import heapq
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional, List, Callable, Any
+from typing import Dict, Optional, List, Callable, Any, Tuple
 from enum import Enum
 import threading
-import time
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +28,10 @@ class TaskStatus(Enum):
 class Task:
     """Represents a background task"""
     
+    __slots__ = ('task_id', 'task_type', 'data', 'callback', 'status', 'created_at', 'started_at',
+                 'completed_at', 'result', 'error', 'progress', 'progress_percent', 'future',
+                 '_created_at_iso', '_started_at_iso', '_completed_at_iso')
+    
     def __init__(self, task_id: str, task_type: str, data: Dict[str, Any], callback: Callable = None):
         self.task_id = task_id
         self.task_type = task_type
@@ -36,10 +41,26 @@ class Task:
         self.created_at = datetime.utcnow()
         self.started_at = None
         self.completed_at = None
+        # isoformat() of each timestamp, formatted once when it is set rather than on every poll
+        self._created_at_iso = self.created_at.isoformat()
+        self._started_at_iso = None
+        self._completed_at_iso = None
         self.result = None
         self.error = None
         self.progress = ""
         self.progress_percent = 0
+        # Executor future while the task is queued or running
+        self.future: Optional[Future] = None
+    
+    def mark_started(self) -> None:
+        """Record the start time"""
+        self.started_at = datetime.utcnow()
+        self._started_at_iso = self.started_at.isoformat()
+    
+    def mark_completed(self) -> None:
+        """Record the completion time"""
+        self.completed_at = datetime.utcnow()
+        self._completed_at_iso = self.completed_at.isoformat()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert task to dictionary"""
@@ -47,9 +68,9 @@ class Task:
             'task_id': self.task_id,
             'task_type': self.task_type,
             'status': self.status.value,
-            'created_at': self.created_at.isoformat(),
-            'started_at': self.started_at.isoformat() if self.started_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'created_at': self._created_at_iso,
+            'started_at': self._started_at_iso,
+            'completed_at': self._completed_at_iso,
             'progress': self.progress,
             'progress_percent': self.progress_percent,
             'result': self.result,
@@ -63,33 +84,64 @@ class TaskQueue:
     
     def __init__(self, max_workers: int = 2):
         self.tasks: Dict[str, Task] = {}
-        self.pending_tasks: List[str] = []
+        # Tasks added before start(), submitted to the executor when it starts
+        self._unsubmitted: List[str] = []
+        # (completed_at timestamp, task_id) of finished tasks, oldest first, so
+        # cleanup_old_tasks only touches the tasks it actually removes
+        self._completion_heap: List[Tuple[float, str]] = []
+        # video_path -> id of its pending/processing task, for O(1) "is it running?" lookups
+        self._active_by_video: Dict[str, str] = {}
         self.max_workers = max_workers
         self.active_workers = 0
+        # Tasks per status, kept up to date on every transition (guarded by self.lock)
+        self._status_counts: Dict[str, int] = {status.value: 0 for status in TaskStatus}
+        # Guards the task maps and index; active_workers has its own lock so
+        # worker bookkeeping never waits on add_task/cancel_task
         self.lock = threading.Lock()
+        self._worker_lock = threading.Lock()
         self.running = False
-        self.worker_thread = None
+        # Persistent worker threads, created by start()
+        self._executor: Optional[ThreadPoolExecutor] = None
         
         # Task handlers
         self.handlers: Dict[str, Callable] = {}
     
     def start(self):
-        """Start the background worker"""
-        if self.running:
-            return
-        
-        self.running = True
-        self.worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
-        self.worker_thread.start()
+        """Start the background workers"""
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="taskq")
+            for task_id in self._unsubmitted:
+                task = self.tasks.get(task_id)
+                # Tasks cancelled before start() stay in the list; skip them here
+                if task and task.status == TaskStatus.PENDING:
+                    self._submit(task)
+            self._unsubmitted.clear()
         logger.info("Task queue worker started")
     
     def stop(self):
-        """Stop the background worker"""
-        self.running = False
-        if self.worker_thread:
-            self.worker_thread.join(timeout=5)
+        """Stop the background workers; queued tasks are cancelled, running ones finish"""
+        with self.lock:
+            self.running = False
+            executor, self._executor = self._executor, None
+            # Nothing will run the queued tasks now: cancel them so they are no
+            # longer reported as pending or found as a video's active task
+            for task in self.tasks.values():
+                if task.status == TaskStatus.PENDING:
+                    self._set_status(task, TaskStatus.CANCELLED)
+                    task.future = None
+                    self._release_video(task)
+            self._unsubmitted.clear()
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
         logger.info("Task queue worker stopped")
     
+    def _submit(self, task: Task) -> None:
+        """Hand a task to the executor (caller holds the lock)"""
+        task.future = self._executor.submit(self._process_task, task.task_id)
+    
     def register_handler(self, task_type: str, handler: Callable):
         """Register a handler function for a task type"""
         self.handlers[task_type] = handler
@@ -112,15 +164,38 @@ class TaskQueue:
         with self.lock:
             task = Task(task_id, task_type, data, callback)
             self.tasks[task_id] = task
-            self.pending_tasks.append(task_id)
+            self._status_counts[TaskStatus.PENDING.value] += 1
+            video_path = data.get('video_path')
+            if video_path:
+                self._active_by_video[video_path] = task_id
+            if self.running:
+                self._submit(task)
+            else:
+                self._unsubmitted.append(task_id)
         
         logger.info(f"Added task {task_id} of type {task_type}")
         return task_id
     
+    def _set_status(self, task: Task, status: TaskStatus) -> None:
+        """Move a task to a new status and update the counters (caller holds the lock)"""
+        self._status_counts[task.status.value] -= 1
+        self._status_counts[status.value] += 1
+        task.status = status
+    
     def get_task(self, task_id: str) -> Optional[Task]:
         """Get task by ID"""
         return self.tasks.get(task_id)
     
+    def find_active_task(self, video_path: str) -> Optional[str]:
+        """Get the id of the pending/processing task for a video, if any"""
+        return self._active_by_video.get(video_path)
+    
+    def _release_video(self, task: Task) -> None:
+        """Drop a finished task from the active-by-video index (caller holds the lock)"""
+        video_path = task.data.get('video_path')
+        if video_path and self._active_by_video.get(video_path) == task.task_id:
+            del self._active_by_video[video_path]
+    
     def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get task status information"""
         task = self.get_task(task_id)
@@ -131,23 +206,23 @@ class TaskQueue:
         with self.lock:
             task = self.tasks.get(task_id)
             if task and task.status == TaskStatus.PENDING:
-                task.status = TaskStatus.CANCELLED
-                if task_id in self.pending_tasks:
-                    self.pending_tasks.remove(task_id)
+                self._set_status(task, TaskStatus.CANCELLED)
+                # The CANCELLED status is the tombstone: start() and _process_task
+                # both skip non-pending tasks, so nothing is searched for or removed
+                if task.future:
+                    task.future.cancel()
+                self._release_video(task)
                 return True
         return False
     
     def get_queue_status(self) -> Dict[str, Any]:
         """Get overall queue status"""
         with self.lock:
-            status_counts = {}
-            for task in self.tasks.values():
-                status = task.status.value
-                status_counts[status] = status_counts.get(status, 0) + 1
+            status_counts = dict(self._status_counts)
         
         return {
             'total_tasks': len(self.tasks),
-            'pending_tasks': len(self.pending_tasks),
+            'pending_tasks': status_counts[TaskStatus.PENDING.value],
             'active_workers': self.active_workers,
             'max_workers': self.max_workers,
             'running': self.running,
@@ -159,60 +234,32 @@ class TaskQueue:
         cutoff_time = datetime.utcnow().timestamp() - (max_age_hours * 3600)
         
         with self.lock:
-            to_remove = []
-            for task_id, task in self.tasks.items():
-                if task.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
-                    if task.completed_at and task.completed_at.timestamp() < cutoff_time:
-                        to_remove.append(task_id)
-            
-            for task_id in to_remove:
-                del self.tasks[task_id]
-                
-            logger.info(f"Cleaned up {len(to_remove)} old tasks")
-    
-    def _worker_loop(self):
-        """Main worker loop"""
-        while self.running:
-            try:
-                # Check if we can start a new task
-                if self.active_workers >= self.max_workers:
-                    time.sleep(1)
+            heap = self._completion_heap
+            removed = 0
+            while heap and heap[0][0] < cutoff_time:
+                _, task_id = heapq.heappop(heap)
+                task = self.tasks.pop(task_id, None)
+                if task is None:
                     continue
+                self._status_counts[task.status.value] -= 1
+                removed += 1
                 
-                # Get next pending task
-                task_id = None
-                with self.lock:
-                    if self.pending_tasks:
-                        task_id = self.pending_tasks.pop(0)
-                
-                if task_id:
-                    # Process the task in a separate thread
-                    worker_thread = threading.Thread(
-                        target=self._process_task,
-                        args=(task_id,),
-                        daemon=True
-                    )
-                    worker_thread.start()
-                else:
-                    time.sleep(1)
-                    
-            except Exception as e:
-                logger.error(f"Worker loop error: {e}")
-                time.sleep(5)
+            logger.info(f"Cleaned up {removed} old tasks")
     
     def _process_task(self, task_id: str):
         """Process a single task"""
-        task = self.get_task(task_id)
-        if not task:
-            return
-        
         with self.lock:
+            task = self.tasks.get(task_id)
+            # Skip tasks cancelled just as a worker thread picked them up
+            if not task or task.status != TaskStatus.PENDING:
+                return
+            # Mark task as processing
+            self._set_status(task, TaskStatus.PROCESSING)
+            task.mark_started()
+        with self._worker_lock:
             self.active_workers += 1
         
         try:
-            # Mark task as processing
-            task.status = TaskStatus.PROCESSING
-            task.started_at = datetime.utcnow()
             
             logger.info(f"Processing task {task_id} of type {task.task_type}")
             
@@ -225,8 +272,9 @@ class TaskQueue:
             result = handler(task)
             
             # Mark as completed
-            task.status = TaskStatus.COMPLETED
-            task.completed_at = datetime.utcnow()
+            with self.lock:
+                self._set_status(task, TaskStatus.COMPLETED)
+            task.mark_completed()
             task.result = result
             task.progress = "Completed"
             task.progress_percent = 100
@@ -242,16 +290,22 @@ class TaskQueue:
             
         except Exception as e:
             # Mark as failed
-            task.status = TaskStatus.FAILED
-            task.completed_at = datetime.utcnow()
+            with self.lock:
+                self._set_status(task, TaskStatus.FAILED)
+            task.mark_completed()
             task.error = str(e)
             task.progress = f"Failed: {str(e)}"
             
             logger.error(f"Task {task_id} failed: {e}")
             
         finally:
-            with self.lock:
+            with self._worker_lock:
                 self.active_workers -= 1
+            with self.lock:
+                task.future = None
+                self._release_video(task)
+                if task.completed_at:
+                    heapq.heappush(self._completion_heap, (task.completed_at.timestamp(), task_id))
     
     def update_task_progress(self, task_id: str, progress: str, percent: int = None):
         """Update task progress"""
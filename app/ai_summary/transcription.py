@@ -1,41 +1,215 @@
 """
 Transcription Service
 
-Converts audio files to text using OpenAI Whisper.
+Converts audio files to text using Whisper.
+
+The runtime is picked by WHISPER_BACKEND: "faster-whisper" (CTranslate2,
+int8 weights), "openai" (reference openai-whisper), "whisper-trt"
+(TensorRT engines on NVIDIA/Jetson) or "auto" (default), which prefers
+faster-whisper when it is installed.
 """
+import functools
 import os
 import logging
+import subprocess
 import tempfile
-from typing import Dict, Optional, List
-import whisper
+import threading
+import wave
+from typing import Any, Dict, Optional, List, Tuple, Union
 from pathlib import Path
 
+try:
+    import whisper
+except ImportError:  # faster-whisper only installs
+    whisper = None
+
+from .audio_extraction import pcm_chunks_to_array
+
 logger = logging.getLogger(__name__)
 
+_BACKENDS = ("faster-whisper", "openai", "whisper-trt")
+
+# Loaded models shared by every TranscriptionService in the process, keyed by
+# (backend, model_name), so several services never hold duplicate weights
+_MODEL_CACHE: Dict[Tuple[str, str], Any] = {}
+_MODEL_LOCK = threading.Lock()
+
+
+def _select_backend() -> str:
+    """Resolve WHISPER_BACKEND, falling back to whatever is installed"""
+    backend = os.environ.get("WHISPER_BACKEND", "auto").strip().lower()
+    if backend in _BACKENDS:
+        return backend
+    try:
+        import faster_whisper  # noqa: F401
+        return "faster-whisper"
+    except ImportError:
+        return "openai"
+
+
+def _faster_whisper_device() -> Tuple[str, str]:
+    """Pick (device, compute_type) for faster-whisper"""
+    try:
+        import ctranslate2
+        has_cuda = ctranslate2.get_cuda_device_count() > 0
+    except Exception:
+        has_cuda = False
+    device = "cuda" if has_cuda else "cpu"
+    # int8_float16 needs a GPU; plain int8 is the fast path on CPU
+    default_compute = "int8_float16" if has_cuda else "int8"
+    return device, os.environ.get("WHISPER_COMPUTE_TYPE", default_compute)
+
+
+def _load_audio(audio_path: str):
+    """
+    Decode an audio file to the 16 kHz mono float32 array Whisper works on
+    
+    Only the most recent decode is kept, keyed by (path, mtime, size): enough
+    for transcribing the same file again (e.g. plain text, then with
+    timestamps) without holding several decoded files in memory.
+    """
+    st = os.stat(audio_path)
+    return _decode_audio(audio_path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=1)
+def _decode_audio(audio_path: str, mtime_ns: int, size: int):
+    """Decode audio to 16 kHz mono float32; mtime_ns and size only key the cache"""
+    # Our extracted segments are already 16 kHz mono s16le WAV: read them directly
+    try:
+        with wave.open(audio_path, 'rb') as wav:
+            if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) == (16000, 1, 2):
+                return pcm_chunks_to_array([wav.readframes(wav.getnframes())])
+    except (wave.Error, EOFError):
+        pass
+    # Anything else: resample/downmix with ffmpeg, as the Whisper backends do internally
+    cmd = [
+        'ffmpeg', '-nostdin', '-threads', '0', '-i', audio_path,
+        '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', '16000', '-'
+    ]
+    result = subprocess.run(cmd, capture_output=True, check=True)
+    return pcm_chunks_to_array([result.stdout])
+
 
 class TranscriptionService:
     """Service for transcribing audio files using Whisper"""
     
-    def __init__(self, model_name: str = "base"):
+    def __init__(self, model_name: str = "base",
+                 temperature: Union[float, Tuple[float, ...]] = 0.0,
+                 condition_on_previous_text: bool = False):
         """
         Initialize transcription service
         
         Args:
             model_name: Whisper model to use (tiny, base, small, medium, large)
+            temperature: Decoding temperature, or a tuple to retry with on failed
+                compression-ratio/logprob checks. A single 0.0 decodes each
+                window once instead of up to six times.
+            condition_on_previous_text: Prompt each window with the previous
+                window's text (slower, and prone to repetition loops)
         """
         self.model_name = model_name
-        self.model = None
-        self._load_model()
+        self.backend = _select_backend()
+        self.temperature = temperature
+        self.condition_on_previous_text = condition_on_previous_text
     
-    def _load_model(self) -> None:
-        """Load the Whisper model (lazy loading)"""
+    @property
+    def model(self):
+        """The loaded Whisper model, loaded on first use (None if loading failed)"""
+        key = (self.backend, self.model_name)
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            with _MODEL_LOCK:
+                model = _MODEL_CACHE.get(key)
+                if model is None:
+                    model = self._load_model()
+                    if model is not None:
+                        _MODEL_CACHE[key] = model
+        return model
+    
+    def _load_model(self):
+        """Load the Whisper model for the current backend (None on failure)"""
         try:
-            logger.info(f"Loading Whisper model: {self.model_name}")
-            self.model = whisper.load_model(self.model_name)
-            logger.info(f"Successfully loaded Whisper model: {self.model_name}")
+            logger.info(f"Loading Whisper model: {self.model_name} ({self.backend})")
+            if self.backend == "faster-whisper":
+                from faster_whisper import WhisperModel
+                device, compute_type = _faster_whisper_device()
+                model = WhisperModel(self.model_name, device=device, compute_type=compute_type)
+            elif self.backend == "whisper-trt":
+                from whisper_trt import load_trt_model
+                device = "cuda"
+                model = load_trt_model(self.model_name)
+            else:
+                if whisper is None:
+                    raise ImportError("openai-whisper is not installed")
+                import torch
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+                model = whisper.load_model(self.model_name, device=device)
+            logger.info(f"Successfully loaded Whisper model: {self.model_name} on {device}")
+            return model
         except Exception as e:
             logger.error(f"Failed to load Whisper model {self.model_name}: {e}")
-            self.model = None
+            return None
+    
+    def _run_transcribe(self, audio_path: str, language: str = None,
+                        word_timestamps: bool = False) -> Dict[str, any]:
+        """
+        Run the loaded backend and normalise its output to the openai-whisper
+        result shape ({'text', 'language', 'segments'})
+        """
+        if self.backend == "whisper-trt":
+            # whisper_trt only returns the text, no segment timing
+            result = self.model.transcribe(audio_path)
+            return {
+                'text': result.get('text', ''),
+                'language': language or 'unknown',
+                'segments': []
+            }
+        
+        # Decode once here (cached) rather than letting the backend run ffmpeg per call
+        audio = _load_audio(audio_path)
+        
+        if self.backend == "faster-whisper":
+            segments, info = self.model.transcribe(
+                audio,
+                language=language,
+                task="transcribe",
+                word_timestamps=word_timestamps,
+                temperature=self.temperature,
+                condition_on_previous_text=self.condition_on_previous_text,
+                vad_filter=True
+            )
+            # segments is a generator; decoding happens while we iterate
+            seg_dicts = []
+            for seg in segments:
+                seg_dicts.append({
+                    'start': seg.start,
+                    'end': seg.end,
+                    'text': seg.text,
+                    'no_speech_prob': seg.no_speech_prob,
+                    'words': [
+                        {'word': w.word, 'start': w.start, 'end': w.end, 'probability': w.probability}
+                        for w in (seg.words or [])
+                    ]
+                })
+            return {
+                'text': ''.join(seg['text'] for seg in seg_dicts),
+                'language': info.language,
+                'segments': seg_dicts
+            }
+        
+        model = self.model
+        return model.transcribe(
+            audio,
+            language=language,
+            task="transcribe",
+            verbose=False,
+            word_timestamps=word_timestamps,
+            temperature=self.temperature,
+            condition_on_previous_text=self.condition_on_previous_text,
+            # Half precision on GPU; on CPU whisper would warn and fall back to FP32
+            fp16=model.device.type == "cuda"
+        )
     
     def transcribe_audio(self, audio_path: str, language: str = None) -> Dict[str, any]:
         """
@@ -79,24 +253,17 @@ class TranscriptionService:
             
             # Ensure model is loaded
             if self.model is None:
-                self._load_model()
-                if self.model is None:
-                    return {
-                        'success': False,
-                        'transcript': None,
-                        'language': None,
-                        'error': f'Could not load Whisper model: {self.model_name}'
-                    }
+                return {
+                    'success': False,
+                    'transcript': None,
+                    'language': None,
+                    'error': f'Could not load Whisper model: {self.model_name}'
+                }
             
             logger.info(f"Transcribing audio file: {audio_path}")
             
             # Transcribe the audio
-            result = self.model.transcribe(
-                audio_path,
-                language=language,
-                task="transcribe",
-                verbose=False
-            )
+            result = self._run_transcribe(audio_path, language=language)
             
             transcript_text = result.get("text", "").strip()
             detected_language = result.get("language", "unknown")
@@ -207,7 +374,7 @@ class TranscriptionService:
         try:
             logger.info(f"Switching from {self.model_name} to {model_name}")
             self.model_name = model_name
-            self._load_model()
+            # Loads the model unless another service already has it cached
             return self.model is not None
         except Exception as e:
             logger.error(f"Failed to switch to model {model_name}: {e}")
@@ -226,22 +393,14 @@ class TranscriptionService:
         """
         try:
             if self.model is None:
-                self._load_model()
-                if self.model is None:
-                    return {
-                        'success': False,
-                        'error': f'Could not load Whisper model: {self.model_name}'
-                    }
+                return {
+                    'success': False,
+                    'error': f'Could not load Whisper model: {self.model_name}'
+                }
             
             logger.info(f"Transcribing with timestamps: {audio_path}")
             
-            result = self.model.transcribe(
-                audio_path,
-                language=language,
-                task="transcribe",
-                verbose=False,
-                word_timestamps=True
-            )
+            result = self._run_transcribe(audio_path, language=language, word_timestamps=True)
             
             segments = []
             for segment in result.get('segments', []):
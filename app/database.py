@@ -1,10 +1,14 @@
 import os
+import string
 import hashlib
-from sqlalchemy import create_engine, Column, String, Float, DateTime, Text, Integer, ForeignKey, text, UniqueConstraint, Index
+import functools
+import threading
+from sqlalchemy import create_engine, BigInteger, Column, String, Float, DateTime, Text, Integer, ForeignKey, text, UniqueConstraint, Index, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 # Database setup
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./db/user_preferences.db")
@@ -15,10 +19,43 @@ engine = create_engine(
     pool_size=int(os.environ.get("DB_POOL_SIZE", "20")),
     max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "40")),
     pool_pre_ping=True,
+    # Recycle connections before server-side idle timeouts (non-SQLite backends) drop them
+    pool_recycle=int(os.environ.get("DB_POOL_RECYCLE", "1800")),
 )
+
+if "sqlite" in DATABASE_URL:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _record):
+        # WAL lets readers run alongside the writer, and with it synchronous=NORMAL
+        # only fsyncs at checkpoints instead of on every commit
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.close()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# ASCII-only, matching SQLite's lower() and the LIKE these lookups replaced
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+def video_basename(path: str) -> str:
+    """
+    Last path component, treating both / and \\ as separators, with ASCII
+    letters lowercased so lookups stay case-insensitive (the library is often
+    on a case-insensitive mount)
+    """
+    return path.replace("\\", "/").rsplit("/", 1)[-1].translate(_ASCII_LOWER)
+
+def _video_basename_default(context) -> str:
+    return video_basename(context.get_current_parameters()["video_path"])
+
+def video_path_hash(path: str) -> str:
+    """Fixed-width lookup key for a video path: first 128 bits of its SHA-256, as hex"""
+    return hashlib.sha256(path.encode()).hexdigest()[:32]
+
+def _video_path_hash_default(context) -> str:
+    return video_path_hash(context.get_current_parameters()["video_path"])
+
 class User(Base):
     __tablename__ = "users"
     
@@ -43,10 +80,18 @@ class VideoSummary(Base):
     __tablename__ = "video_summaries"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    video_path = Column(Text, nullable=False, index=True)
+    video_path = Column(Text, nullable=False)
+    # Indexed stand-in for video_path: exact-path lookups and joins compare these
+    # 32 chars instead of walking a btree keyed on long path strings
+    video_path_hash = Column(String(32), nullable=False, default=_video_path_hash_default)
+    # Lowercased filename only, so lookups still match after the library base
+    # dir moves or the path comes back in a different case
+    video_basename = Column(Text, index=True, default=_video_basename_default)
     status = Column(String, default="pending", index=True)  # pending | processing | completed | failed | no_audio
     summary = Column(Text)
     transcript = Column(Text)
+    # JSON list of {"seconds", "title"}; older rows embed it in transcript after [JUMP_POINTS]
+    jump_points_json = Column(Text)
     model_used = Column(String, default="whisper-base+llama3.2:7b")
     audio_duration_seconds = Column(Float)
     processing_time_seconds = Column(Float)
@@ -54,25 +99,52 @@ class VideoSummary(Base):
     generated_at = Column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (
-        UniqueConstraint('video_path', name='uq_video_summaries_video_path'),
+        UniqueConstraint('video_path_hash', name='uq_video_summaries_path_hash'),
         Index('ix_video_summaries_status_generated', 'status', 'generated_at'),
+        # Unfiltered summary listing: ORDER BY generated_at DESC LIMIT n
+        Index('ix_video_summaries_generated_at', 'generated_at'),
+        # Covers the statistics GROUP BY status with processing time sums
+        Index('ix_video_summaries_status_time', 'status', 'processing_time_seconds'),
     )
 
 class VideoSummaryVersion(Base):
     __tablename__ = "video_summary_versions"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    video_path = Column(Text, nullable=False, index=True)
+    video_path = Column(Text, nullable=False)
+    video_path_hash = Column(String(32), nullable=False, default=_video_path_hash_default)
+    video_basename = Column(Text, index=True, default=_video_basename_default)
     version = Column(Integer, nullable=False)
     summary = Column(Text)
     transcript = Column(Text)
+    jump_points_json = Column(Text)
     model_used = Column(String)
     processing_time_seconds = Column(Float)
     generated_at = Column(DateTime, default=datetime.utcnow)
+    # "v3 • 01/02/25 • 1.5m", stored at write time; NULL for backfilled rows
+    display_label = Column(String(64))
+
+    __table_args__ = (
+        UniqueConstraint('video_path_hash', 'version', name='uq_video_summary_versions_hash_ver'),
+        Index('ix_video_summary_versions_hash_time', 'video_path_hash', 'generated_at'),
+    )
+
+class LibraryDirectory(Base):
+    """One directory of a video library, as last listed by app.library_index"""
+    __tablename__ = "library_dirs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # Library root, and the directory's path relative to it ("" for the root itself)
+    root = Column(Text, nullable=False)
+    rel_path = Column(Text, nullable=False)
+    # Directory mtime when it was listed; a different mtime means list it again
+    mtime_ns = Column(BigInteger, nullable=False)
+    # JSON: child directory names, and the library items for the videos directly in it
+    subdirs_json = Column(Text, nullable=False)
+    items_json = Column(Text, nullable=False)
 
     __table_args__ = (
-        UniqueConstraint('video_path', 'version', name='uq_video_summary_versions_path_ver'),
-        Index('ix_video_summary_versions_path_time', 'video_path', 'generated_at'),
+        UniqueConstraint('root', 'rel_path', name='uq_library_dirs_root_path'),
     )
 
 def create_tables():
@@ -92,12 +164,69 @@ def create_tables():
         Base.metadata.create_all(bind=engine)
         # Lightweight SQLite migration: ensure new columns exist
         try:
-            with engine.connect() as conn:
+            with engine.begin() as conn:
                 # Add processing_time_seconds to video_summary_versions if missing
                 res = conn.execute(text("PRAGMA table_info('video_summary_versions')")).fetchall()
                 cols = {row[1] for row in res}
                 if 'processing_time_seconds' not in cols:
                     conn.execute(text("ALTER TABLE video_summary_versions ADD COLUMN processing_time_seconds FLOAT"))
+                # Existing rows keep a NULL display_label; readers format it on the fly
+                if 'display_label' not in cols:
+                    conn.execute(text("ALTER TABLE video_summary_versions ADD COLUMN display_label VARCHAR(64)"))
+                # Add jump_points_json to both summary tables if missing
+                for table in ('video_summaries', 'video_summary_versions'):
+                    res = conn.execute(text(f"PRAGMA table_info('{table}')")).fetchall()
+                    if 'jump_points_json' not in {row[1] for row in res}:
+                        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN jump_points_json TEXT"))
+                # Indexes added after the table was first created
+                conn.execute(text("CREATE INDEX IF NOT EXISTS ix_video_summaries_generated_at ON video_summaries (generated_at)"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS ix_video_summaries_status_time ON video_summaries (status, processing_time_seconds)"))
+                # Add and backfill the indexed video_basename lookup column
+                for table in ('video_summaries', 'video_summary_versions'):
+                    res = conn.execute(text(f"PRAGMA table_info('{table}')")).fetchall()
+                    if 'video_basename' in {row[1] for row in res}:
+                        # Columns backfilled before basenames were lowercased
+                        conn.execute(text(
+                            f"UPDATE {table} SET video_basename = lower(video_basename) "
+                            f"WHERE video_basename <> lower(video_basename)"
+                        ))
+                        continue
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN video_basename TEXT"))
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_video_basename ON {table} (video_basename)"))
+                    rows = conn.execute(text(f"SELECT id, video_path FROM {table}")).fetchall()
+                    if rows:
+                        conn.execute(
+                            text(f"UPDATE {table} SET video_basename = :name WHERE id = :id"),
+                            [{'id': row_id, 'name': video_basename(path)} for row_id, path in rows]
+                        )
+                # Add and backfill video_path_hash, index it in place of the long
+                # video_path strings and drop the old path indexes. The original
+                # UNIQUE(video_path...) constraints stay, since SQLite can only drop
+                # them by rebuilding the table.
+                hash_indexes = {
+                    'video_summaries': [
+                        "CREATE UNIQUE INDEX uq_video_summaries_path_hash ON video_summaries (video_path_hash)",
+                    ],
+                    'video_summary_versions': [
+                        "CREATE UNIQUE INDEX uq_video_summary_versions_hash_ver ON video_summary_versions (video_path_hash, version)",
+                        "CREATE INDEX ix_video_summary_versions_hash_time ON video_summary_versions (video_path_hash, generated_at)",
+                        "DROP INDEX IF EXISTS ix_video_summary_versions_path_time",
+                    ],
+                }
+                for table, statements in hash_indexes.items():
+                    res = conn.execute(text(f"PRAGMA table_info('{table}')")).fetchall()
+                    if 'video_path_hash' in {row[1] for row in res}:
+                        continue
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN video_path_hash VARCHAR(32)"))
+                    rows = conn.execute(text(f"SELECT id, video_path FROM {table}")).fetchall()
+                    if rows:
+                        conn.execute(
+                            text(f"UPDATE {table} SET video_path_hash = :key WHERE id = :id"),
+                            [{'id': row_id, 'key': video_path_hash(path)} for row_id, path in rows]
+                        )
+                    conn.execute(text(f"DROP INDEX IF EXISTS ix_{table}_video_path"))
+                    for statement in statements:
+                        conn.execute(text(statement))
         except Exception as e:
             print(f"⚠️ Migration check failed (non-fatal): {e}")
         print(f"Database tables created at: {db_path}")
@@ -125,16 +254,19 @@ def get_db():
     finally:
         db.close()
 
+# Docker can assign various private IP ranges: 172.x.x.x, 192.168.x.x, 10.x.x.x
+_DOCKER_PREFIXES = ('172.', '192.168.', '10.')
+
+# Pure function of its inputs and called on every request with a handful of
+# distinct IP/User-Agent pairs, so repeat visitors skip the hashing entirely
+@functools.lru_cache(maxsize=4096)
 def generate_user_id(ip_address: str, user_agent: str) -> str:
     """Generate a consistent user ID based on IP and User-Agent"""
     # Normalize ALL Docker container IPs to prevent new user IDs on each deployment
     normalized_ip = ip_address
     
     # Check if this looks like a Docker container IP (single client connecting to container)
-    # Docker can assign various private IP ranges: 172.x.x.x, 192.168.x.x, 10.x.x.x
-    if (ip_address.startswith('172.') or 
-        ip_address.startswith('192.168.') or 
-        ip_address.startswith('10.')) and len(ip_address.split('.')) == 4:
+    if ip_address.startswith(_DOCKER_PREFIXES) and ip_address.count('.') == 3:
         
         # Check if it's a Docker gateway IP (usually ends in .1)
         if ip_address.endswith('.1'):
@@ -152,19 +284,93 @@ def get_or_create_user(db, ip_address: str, user_agent: str) -> User:
     """Get existing user or create new one"""
     user_id = generate_user_id(ip_address, user_agent)
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # Primary-key get: answered from the identity map when already loaded,
+    # otherwise one cached SELECT without building a Query
+    user = db.get(User, user_id)
     if not user:
-        user = User(
-            id=user_id,
-            ip_address=ip_address,
-            user_agent=user_agent
+        if db.get_bind().dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        now = datetime.utcnow()
+        # Core INSERT ... ON CONFLICT DO NOTHING: two first requests from the same
+        # client racing here both succeed instead of one hitting an IntegrityError
+        db.execute(
+            insert(User).values(
+                id=user_id,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                created_at=now,
+                last_seen=now
+            ).on_conflict_do_nothing(index_elements=['id'])
         )
-        db.add(user)
         db.commit()
-        db.refresh(user)
+        user = db.get(User, user_id)
     else:
-        # Update last seen
-        user.last_seen = datetime.utcnow()
-        db.commit()
+        # Update last seen. The write is buffered and flushed in batches by
+        # the last-seen flusher rather than committed on every request; the
+        # loaded object is updated without marking the session dirty.
+        now = datetime.utcnow()
+        with _last_seen_lock:
+            _last_seen_buffer[user_id] = now
+        set_committed_value(user, 'last_seen', now)
     
     return user
+
+# user_id -> latest request time, waiting to be written by flush_last_seen()
+_last_seen_buffer: Dict[str, datetime] = {}
+_last_seen_lock = threading.Lock()
+LAST_SEEN_FLUSH_SECONDS = float(os.environ.get("LAST_SEEN_FLUSH_SECONDS", "30"))
+_last_seen_stop = threading.Event()
+_last_seen_thread: Optional[threading.Thread] = None
+
+def flush_last_seen(bind=None) -> int:
+    """Write buffered last_seen times in one executemany UPDATE
+    
+    Args:
+        bind: Engine to write through (defaults to the app engine)
+        
+    Returns:
+        Number of users updated
+    """
+    global _last_seen_buffer
+    with _last_seen_lock:
+        if not _last_seen_buffer:
+            return 0
+        pending, _last_seen_buffer = _last_seen_buffer, {}
+    try:
+        with (bind or engine).begin() as conn:
+            conn.execute(
+                text("UPDATE users SET last_seen = :ts WHERE id = :id"),
+                [{'id': user_id, 'ts': ts} for user_id, ts in pending.items()]
+            )
+    except Exception as e:
+        print(f"⚠️ Failed to flush last_seen updates: {e}")
+        # Put them back for the next attempt, keeping any newer times
+        with _last_seen_lock:
+            for user_id, ts in pending.items():
+                _last_seen_buffer.setdefault(user_id, ts)
+        return 0
+    return len(pending)
+
+def _last_seen_flusher():
+    while not _last_seen_stop.wait(LAST_SEEN_FLUSH_SECONDS):
+        flush_last_seen()
+
+def start_last_seen_flusher():
+    """Start the background thread that periodically flushes last_seen updates"""
+    global _last_seen_thread
+    if _last_seen_thread and _last_seen_thread.is_alive():
+        return
+    _last_seen_stop.clear()
+    _last_seen_thread = threading.Thread(target=_last_seen_flusher, name="last-seen-flush", daemon=True)
+    _last_seen_thread.start()
+
+def stop_last_seen_flusher():
+    """Stop the flusher thread and write out whatever is still buffered"""
+    global _last_seen_thread
+    _last_seen_stop.set()
+    if _last_seen_thread:
+        _last_seen_thread.join(timeout=5)
+        _last_seen_thread = None
+    flush_last_seen()
@@ -0,0 +1,215 @@
+"""
+Library Index
+
+Per-directory index of the video library, persisted in the app database so a
+restart does not have to re-read every directory. A refresh stats each known
+directory and only re-lists the ones whose mtime changed.
+"""
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Only include HTML and PDF files that are clearly resources
+RESOURCE_EXTENSIONS = frozenset(('.html', '.htm', '.pdf'))
+# Exclude files that are clearly not resources
+RESOURCE_EXCLUDE_PATTERNS = ('transcript', 'subtitle', 'caption', 'vtt', 'srt')
+# All exclude patterns in one pass over the (lowercased) file name
+_RESOURCE_EXCLUDE_RE = re.compile("|".join(map(re.escape, RESOURCE_EXCLUDE_PATTERNS)))
+# Subtitle suffixes looked up next to each video, in output order
+SUBTITLE_EXTENSIONS = (".vtt", ".srt", ".VTT", ".SRT")
+# Directories stat'ed/listed at once during a refresh; on a network mount each call
+# mostly waits on a round trip (with the GIL released), so overlapping them pays off
+SCAN_WORKERS = int(os.environ.get("LIBRARY_SCAN_WORKERS", "8"))
+
+
+class _IndexedDir(NamedTuple):
+    mtime_ns: int
+    subdirs: List[str]
+    items: List[dict]
+
+
+def scan_directory(base_dir: Path, directory: Path) -> Tuple[List[str], List[dict]]:
+    """
+    List one directory of the library in a single scandir pass
+
+    Entries are classified once by name; subtitles are matched against that
+    listing instead of probing each candidate path, and resource sizes come from
+    DirEntry.stat().
+
+    Returns:
+        (names of its subdirectories, library items for the videos directly in it)
+    """
+    with os.scandir(directory) as it:
+        entries = list(it)
+    names = {entry.name for entry in entries}
+    rel_dir = directory.relative_to(base_dir)
+
+    # Symlinked directories are not followed, as with Path.rglob
+    subdirs = sorted(entry.name for entry in entries if entry.is_dir(follow_symlinks=False))
+    video_names = sorted(entry.name for entry in entries if entry.name.endswith((".mp4", ".MP4")))
+    if not video_names:
+        return subdirs, []
+
+    # Resources are per directory, shared by every video in it
+    resources = []
+    try:
+        for entry in entries:
+            file_ext = os.path.splitext(entry.name)[1].lower()
+            if file_ext not in RESOURCE_EXTENSIONS or not entry.is_file():
+                continue
+            if not _RESOURCE_EXCLUDE_RE.search(entry.name.lower()):
+                resources.append({
+                    "name": entry.name,
+                    "path": str(rel_dir / entry.name),
+                    "type": file_ext,
+                    "size": entry.stat().st_size
+                })
+    except OSError as e:
+        print(f"Error scanning resources in {directory}: {e}")
+        resources = []
+
+    # Full directory path and its components for the hierarchy
+    dir_parts = rel_dir.parts
+    dir_path = "/".join(dir_parts)
+    items = []
+    for name in video_names:
+        stem = name[:-4]
+        items.append({
+            "class": dir_parts[0] if dir_parts else name,  # Keep for backward compatibility
+            "title": stem,
+            "path": str(rel_dir / name),
+            "dir_path": dir_path,
+            "path_components": dir_parts,
+            "subtitles": [str(rel_dir / (stem + ext)) for ext in SUBTITLE_EXTENSIONS if stem + ext in names],
+            "resources": resources,
+        })
+    return subdirs, items
+
+
+class LibraryIndex:
+    """Incrementally refreshed index of the videos under one library root"""
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = base_dir
+        self._root = str(base_dir)
+        # relative dir path ("" for the root) -> indexed listing; loaded from the DB on first use
+        self._dirs: Optional[Dict[str, _IndexedDir]] = None
+        self._lock = threading.Lock()
+        # Bumped whenever a refresh finds a directory added, removed or re-listed
+        self.generation = 0
+
+    def refresh(self) -> List[dict]:
+        """
+        Bring the index up to date and return every library item, sorted by path
+
+        Each known directory costs one stat; only new directories and those whose
+        mtime changed (entries added, removed or renamed) are listed again. The
+        tree is walked a level at a time with up to SCAN_WORKERS directories in
+        flight.
+        """
+        with self._lock:
+            if self._dirs is None:
+                self._dirs = self._load()
+            old = self._dirs
+            new: Dict[str, _IndexedDir] = {}
+            changed: List[str] = []
+            level = [""]
+            with ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="libscan") as pool:
+                while level:
+                    next_level = []
+                    for rel, entry, listed in pool.map(lambda rel: self._visit(rel, old.get(rel)), level):
+                        if entry is None:
+                            continue
+                        new[rel] = entry
+                        if listed:
+                            changed.append(rel)
+                        next_level.extend(f"{rel}/{name}" if rel else name for name in entry.subdirs)
+                    level = next_level
+
+            removed = [rel for rel in old if rel not in new]
+            self._dirs = new
+            if changed or removed:
+                self.generation += 1
+                self._save(new, [rel for rel in changed if rel in old] + removed, changed)
+            items = [item for entry in new.values() for item in entry.items]
+
+        items.sort(key=lambda item: Path(item["path"]).parts)
+        return items
+
+    def _visit(self, rel: str, entry: Optional[_IndexedDir]) -> Tuple[str, Optional[_IndexedDir], bool]:
+        """Stat one directory and list it again if its mtime moved: (rel, entry or None, listed)"""
+        directory = self.base_dir / rel if rel else self.base_dir
+        try:
+            # stat before listing: a change made mid-scan leaves an older
+            # mtime behind and is picked up by the next refresh
+            mtime_ns = directory.stat().st_mtime_ns
+            if entry is not None and entry.mtime_ns == mtime_ns:
+                return rel, entry, False
+            return rel, _IndexedDir(mtime_ns, *scan_directory(self.base_dir, directory)), True
+        except OSError as e:
+            print(f"Error scanning library directory {directory}: {e}")
+            return rel, None, False
+
+    def _load(self) -> Dict[str, _IndexedDir]:
+        """Read this root's persisted directory listings (empty if unavailable)"""
+        try:
+            from .database import SessionLocal, LibraryDirectory
+            with SessionLocal() as db:
+                rows = db.query(
+                    LibraryDirectory.rel_path,
+                    LibraryDirectory.mtime_ns,
+                    LibraryDirectory.subdirs_json,
+                    LibraryDirectory.items_json
+                ).filter(LibraryDirectory.root == self._root).all()
+            return {
+                rel: _IndexedDir(mtime_ns, json.loads(subdirs_json), json.loads(items_json))
+                for rel, mtime_ns, subdirs_json, items_json in rows
+            }
+        except Exception as e:
+            print(f"⚠️ Could not load library index, rescanning: {e}")
+            return {}
+
+    def _save(self, dirs: Dict[str, _IndexedDir], stale: List[str], changed: List[str]) -> None:
+        """Replace the stale rows and write the changed directories in one transaction"""
+        try:
+            from sqlalchemy import insert
+            from .database import SessionLocal, LibraryDirectory
+            with SessionLocal() as db:
+                # Chunked to stay well under SQLite's bound-parameter limit
+                for i in range(0, len(stale), 500):
+                    db.query(LibraryDirectory).filter(
+                        LibraryDirectory.root == self._root,
+                        LibraryDirectory.rel_path.in_(stale[i:i + 500])
+                    ).delete(synchronize_session=False)
+                if changed:
+                    db.execute(insert(LibraryDirectory), [
+                        {
+                            'root': self._root,
+                            'rel_path': rel,
+                            'mtime_ns': dirs[rel].mtime_ns,
+                            'subdirs_json': json.dumps(dirs[rel].subdirs),
+                            'items_json': json.dumps(dirs[rel].items),
+                        }
+                        for rel in changed
+                    ])
+                db.commit()
+        except Exception as e:
+            print(f"⚠️ Could not save library index: {e}")
+
+
+_indexes: Dict[str, LibraryIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_library_index(base_dir: Path) -> LibraryIndex:
+    """Get the process-wide index for a library root"""
+    key = str(base_dir)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = LibraryIndex(base_dir)
+        return index
@@ -1,19 +1,34 @@
 import os
+import re
+import functools
+import stat
+import time
 import mimetypes
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
 from fastapi import FastAPI, HTTPException, Query, Request, Depends
-from fastapi.responses import StreamingResponse, FileResponse, HTMLResponse
+from fastapi.responses import StreamingResponse, FileResponse, HTMLResponse, JSONResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from .database import create_tables, get_db, get_or_create_user, User, UserPreference
+try:
+	import orjson
+except ImportError:  # orjson is optional; the library listing falls back to stdlib json
+	orjson = None
+
+from .database import (create_tables, get_db, get_or_create_user, User, UserPreference,
+                       start_last_seen_flusher, stop_last_seen_flusher)
+from .library_index import RESOURCE_EXTENSIONS, get_library_index
 from .sync_system import (SyncGroup, DeviceSync, create_sync_group, join_sync_group, 
                          get_sync_group_users, get_device_info)
 
+# Library items are plain dicts of str/int/list, so they can skip jsonable_encoder
+_LibraryJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
 BASE_DIR_ENV = "VIDEO_BASE_DIR"
 VIDEOS_ROOT = os.environ.get(BASE_DIR_ENV) or "/Volumes/docker/generic-video-site/data"
 
@@ -29,6 +44,12 @@ async def startup_event():
         print(f"❌ Database initialization failed: {e}")
         print("⚠️ The app will continue running but preferences won't persist across devices")
         # Don't fail startup - app can still work with localStorage only
+    start_last_seen_flusher()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Write out any buffered last_seen updates before exiting
+    stop_last_seen_flusher()
 
 # Pydantic models for API
 class PreferenceRequest(BaseModel):
@@ -71,59 +92,47 @@ def get_db_dep():
 		raise HTTPException(status_code=503, detail="Database temporarily unavailable")
 
 
+# walk_videos results per library root:
+# (root mtime_ns, monotonic time cached, items, etag, lowercased (title, class) per item).
+# The root's mtime only changes for top-level entries, so the TTL bounds how long
+# changes deeper in the tree can go unnoticed; /api/refresh clears it outright.
+_LIB_CACHE: Dict[str, tuple] = {}
+LIBRARY_CACHE_TTL = float(os.environ.get("LIBRARY_CACHE_TTL", "30"))
+# Distinguishes index generations across restarts in the library ETag
+_BOOT_ID = time.time_ns()
+
+
+def _library_snapshot(base_dir: Path) -> tuple:
+	"""(items, etag or None, search keys) for base_dir, served from _LIB_CACHE while it is fresh"""
+	try:
+		st = base_dir.stat()
+	except OSError:
+		return [], None, []
+	key = str(base_dir)
+	now = time.monotonic()
+	hit = _LIB_CACHE.get(key)
+	if hit and hit[0] == st.st_mtime_ns and now - hit[1] < LIBRARY_CACHE_TTL:
+		return hit[2:]
+	if base_dir.is_dir():
+		index = get_library_index(base_dir)
+		items = index.refresh()
+		etag = f'W/"{_BOOT_ID:x}-{index.generation:x}"'
+	else:
+		items, etag = [], None
+	# Lowercased once per scan rather than on every search request
+	search = [(item["title"].lower(), item["class"].lower()) for item in items]
+	_LIB_CACHE[key] = (st.st_mtime_ns, now, items, etag, search)
+	return items, etag, search
+
+
 def walk_videos(base_dir: Path) -> List[dict]:
-	if not base_dir.exists() or not base_dir.is_dir():
-		return []
-	items: List[dict] = []
-	# Recursively find videos at any depth; preserve full directory structure
-	candidates: List[Path] = sorted(list(base_dir.rglob("*.mp4")) + list(base_dir.rglob("*.MP4")))
-	for video_path in candidates:
-		rel_path = video_path.relative_to(base_dir)
-		parts = rel_path.parts
-		# Full directory path (excluding filename)
-		dir_path = "/".join(parts[:-1]) if len(parts) > 1 else ""
-		# Individual path components for hierarchy
-		path_components = parts[:-1] if len(parts) > 1 else []
-		title = video_path.stem
-		subtitles = []
-		for ext in (".vtt", ".srt", ".VTT", ".SRT"):
-			cand = video_path.with_suffix(ext)
-			if cand.exists():
-				subtitles.append(str(cand.relative_to(base_dir)))
-		
-		# Find resources in the same directory
-		resources = []
-		video_dir = video_path.parent
-		try:
-			for resource_file in video_dir.iterdir():
-				if resource_file.is_file():
-					file_ext = resource_file.suffix.lower()
-					file_name = resource_file.name.lower()
-					
-					# Only include HTML and PDF files that are clearly resources
-					if file_ext in ['.html', '.htm', '.pdf']:
-						# Exclude files that are clearly not resources
-						exclude_patterns = ['transcript', 'subtitle', 'caption', 'vtt', 'srt']
-						if not any(pattern in file_name for pattern in exclude_patterns):
-							resources.append({
-								"name": resource_file.name,
-								"path": str(resource_file.relative_to(base_dir)),
-								"type": file_ext,
-								"size": resource_file.stat().st_size
-							})
-		except Exception as e:
-			print(f"Error scanning resources in {video_dir}: {e}")
-		
-		items.append({
-			"class": parts[0] if parts else "Unknown",  # Keep for backward compatibility
-			"title": title,
-			"path": str(rel_path),
-			"dir_path": dir_path,
-			"path_components": path_components,
-			"subtitles": subtitles,
-			"resources": resources,
-		})
-	return items
+	"""Library items under base_dir, served from _LIB_CACHE while it is fresh.
+
+	A miss refreshes the persisted library index, which re-lists only directories
+	whose mtime changed. The returned list is shared between callers; copy it
+	before sorting or filtering in place.
+	"""
+	return _library_snapshot(base_dir)[0]
 
 
 @app.get("/healthz")
@@ -131,40 +140,54 @@ def healthz():
 	return {"ok": True}
 
 
+@functools.lru_cache(maxsize=16384)
+def _title_sort_key(title: str) -> tuple:
+	"""Sort titles numerically by leading number, then alphabetically"""
+	# Whitespace-separated first word; titles without a leading number sort as 0.
+	# isdecimal() is exactly the set of digit strings int() accepts
+	first = title.split(maxsplit=1)[0] if title.strip() else ""
+	return (int(first) if first.isdecimal() else 0, title)
+
+
 @app.get("/api/library")
-async def api_library(q: Optional[str] = Query(default=None), sort: str = Query(default="class,title")):
+async def api_library(
+	request: Request,
+	q: Optional[str] = Query(default=None),
+	sort: str = Query(default="class,title"),
+):
 	base = Path(VIDEOS_ROOT)
-	items = walk_videos(base)
-
+	# Even a warm cache stats the root, and a miss can walk the whole tree
+	cached, etag, search = await run_in_threadpool(_library_snapshot, base)
+	headers = {}
+	if etag is not None:
+		# The body depends only on the index generation and the query string, which
+		# is part of the cache key, so a matching ETag means the client is current.
+		# no-cache: revalidate every time so a library refresh is seen immediately
+		headers = {"ETag": etag, "Cache-Control": "no-cache"}
+		if request.headers.get("if-none-match") == etag:
+			return Response(status_code=304, headers=headers)
 	if q:
 		q_lower = q.lower()
-		items = [i for i in items if q_lower in i["title"].lower() or q_lower in i["class"].lower()]
+		items = [i for i, (title, cls) in zip(cached, search) if q_lower in title or q_lower in cls]
+	else:
+		# Copy: the cached list is shared and sorted in place below
+		items = list(cached)
 
-	# simple multi-key sort: keys separated by comma, supports 'class' and 'title'
+	# simple multi-key sort: keys separated by comma, supports 'class' and 'title';
+	# one sort on the combined key orders the same as a stable sort per key
 	keys = [k.strip() for k in sort.split(",") if k.strip() in ("class", "title")]
-	for key in reversed(keys):
-		if key == "title":
-			# Sort titles numerically by leading number, then alphabetically
-			def sort_key(item):
-				title = item[key]
-				# Extract leading number for numerical sorting
-				match = title.split()[0] if title else "0"
-				try:
-					# Try to parse as number, fallback to 0
-					leading_num = int(match) if match.isdigit() else 0
-					return (leading_num, title)
-				except:
-					return (0, title)
-			items.sort(key=sort_key)
-		else:
-			items.sort(key=lambda x: x[key])
+	if keys:
+		items.sort(key=lambda x: tuple(
+			_title_sort_key(x["title"]) if key == "title" else x[key] for key in keys
+		))
 
-	return {"items": items}
+	return _LibraryJSONResponse({"items": items}, headers=headers)
 
 
 @app.get("/api/refresh")
 async def api_refresh():
-	# Stateless: front-end will just re-fetch library; endpoint exists for semantics
+	# Drop the cached library scan; the front-end re-fetches /api/library afterwards
+	_LIB_CACHE.clear()
 	return {"refreshed": True}
 
 
@@ -172,7 +195,7 @@ async def api_refresh():
 async def api_debug():
 	# Debug endpoint to check what resources are being found
 	base = Path(VIDEOS_ROOT)
-	items = walk_videos(base)
+	items = await run_in_threadpool(walk_videos, base)
 	
 	# Count resources
 	total_resources = 0
@@ -190,15 +213,32 @@ async def api_debug():
 	}
 
 
+# A single byte range; multi-range requests and other units are not served
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+def _range_not_satisfiable(file_size: int) -> HTTPException:
+	return HTTPException(
+		status_code=416, detail="Invalid Range header", headers={"Content-Range": f"bytes */{file_size}"}
+	)
+
+
 @app.get("/video/{path:path}")
 async def stream_video(path: str, request: Request):
 	file_path = Path(VIDEOS_ROOT) / path
-	if not file_path.exists() or not file_path.is_file():
+	# One stat, off the event loop: on a network mount it can block for a round trip
+	try:
+		st = await run_in_threadpool(os.stat, file_path)
+	except OSError:
+		st = None
+	if st is None or not stat.S_ISREG(st.st_mode):
 		raise HTTPException(status_code=404, detail="Video not found")
 
-	file_size = file_path.stat().st_size
+	file_size = st.st_size
 	range_header = request.headers.get("range")
 
+	# Plain generator on purpose: StreamingResponse iterates sync iterators in the
+	# threadpool, so the open/seek/read calls never run on the event loop
 	def iter_file(start: int, end: int):
 		with open(file_path, "rb") as f:
 			f.seek(start)
@@ -213,14 +253,19 @@ async def stream_video(path: str, request: Request):
 				yield data
 
 	if range_header:
-		try:
-			units, range_spec = range_header.split("=")
-			start_str, end_str = range_spec.split("-")
-			start = int(start_str) if start_str else 0
-			end = int(end_str) if end_str else file_size - 1
-			end = min(end, file_size - 1)
-		except Exception:
-			raise HTTPException(status_code=416, detail="Invalid Range header")
+		match = _RANGE_RE.match(range_header)
+		if match is None or match.group(1) == match.group(2) == "":
+			raise _range_not_satisfiable(file_size)
+		start_str, end_str = match.groups()
+		if start_str:
+			start = int(start_str)
+			end = min(int(end_str), file_size - 1) if end_str else file_size - 1
+		else:
+			# Suffix range ("bytes=-500"): the last N bytes
+			start = max(file_size - int(end_str), 0)
+			end = file_size - 1
+		if start > end:
+			raise _range_not_satisfiable(file_size)
 
 		headers = {
 			"Content-Range": f"bytes {start}-{end}/{file_size}",
@@ -230,12 +275,16 @@ async def stream_video(path: str, request: Request):
 		}
 		return StreamingResponse(iter_file(start, end), status_code=206, headers=headers)
 
-	headers = {
-		"Accept-Ranges": "bytes",
-		"Content-Length": str(file_size),
-		"Content-Type": "video/mp4",
-	}
-	return StreamingResponse(iter_file(0, file_size - 1), headers=headers)
+	# Whole file: FileResponse reuses our stat for Content-Length, Last-Modified and ETag
+	# and streams straight from the file with no generator in between
+	return _VideoFileResponse(
+		str(file_path), media_type="video/mp4", stat_result=st, headers={"Accept-Ranges": "bytes"}
+	)
+
+
+class _VideoFileResponse(FileResponse):
+	# Starlette reads 64 KiB per threadpool hop by default; match the range path's 1 MiB
+	chunk_size = 1024 * 1024
 
 
 @app.get("/subs/{path:path}")
@@ -255,9 +304,8 @@ async def serve_resources(path: str):
 	if not file_path.exists() or not file_path.is_file():
 		raise HTTPException(status_code=404, detail="Resource not found")
 	
-	# Security check - ensure file is in allowed extensions
-	allowed_extensions = ['.html', '.htm', '.pdf']
-	if file_path.suffix.lower() not in allowed_extensions:
+	# Security check - only the file types the library lists as resources
+	if file_path.suffix.lower() not in RESOURCE_EXTENSIONS:
 		raise HTTPException(status_code=403, detail="File type not allowed")
 	
 	mime, _ = mimetypes.guess_type(str(file_path))
@@ -577,12 +625,16 @@ async def leave_sync_group(request: Request, db: Session = Depends(get_db_dep))
 		print(f"Error leaving sync group: {e}")
 		raise HTTPException(status_code=500, detail="Failed to leave sync group")
 
+# Read once at import (already encoded): the page only changes with a deploy
+_index_file = static_dir / "index.html"
+_INDEX_HTML = _index_file.read_bytes() if _index_file.is_file() else None
+
+
 @app.get("/")
 async def index():
-	index_file = static_dir / "index.html"
-	if not index_file.exists():
+	if _INDEX_HTML is None:
 		return HTMLResponse("<h1>Generic Video Site</h1><p>Static assets missing.</p>")
-	return HTMLResponse(index_file.read_text(encoding="utf-8"))
+	return HTMLResponse(_INDEX_HTML)
 
 # ===================== AI SUMMARY API =====================
 from .ai_summary import coordinator as coord_mod
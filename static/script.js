@@ -32,7 +32,7 @@
 	let selectedCourse = null; // Track currently selected/filtered course
 	let currentModalPath = null; // Which video is open in modal
 	let activeSummary = { path: null, taskId: null }; // Track in-progress summary
-	let transcriptJPFallback = ''; // Fallback transcript containing [JUMP_POINTS] for current video
+	let jumpPointsFallback = []; // Latest summary's jump points, for versions stored without any
 	
 	// Debug: Check if elements are found
 	console.log('Course sidebar element:', courseSidebar);
@@ -788,7 +788,7 @@ async function setVideoRating(videoPath, rating){
 		summaryStatus.textContent = '';
 		summaryContent.innerHTML = '';
 		if (summaryVersionSelect) { summaryVersionSelect.style.display = 'none'; summaryVersionSelect.innerHTML = ''; }
-		transcriptJPFallback = '';
+		jumpPointsFallback = [];
 
 		// Wire modal play button
 		if (modalPlayBtn) {
@@ -862,10 +862,7 @@ async function setVideoRating(videoPath, rating){
                     const data = await existing.json();
                     if (data.found && data.status === 'completed' && data.summary) {
                         summarySection.classList.remove('hidden');
-						if (data.transcript && data.transcript.includes('[JUMP_POINTS]')) {
-							transcriptJPFallback = data.transcript;
-						}
-						renderSummary(data.summary, data.transcript || transcriptJPFallback || '');
+						renderSummary(data.summary, rememberJumpPoints(data));
                         summaryStatus.textContent = 'Summary ready';
 						if (summarizeBtn) summarizeBtn.textContent = '🔄 Re-summarize';
 						// If backend included versions, populate (may already be populated, idempotent)
@@ -982,10 +979,7 @@ async function setVideoRating(videoPath, rating){
 					if (gr.ok) {
 						const gd = await gr.json();
 						if (gd.found && gd.summary) {
-							if (gd.transcript && gd.transcript.includes('[JUMP_POINTS]')) {
-								transcriptJPFallback = gd.transcript;
-							}
-							renderSummary(gd.summary, gd.transcript || transcriptJPFallback || '');
+							renderSummary(gd.summary, rememberJumpPoints(gd));
 						}
 					}
 					// refresh versions list after new completion
@@ -1011,14 +1005,27 @@ async function setVideoRating(videoPath, rating){
 		}
 	}
 
-function renderSummary(raw, transcript){
-    // Parse optional jump points from transcript
-    const jp = transcript ? parseJumpPointsFromTranscript(transcript) : [];
-    const html = formatSummaryContent(raw, jp);
+function renderSummary(raw, jumpPoints){
+    const html = formatSummaryContent(raw, jumpPoints || []);
     summaryContent.innerHTML = html;
     attachJumpDelegation();
 }
 
+// Jump points of a summary payload: the jump_points array, or for rows saved
+// before it existed, the block embedded in the transcript
+function jumpPointsOf(data){
+    if (!data) return [];
+    if (Array.isArray(data.jump_points)) return normalizeJumpPoints(data.jump_points);
+    return parseJumpPointsFromTranscript(data.transcript);
+}
+
+// Like jumpPointsOf, but remembers them so versions without any can reuse them
+function rememberJumpPoints(data){
+    const jp = jumpPointsOf(data);
+    if (jp.length) jumpPointsFallback = jp;
+    return jp.length ? jp : jumpPointsFallback;
+}
+
 // Extract jump points appended as a JSON block after a [JUMP_POINTS] marker
 function parseJumpPointsFromTranscript(transcript){
     try {
@@ -1035,6 +1042,12 @@ function parseJumpPointsFromTranscript(transcript){
         let arr = [];
         try { arr = JSON.parse(jsonStr); } catch { return [];
         }
+        return normalizeJumpPoints(arr);
+    } catch { return []; }
+}
+
+function normalizeJumpPoints(arr){
+    try {
         if (!Array.isArray(arr)) return [];
         // Normalize to expected fields
         const norm = [];
@@ -1363,8 +1376,8 @@ function populateVersionSelector(videoPath, versions, autoLoad){
 						const data = await r.json();
 						summarySection.classList.remove('hidden');
 						if (data.summary && data.summary.trim()) {
-							const tx = (data.transcript && data.transcript.includes('[JUMP_POINTS]')) ? data.transcript : (transcriptJPFallback || '');
-							renderSummary(data.summary, tx);
+							const jp = jumpPointsOf(data);
+							renderSummary(data.summary, jp.length ? jp : jumpPointsFallback);
 							summaryStatus.textContent = `Showing v${ver}`;
 						} else {
 							// Fallback to completed summary
@@ -1372,10 +1385,7 @@ function populateVersionSelector(videoPath, versions, autoLoad){
 							if (g.ok) {
 								const gd = await g.json();
 								if (gd.found && gd.summary) {
-									if (gd.transcript && gd.transcript.includes('[JUMP_POINTS]')) {
-										transcriptJPFallback = gd.transcript;
-									}
-									renderSummary(gd.summary, gd.transcript || transcriptJPFallback || '');
+									renderSummary(gd.summary, rememberJumpPoints(gd));
 									summaryStatus.textContent = `Showing v${ver}`;
 									return;
 								}
@@ -1410,18 +1420,15 @@ function populateVersionSelector(videoPath, versions, autoLoad){
 							const data = await r.json();
 							summarySection.classList.remove('hidden');
 							if (data.summary && data.summary.trim()) {
-								const tx = (data.transcript && data.transcript.includes('[JUMP_POINTS]')) ? data.transcript : (transcriptJPFallback || '');
-								renderSummary(data.summary, tx);
+								const jp = jumpPointsOf(data);
+								renderSummary(data.summary, jp.length ? jp : jumpPointsFallback);
 								summaryStatus.textContent = `Showing v${sel}`;
 							} else {
 								const g = await fetch(`/api/summary/get?video_path=${encodeURIComponent(videoPath)}`);
 								if (g.ok) {
 									const gd = await g.json();
 									if (gd.found && gd.summary) {
-										if (gd.transcript && gd.transcript.includes('[JUMP_POINTS]')) {
-											transcriptJPFallback = gd.transcript;
-										}
-										renderSummary(gd.summary, gd.transcript || transcriptJPFallback || '');
+										renderSummary(gd.summary, rememberJumpPoints(gd));
 										summaryStatus.textContent = `Showing v${sel}`;
 									}
 								}
@@ -1,6 +1,7 @@
 """
 Fast unit tests for audio extraction service logic (mocked operations)
 """
+import io
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -146,3 +147,232 @@ class TestAudioExtractionLogic:
         """Test cleanup function (mocked - always succeeds)"""
         # Mock cleanup should not raise exceptions
         audio_service.cleanup_temp_files(["/fake/path1.wav", "/fake/path2.wav"])
+
+
+class TestFfmpegErrorParsing:
+    """Tests for mapping real ffmpeg stderr to user-facing messages"""
+
+    @pytest.mark.parametrize("stderr,expected", [
+        ("x.mp4: No such file or directory", "not found"),
+        ("Stream map '0:a:0' matches no streams.", "No audio track"),
+        ("x.mp4: Invalid data found when processing input", "corrupted"),
+        ("x.mp4: Permission denied", "Permission denied"),
+        ("Decoder (codec foo) not found for input stream", "not supported"),
+        ("line one\nConversion failed!\n", "Conversion failed!"),
+        ("", "Unknown ffmpeg error"),
+    ])
+    def test_parse_ffmpeg_error(self, stderr, expected):
+        from app.ai_summary.audio_extraction import AudioExtractionService
+
+        assert expected in AudioExtractionService()._parse_ffmpeg_error(stderr)
+
+
+def _probed(codec, rate, channels):
+    return {'success': True, 'has_audio': True, 'duration': 10.0,
+            'audio_codec': codec, 'audio_sample_rate': rate, 'audio_channels': channels}
+
+
+class TestAudioCodecArgs:
+    """Tests for skipping conversions the probed source doesn't need"""
+
+    @pytest.mark.parametrize("video_info,expected", [
+        (_probed('pcm_s16le', 16000, 1), ['-c:a', 'copy']),
+        (_probed('pcm_s16le', 16000, 2), ['-acodec', 'pcm_s16le', '-ac', '1']),
+        (_probed('aac', 16000, 1), ['-acodec', 'pcm_s16le']),
+        (_probed('aac', 48000, 2), ['-acodec', 'pcm_s16le', '-ar', '16000', '-ac', '1']),
+        ({'success': False}, ['-acodec', 'pcm_s16le', '-ar', '16000', '-ac', '1']),
+    ])
+    def test_codec_args(self, video_info, expected):
+        from app.ai_summary.audio_extraction import AudioExtractionService
+
+        assert AudioExtractionService()._get_audio_codec_args(video_info) == expected
+
+    def test_segment_extraction_uses_codec_args(self, tmp_path):
+        """The segment command carries the probed args instead of a fixed conversion"""
+        from app.ai_summary.audio_extraction import AudioExtractionService
+
+        def fake_popen(cmd, **kwargs):
+            proc = MagicMock(returncode=0)
+            proc.poll.return_value = 0
+            proc.stdout = io.StringIO("a_00000.wav,0.000000,10.000000\n")
+            proc.stderr = io.StringIO("")
+            return proc
+
+        service = AudioExtractionService()
+        with patch("app.ai_summary.audio_extraction.subprocess.Popen", side_effect=fake_popen) as popen:
+            segments = list(service.extract_audio_segments(
+                "/videos/a.mp4", str(tmp_path), video_info=_probed('pcm_s16le', 16000, 1)
+            ))
+
+        cmd = popen.call_args[0][0]
+        assert cmd[cmd.index('-vn') + 1:cmd.index('-f')] == ['-c:a', 'copy']
+        assert segments == [(0.0, 10.0, str(tmp_path / "a_00000.wav"))]
+
+
+class TestFfmpegPrefix:
+    """Tests for the thread cap and priority wrappers on ffmpeg commands"""
+
+    @pytest.mark.parametrize("threads,expected", [(None, ['-threads', '3']), (1, ['-threads', '1']), (0, [])])
+    def test_thread_cap(self, threads, expected):
+        """The service cap applies by default; 0 lifts it for one call"""
+        from app.ai_summary.audio_extraction import AudioExtractionService
+
+        service = AudioExtractionService()
+        service.threads = 3
+        assert service._ffmpeg_prefix(threads=threads, nice=False) == ['ffmpeg'] + expected
+
+
+class TestProbeCache:
+    """Tests for ffprobe results cached per (path, mtime, size)"""
+
+    def test_unchanged_file_is_probed_once(self, tmp_path):
+        """Repeat lookups reuse the probe until the file changes; failures are retried"""
+        import json
+        import subprocess
+        from app.ai_summary import audio_extraction
+        from app.ai_summary.audio_extraction import AudioExtractionService
+
+        video = tmp_path / "a.mp4"
+        video.write_bytes(b"video")
+        probe = json.dumps({
+            'format': {'duration': '12.5', 'size': '5'},
+            'streams': [{'codec_type': 'audio', 'codec_name': 'aac', 'sample_rate': '48000', 'channels': 2}],
+        }).encode()
+        outcomes = [subprocess.CompletedProcess([], 1, b'', b'busy'), subprocess.CompletedProcess([], 0, probe, b'')]
+
+        audio_extraction._probe_video.cache_clear()
+        service = AudioExtractionService()
+        with patch("app.ai_summary.audio_extraction.subprocess.run", side_effect=lambda *a, **k: outcomes.pop(0)) as run:
+            assert service.get_video_info(str(video))['success'] is False
+            info = service.get_video_info(str(video))
+            assert info['duration'] == 12.5 and info['audio_sample_rate'] == 48000
+            # Callers get their own copy of the cached dict
+            info['duration'] = 0
+            assert service.get_video_info(str(video), stat=video.stat())['duration'] == 12.5
+            assert run.call_count == 2
+
+            video.write_bytes(b"longer video")
+            outcomes.append(subprocess.CompletedProcess([], 0, probe, b''))
+            service.get_video_info(str(video))
+            assert run.call_count == 3
+        audio_extraction._probe_video.cache_clear()
+
+    @pytest.mark.parametrize("json_module", ["orjson", "json"])
+    def test_probe_output_parses_with_either_json_module(self, tmp_path, monkeypatch, json_module):
+        """ffprobe's bytes are parsed the same with orjson or the stdlib fallback"""
+        import json
+        import subprocess
+        from app.ai_summary import audio_extraction
+        from app.ai_summary.audio_extraction import AudioExtractionService
+
+        monkeypatch.setattr(audio_extraction, "_json", pytest.importorskip(json_module))
+        video = tmp_path / "a.mp4"
+        video.write_bytes(b"video")
+        probe = json.dumps({
+            'format': {'duration': '61.25', 'size': '5'},
+            'streams': [{'codec_type': 'video'}, {'codec_type': 'audio', 'codec_name': 'pcm_s16le',
+                                                  'sample_rate': '16000', 'channels': 1}],
+        }, ensure_ascii=False).encode()
+
+        audio_extraction._probe_video.cache_clear()
+        with patch("app.ai_summary.audio_extraction.subprocess.run",
+                   return_value=subprocess.CompletedProcess([], 0, probe, b'')):
+            info = AudioExtractionService().get_video_info(str(video))
+        audio_extraction._probe_video.cache_clear()
+
+        assert info['success'] is True
+        assert (info['duration'], info['has_audio'], info['audio_codec'], info['audio_sample_rate'],
+                info['audio_channels']) == (61.25, True, 'pcm_s16le', 16000, 1)
+
+
+def _segment_popen(lines, returncode=0, stderr=""):
+    """Fake Popen for the segment muxer: reports the given "name,start,end" lines"""
+    def fake_popen(cmd, **kwargs):
+        proc = MagicMock(returncode=returncode)
+        proc.poll.return_value = returncode
+        proc.stdout = io.StringIO(''.join(line + '\n' for line in lines))
+        proc.stderr = io.StringIO(stderr)
+        return proc
+    return fake_popen
+
+
+def _write_wav(path, samples):
+    import wave
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(10)
+        wav.writeframes(b''.join(s.to_bytes(2, 'little', signed=True) for s in samples))
+
+
+class TestAudioSegments:
+    """Tests for streaming segment extraction"""
+
+    def test_overlap_prepends_previous_tail(self, tmp_path):
+        """Each segment after the first starts with the previous one's last overlap_seconds"""
+        import wave
+        from app.ai_summary.audio_extraction import AudioExtractionService
+
+        _write_wav(tmp_path / "a_00000.wav", range(0, 30))
+        _write_wav(tmp_path / "a_00001.wav", range(30, 60))
+        lines = ["a_00000.wav,0.000000,3.000000", "a_00001.wav,3.000000,6.000000"]
+        with patch("app.ai_summary.audio_extraction.subprocess.Popen", side_effect=_segment_popen(lines)):
+            segments = list(AudioExtractionService().extract_audio_segments(
+                "/videos/a.mp4", str(tmp_path), video_info=_probed('aac', 48000, 2), overlap_seconds=0.5
+            ))
+
+        assert [(start, end) for start, end, _ in segments] == [(0.0, 3.0), (2.5, 6.0)]
+        with wave.open(segments[1][2], 'rb') as wav:
+            frames = wav.readframes(wav.getnframes())
+        assert [int.from_bytes(frames[i:i + 2], 'little') for i in range(0, len(frames), 2)] == list(range(25, 60))
+
+    def test_ffmpeg_failure_raises(self, tmp_path):
+        from app.ai_summary.audio_extraction import AudioExtractionService
+
+        popen = _segment_popen([], returncode=1, stderr="x.mp4: Invalid data found when processing input\n")
+        with patch("app.ai_summary.audio_extraction.subprocess.Popen", side_effect=popen):
+            with pytest.raises(RuntimeError, match="corrupted"):
+                list(AudioExtractionService().extract_audio_segments(
+                    "/videos/a.mp4", str(tmp_path), video_info=_probed('aac', 48000, 2)
+                ))
+
+    def test_no_segments_is_an_error(self, tmp_path):
+        """A clean exit without any segment means there was no audio to extract"""
+        from app.ai_summary.audio_extraction import AudioExtractionService
+
+        with patch("app.ai_summary.audio_extraction.subprocess.Popen", side_effect=_segment_popen([])):
+            with pytest.raises(RuntimeError, match="no audio track"):
+                list(AudioExtractionService().extract_audio_segments(
+                    "/videos/a.mp4", str(tmp_path), video_info=_probed('aac', 48000, 2)
+                ))
+
+    def test_timeout_kills_ffmpeg(self, tmp_path):
+        import threading
+        from app.ai_summary.audio_extraction import AudioExtractionService
+
+        killed = threading.Event()
+
+        def fake_popen(cmd, **kwargs):
+            proc = MagicMock(returncode=None)
+
+            def kill():
+                proc.returncode = -9
+                killed.set()
+            proc.kill.side_effect = kill
+            proc.poll.side_effect = lambda: proc.returncode
+            # Like the real process, only exit once the kill has gone through
+            proc.wait.side_effect = lambda *a, **k: [
+                t.join() for t in threading.enumerate() if isinstance(t, threading.Timer)
+            ]
+            # ffmpeg hangs without reporting a segment until it is killed
+            proc.stdout = MagicMock()
+            proc.stdout.__iter__.side_effect = lambda: iter(() if killed.wait(5) else ())
+            proc.stderr = io.StringIO("")
+            return proc
+
+        with patch("app.ai_summary.audio_extraction.subprocess.Popen", side_effect=fake_popen):
+            with pytest.raises(RuntimeError, match="timeout after 0 seconds"):
+                list(AudioExtractionService().extract_audio_segments(
+                    "/videos/a.mp4", str(tmp_path), timeout=0, video_info=_probed('aac', 48000, 2)
+                ))
+        assert killed.is_set()
@@ -0,0 +1,380 @@
+"""
+Test VideoSummaryCoordinator's database paths against the in-memory DB
+"""
+import pytest
+
+from app.ai_summary.coordinator import VideoSummaryCoordinator
+from app.database import VideoSummary
+
+
+@pytest.fixture()
+def coordinator():
+    return VideoSummaryCoordinator()
+
+
+def _add_summary(db, video_path, **fields):
+    fields.setdefault('status', 'completed')
+    summary = VideoSummary(video_path=video_path, **fields)
+    db.add(summary)
+    db.commit()
+    return summary
+
+
+class TestDeleteVideoSummary:
+    """Test the single-statement delete"""
+
+    def test_delete_removes_only_the_matching_row(self, coordinator, test_db):
+        """The row for the path is deleted; other summaries are untouched"""
+        _add_summary(test_db, '/videos/a.mp4', summary='A')
+        _add_summary(test_db, '/videos/b.mp4', summary='B')
+
+        assert coordinator.delete_video_summary('/videos/a.mp4')['success'] is True
+        test_db.expire_all()
+        assert [s.video_path for s in test_db.query(VideoSummary)] == ['/videos/b.mp4']
+
+    def test_delete_missing_summary_reports_not_found(self, coordinator):
+        """Zero deleted rows is reported as 'Summary not found'"""
+        result = coordinator.delete_video_summary('/videos/missing.mp4')
+        assert result == {'success': False, 'error': 'Summary not found'}
+
+
+class TestBasenameLookup:
+    """Test the base-dir tolerant lookups on video_basename"""
+
+    def test_lookup_ignores_base_dir_and_case(self, coordinator, test_db):
+        """A summary stored under another root and another case is still found"""
+        _add_summary(test_db, '/Volumes/Media/Course/Intro.MP4', summary='Stored')
+
+        found = coordinator.get_video_summary('/app/data/Course/intro.mp4')
+        assert found is not None and found['summary'] == 'Stored'
+        assert [v['version'] for v in coordinator.list_versions_for_video('/app/data/INTRO.mp4')] == [1]
+        assert coordinator.get_video_summary_version('/x/intro.mp4', 1)['summary'] == 'Stored'
+        assert coordinator.get_video_summary('/app/data/Course/outro.mp4') is None
+
+    def test_create_tables_lowercases_existing_basenames(self, test_db):
+        """Rows backfilled before basenames were normalised are fixed on startup"""
+        from sqlalchemy import text
+        from app.database import create_tables
+
+        _add_summary(test_db, '/videos/Intro.MP4')
+        test_db.execute(text("UPDATE video_summaries SET video_basename = 'Intro.MP4'"))
+        test_db.commit()
+
+        create_tables()
+        assert test_db.execute(text("SELECT video_basename FROM video_summaries")).scalar() == 'intro.mp4'
+
+
+class _FakeAudio:
+    """Stands in for AudioExtractionService.extract_audio_segments"""
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.closed = False
+        self.overlap_seconds = None
+
+    def extract_audio_segments(self, video_path, output_dir, segment_seconds, video_info, overlap_seconds):
+        self.overlap_seconds = overlap_seconds
+        try:
+            yield from self.chunks
+            if self.error:
+                raise self.error
+        finally:
+            self.closed = True
+
+    def cleanup_temp_files(self, paths):
+        pass
+
+
+class _FakeTranscription:
+    """Returns canned per-chunk results, with segment times relative to the chunk"""
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    def transcribe_with_timestamps(self, audio_path):
+        self.calls.append(audio_path)
+        return self.results[audio_path]
+
+
+def _chunk_result(*segments, **extra):
+    result = {'success': True, 'language': 'en', 'segments': [
+        {'start': start, 'end': end, 'text': text} for start, end, text in segments
+    ]}
+    result['transcript'] = ''.join(seg['text'] for seg in result['segments']).strip()
+    result.update(extra)
+    return result
+
+
+def _run_pipeline(coordinator, audio, transcription):
+    coordinator._audio_service = audio
+    coordinator._transcription_service = transcription
+    coordinator.transcribe_workers = 0
+    return coordinator._transcribe_segments('/videos/a.mp4', '/tmp', {'duration': 120.0})
+
+
+class TestTranscribeSegments:
+    """Test the extract/transcribe pipeline with fake services"""
+
+    def test_overlapping_chunks_are_deduplicated(self, coordinator):
+        """Segments seen by both chunks are kept once, on their side of the overlap's midpoint"""
+        audio = _FakeAudio([(0.0, 60.0, 'c0'), (58.0, 120.0, 'c1')])
+        transcription = _FakeTranscription({
+            'c0': _chunk_result((0, 40, ' One.'), (40, 58.5, ' Two.'), (58.5, 60, ' Thr')),
+            'c1': _chunk_result((0, 0.5, ' Two.'), (0.5, 5, ' Three.'), (5, 62, ' Four.')),
+        })
+
+        result = _run_pipeline(coordinator, audio, transcription)
+
+        assert audio.overlap_seconds == coordinator.audio_overlap_seconds
+        assert result['success'] is True
+        assert result['transcript'] == 'One. Two. Three. Four.'
+        assert [(s['start'], s['end']) for s in result['segments']] == [(0, 40), (40, 58.5), (58.5, 63.0), (63.0, 120.0)]
+        assert result['audio_duration'] == 120.0
+        assert result['language'] == 'en'
+
+    def test_backend_without_segments_keeps_chunk_text(self, coordinator):
+        audio = _FakeAudio([(0.0, 60.0, 'c0'), (58.0, 90.0, 'c1')])
+        transcription = _FakeTranscription({
+            'c0': _chunk_result(transcript='first'),
+            'c1': _chunk_result(transcript='second'),
+        })
+
+        result = _run_pipeline(coordinator, audio, transcription)
+        assert result['transcript'] == 'first second'
+        assert result['segments'] == []
+
+    def test_extraction_error_is_reported_as_audio_stage(self, coordinator):
+        audio = _FakeAudio([(0.0, 60.0, 'c0')], error=RuntimeError('No audio track found in video file'))
+        transcription = _FakeTranscription({'c0': _chunk_result((0, 60, ' One.'))})
+
+        result = _run_pipeline(coordinator, audio, transcription)
+        assert result == {'success': False, 'stage': 'audio', 'error': 'No audio track found in video file'}
+
+    def test_transcription_error_stops_extraction(self, coordinator):
+        """A failed chunk ends the run and the producer stops pulling segments"""
+        audio = _FakeAudio([(i * 60.0, (i + 1) * 60.0, f'c{i}') for i in range(50)])
+        transcription = _FakeTranscription({'c0': {'success': False, 'error': 'model crashed'}})
+
+        result = _run_pipeline(coordinator, audio, transcription)
+        assert result == {'success': False, 'stage': 'transcription', 'error': 'model crashed'}
+        assert transcription.calls == ['c0']
+        assert audio.closed
+
+
+def _add_version(db, video_path, version, **fields):
+    from app.database import VideoSummaryVersion
+    db.add(VideoSummaryVersion(video_path=video_path, version=version, **fields))
+    db.commit()
+
+
+class TestSummaryVersionJoins:
+    """Test the summary/version join queries"""
+
+    def test_summary_carries_its_versions_newest_first(self, coordinator, test_db):
+        """Only the newest matching summary's versions are returned, with fallbacks filled in"""
+        from datetime import datetime
+        _add_summary(test_db, '/old/a.mp4', summary='Old', generated_at=datetime(2024, 1, 1))
+        _add_version(test_db, '/old/a.mp4', 1, summary='Old v1')
+        _add_summary(test_db, '/new/a.mp4', summary='New', model_used='whisper+llama',
+                     processing_time_seconds=90.0, generated_at=datetime(2025, 1, 1))
+        _add_version(test_db, '/new/a.mp4', 1, summary='v1', model_used='whisper+mistral',
+                     processing_time_seconds=30.0, generated_at=datetime(2025, 1, 1))
+        _add_version(test_db, '/new/a.mp4', 2, summary='v2', generated_at=datetime(2025, 1, 2))
+
+        found = coordinator.get_video_summary('/new/a.mp4')
+        assert found['summary'] == 'New'
+        assert [(v['version'], v['model_used'], v['processing_time_seconds']) for v in found['versions']] == [
+            (2, 'whisper+llama', 90.0),
+            (1, 'whisper+mistral', 30.0),
+        ]
+
+    def test_version_list_falls_back_to_summary_row(self, coordinator, test_db):
+        """Versions missing a model or time take them from the summary row (time: latest only)"""
+        _add_summary(test_db, '/videos/a.mp4', model_used='whisper+llama', processing_time_seconds=90.0)
+        _add_version(test_db, '/videos/a.mp4', 1)
+        _add_version(test_db, '/videos/a.mp4', 2)
+        _add_version(test_db, '/videos/a.mp4', 3, model_used='whisper+mistral', processing_time_seconds=30.0)
+        _add_version(test_db, '/videos/a.mp4', 4)
+
+        listed = coordinator.list_versions_for_video('/videos/a.mp4')
+        assert [(v['version'], v['model_used'], v['processing_time_seconds']) for v in listed] == [
+            (4, 'whisper+llama', 90.0),
+            (3, 'whisper+mistral', 30.0),
+            (2, 'whisper+llama', None),
+            (1, 'whisper+llama', None),
+        ]
+
+    def test_completed_summary_without_versions_gets_v1(self, coordinator, test_db):
+        from app.database import VideoSummaryVersion
+        _add_summary(test_db, '/videos/a.mp4', summary='Only', model_used='m')
+
+        found = coordinator.get_video_summary('/videos/a.mp4')
+        assert [v['version'] for v in found['versions']] == [1]
+        test_db.expire_all()
+        assert test_db.query(VideoSummaryVersion).one().summary == 'Only'
+
+    def test_versions_without_summary_row(self, coordinator, test_db):
+        """Versions whose summary row is gone are still listed, without fallbacks"""
+        _add_version(test_db, '/videos/a.mp4', 1, summary='v1')
+
+        listed = coordinator.list_versions_for_video('/videos/a.mp4')
+        assert [(v['version'], v['model_used'], v['processing_time_seconds']) for v in listed] == [(1, None, None)]
+        assert coordinator.get_video_summary('/videos/a.mp4') is None
+
+
+class TestStartVideoSummary:
+    """Test the INSERT ... ON CONFLICT upsert behind start_video_summary"""
+
+    @pytest.fixture()
+    def video(self, tmp_path):
+        path = tmp_path / "a.mp4"
+        path.write_bytes(b"video")
+        return str(path)
+
+    @pytest.fixture()
+    def queue(self, coordinator):
+        from unittest.mock import MagicMock
+        coordinator._task_queue = MagicMock()
+        coordinator._task_queue.add_task.return_value = 'task-1'
+        return coordinator._task_queue
+
+    def _row(self, db):
+        db.expire_all()
+        return db.query(VideoSummary).one()
+
+    def test_new_video_inserts_pending_row(self, coordinator, queue, video, test_db):
+        result = coordinator.start_video_summary(video, model_name='llama')
+        assert result['success'] is True and result['task_id'] == 'task-1'
+        row = self._row(test_db)
+        assert row.status == 'pending'
+        assert queue.add_task.call_args[0][1]['summary_id'] == row.id
+
+    @pytest.mark.parametrize("status,error", [
+        ('completed', 'Summary already exists for this video'),
+        ('pending', 'Summary generation already in progress for this video'),
+        ('processing', 'Summary generation already in progress for this video'),
+    ])
+    def test_existing_row_is_left_alone(self, coordinator, queue, video, test_db, status, error):
+        _add_summary(test_db, video, status=status, summary='Kept')
+
+        result = coordinator.start_video_summary(video)
+        assert result['success'] is False and result['error'] == error
+        assert self._row(test_db).status == status
+        queue.add_task.assert_not_called()
+
+    @pytest.mark.parametrize("status,force", [('failed', False), ('no_audio', False), ('completed', True)])
+    def test_row_is_reset_to_pending(self, coordinator, queue, video, test_db, status, force):
+        existing = _add_summary(test_db, video, status=status, error_message='boom')
+
+        assert coordinator.start_video_summary(video, force=force)['success'] is True
+        row = self._row(test_db)
+        assert (row.id, row.status, row.error_message) == (existing.id, 'pending', None)
+        assert queue.add_task.call_args[0][1]['summary_id'] == existing.id
+
+    def test_missing_file(self, coordinator, queue, tmp_path):
+        result = coordinator.start_video_summary(str(tmp_path / "missing.mp4"))
+        assert result['success'] is False and 'not found' in result['error']
+
+
+def _reference_jump_points(segments, max_points=8, pool=20):
+    """The original sort-based selection _heuristic_jump_points must reproduce"""
+    from app.ai_summary.coordinator import _JUMP_KW
+    candidates = []
+    for seg in segments:
+        text = (seg.get('text') or '').strip()
+        if text:
+            score = (2 if _JUMP_KW.search(text) else 0) + min(1.0, len(text) / 200.0)
+            candidates.append((score, int(max(0, round(float(seg.get('start', 0))))), text))
+    candidates.sort(key=lambda x: -x[0])
+    top = sorted(candidates[:pool], key=lambda x: x[1])
+    if len(top) > max_points:
+        top = top[::max(1, len(top) // max_points)][:max_points]
+    return [{'seconds': t, 'title': txt.split('. ')[0].strip()[:100] or 'Jump'} for _, t, txt in top]
+
+
+class TestHeuristicJumpPoints:
+    """Test the NumPy fallback jump-point picker"""
+
+    def test_keywords_win_and_titles_are_first_sentences(self):
+        from app.ai_summary.coordinator import _heuristic_jump_points
+        segments = [
+            {'start': 0.4, 'text': ' Hello'},
+            {'start': 10, 'text': ' Quick overview. Then more'},
+            {'start': 20, 'text': '   '},
+            {'start': 30, 'text': ' A demo of the tool'},
+        ]
+        assert _heuristic_jump_points(segments, max_points=2, pool=2) == [
+            {'seconds': 10, 'title': 'Quick overview'},
+            {'seconds': 30, 'title': 'A demo of the tool'},
+        ]
+        assert _heuristic_jump_points([]) == []
+        assert _heuristic_jump_points([{'start': 'soon', 'text': 'x'}, {'text': ''}]) == []
+
+    def test_matches_sort_based_selection(self):
+        """Ties on score and on start time resolve exactly as the sort-based version did"""
+        import random
+        from app.ai_summary.coordinator import _heuristic_jump_points
+        rng = random.Random(7)
+        words = ['intro', 'setup', 'tip', 'and', 'then', 'we', 'look', 'at', 'this']
+        for _ in range(200):
+            segments = [{
+                'start': rng.choice([rng.uniform(0, 600), float(rng.randrange(0, 600, 30))]),
+                'text': ' '.join(rng.choice(words) for _ in range(rng.choice([1, 1, 3, 40]))),
+            } for _ in range(rng.randrange(1, 80))]
+            assert _heuristic_jump_points(segments) == _reference_jump_points(segments)
+
+
+class TestDisplayLabel:
+    """Test the version label stored at write time"""
+
+    def test_label_format(self):
+        from datetime import datetime
+        from app.ai_summary.coordinator import _version_display_label
+        assert _version_display_label(3, datetime(2025, 1, 2), 90.0) == 'v3 • 01/02/25 • 1.5m'
+        assert _version_display_label(1, datetime(2025, 1, 2), None) == 'v1 • 01/02/25'
+
+    def test_completed_run_stores_label(self, coordinator, test_db):
+        """A finished summary writes its label; backfilled rows get one computed on read"""
+        from unittest.mock import MagicMock
+        from app.database import VideoSummaryVersion
+        _add_version(test_db, '/videos/a.mp4', 1, processing_time_seconds=60.0)
+        summary = _add_summary(test_db, '/videos/a.mp4', status='pending')
+        coordinator._transcribe_in_chunks = MagicMock(return_value={
+            'success': True, 'transcript': 'Hello', 'language': 'en', 'segments': [], 'audio_duration': 5.0
+        })
+        coordinator._summarization_service = MagicMock()
+        coordinator._summarization_service.summarize_transcript.return_value = {
+            'success': True, 'summary': 'Sum', 'model_used': 'llama'
+        }
+        coordinator._summarization_service.generate_jump_points.return_value = []
+
+        assert coordinator._process_video_summary('/videos/a.mp4', summary.id)['success'] is True
+
+        test_db.expire_all()
+        stored = test_db.query(VideoSummaryVersion).filter_by(version=2).one()
+        assert stored.display_label.startswith('v2 • ')
+        labels = [v['display_label'] for v in coordinator.list_versions_for_video('/videos/a.mp4')]
+        assert labels[0] == stored.display_label
+        assert labels[1].startswith('v1 • ') and labels[1].endswith(' • 1.0m')
+
+
+class TestJumpPointJson:
+    """Test jump-point (de)serialisation with and without orjson"""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_round_trip(self, monkeypatch, use_orjson):
+        import numpy as np
+        from app.ai_summary import coordinator as coordinator_module
+        monkeypatch.setattr(coordinator_module, "orjson",
+                            pytest.importorskip("orjson") if use_orjson else None)
+
+        points = [{'seconds': 5, 'title': 'Intro – café'}, {'seconds': np.float64(7.5), 'title': 'Demo'}]
+        stored = coordinator_module._dumps(points)
+        assert isinstance(stored, str)
+        assert coordinator_module._load_jump_points(stored) == [
+            {'seconds': 5, 'title': 'Intro – café'}, {'seconds': 7.5, 'title': 'Demo'}
+        ]
+        assert coordinator_module._load_jump_points(None) is None
+        assert coordinator_module._load_jump_points('[not json') is None
@@ -137,6 +137,19 @@ class TestDatabaseModels:
         user_count = test_db.query(User).count()
         assert user_count == 1
 
+    def test_last_seen_is_buffered_and_flushed(self, test_db):
+        """Repeat visits update last_seen in one batched write instead of a commit each"""
+        from app.database import flush_last_seen
+        
+        user = get_or_create_user(test_db, "192.168.1.205", "Buffered Browser")
+        stored = user.last_seen
+        user = get_or_create_user(test_db, "192.168.1.205", "Buffered Browser")
+        assert not test_db.dirty
+        
+        assert flush_last_seen(test_db.get_bind()) >= 1
+        test_db.expire_all()
+        assert test_db.query(User).filter(User.id == user.id).one().last_seen > stored
+
     def test_preference_update(self, test_db):
         """Test updating user preferences."""
         # Create user and preference
@@ -0,0 +1,47 @@
+"""
+Test the persisted, incrementally refreshed library index
+"""
+from pathlib import Path
+
+from app import library_index
+from app.library_index import LibraryIndex
+
+
+def _make_library(root: Path) -> None:
+    (root / "Course" / "Part 2").mkdir(parents=True)
+    (root / "Course" / "01 Intro.mp4").write_bytes(b"")
+    (root / "Course" / "01 Intro.srt").write_bytes(b"")
+    (root / "Course" / "slides.pdf").write_bytes(b"pdf")
+    (root / "Course" / "Part 2" / "02 Next.MP4").write_bytes(b"")
+
+
+class TestLibraryIndex:
+    """Test directory-level reuse of the library index"""
+
+    def test_refresh_lists_videos_with_subtitles_and_resources(self, tmp_path):
+        """Items carry the same fields the full rglob scan produced"""
+        _make_library(tmp_path)
+        items = LibraryIndex(tmp_path).refresh()
+
+        assert [item["path"] for item in items] == ["Course/01 Intro.mp4", "Course/Part 2/02 Next.MP4"]
+        intro = items[0]
+        assert intro["class"] == "Course"
+        assert intro["subtitles"] == ["Course/01 Intro.srt"]
+        assert [r["name"] for r in intro["resources"]] == ["slides.pdf"]
+
+    def test_restart_reuses_persisted_listings(self, tmp_path, monkeypatch):
+        """A new index loads from the DB and only re-lists directories that changed"""
+        _make_library(tmp_path)
+        LibraryIndex(tmp_path).refresh()
+
+        listed = []
+        scan = library_index.scan_directory
+        monkeypatch.setattr(library_index, "scan_directory",
+                            lambda base, directory: listed.append(directory) or scan(base, directory))
+
+        assert len(LibraryIndex(tmp_path).refresh()) == 2
+        assert listed == []
+
+        (tmp_path / "Course" / "Part 2" / "03 Last.mp4").write_bytes(b"")
+        assert len(LibraryIndex(tmp_path).refresh()) == 3
+        assert listed == [tmp_path / "Course" / "Part 2"]
@@ -33,6 +33,90 @@ class TestCoreAPI:
         assert response.status_code == 200
         assert response.json() == {"status": "healthy"}
 
+    def test_library_scan_is_cached_until_refresh(self, tmp_path, monkeypatch):
+        """Repeat library requests reuse the scan; /api/refresh forces a rescan."""
+        import app.main as main_module
+        monkeypatch.setattr(main_module, "VIDEOS_ROOT", str(tmp_path))
+        main_module._LIB_CACHE.clear()
+        course = tmp_path / "Course"
+        course.mkdir()
+        (course / "01 Intro.mp4").write_bytes(b"")
+        
+        assert len(client.get("/api/library").json()["items"]) == 1
+        # A new file below the root does not change the root's mtime: still cached
+        (course / "02 Next.mp4").write_bytes(b"")
+        assert len(client.get("/api/library").json()["items"]) == 1
+        
+        assert client.get("/api/refresh").status_code == 200
+        assert len(client.get("/api/library").json()["items"]) == 2
+        main_module._LIB_CACHE.clear()
+
+    def test_library_etag_revalidation(self, tmp_path, monkeypatch):
+        """A matching If-None-Match gets a 304 until the library actually changes."""
+        import app.main as main_module
+        monkeypatch.setattr(main_module, "VIDEOS_ROOT", str(tmp_path))
+        main_module._LIB_CACHE.clear()
+        course = tmp_path / "Course"
+        course.mkdir()
+        (course / "01 Intro.mp4").write_bytes(b"")
+
+        etag = client.get("/api/library").headers["etag"]
+        response = client.get("/api/library", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        client.get("/api/refresh")
+        assert client.get("/api/library", headers={"If-None-Match": etag}).status_code == 304
+
+        (course / "02 Next.mp4").write_bytes(b"")
+        client.get("/api/refresh")
+        response = client.get("/api/library", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert len(response.json()["items"]) == 2
+        main_module._LIB_CACHE.clear()
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_library_json_with_and_without_orjson(self, tmp_path, monkeypatch, use_orjson):
+        """The listing serialises the same with ORJSONResponse or the stdlib fallback."""
+        import app.main as main_module
+        from fastapi.responses import JSONResponse, ORJSONResponse
+        if use_orjson:
+            pytest.importorskip("orjson")
+        monkeypatch.setattr(main_module, "_LibraryJSONResponse", ORJSONResponse if use_orjson else JSONResponse)
+        monkeypatch.setattr(main_module, "VIDEOS_ROOT", str(tmp_path))
+        main_module._LIB_CACHE.clear()
+        course = tmp_path / "Café course"
+        course.mkdir()
+        (course / "01 Intro – part 1.mp4").write_bytes(b"")
+
+        response = client.get("/api/library")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        [item] = response.json()["items"]
+        assert "Café course" in item["path"] and "01 Intro – part 1.mp4" in item["path"]
+        main_module._LIB_CACHE.clear()
+
+    def test_video_range_requests(self, tmp_path, monkeypatch):
+        """Open-ended, suffix and clamped ranges are served; malformed ones get a 416."""
+        import app.main as main_module
+        monkeypatch.setattr(main_module, "VIDEOS_ROOT", str(tmp_path))
+        data = bytes(range(256)) * 4
+        (tmp_path / "a.mp4").write_bytes(data)
+
+        response = client.get("/video/a.mp4", headers={"Range": "bytes=1000-"})
+        assert response.status_code == 206
+        assert response.headers["content-range"] == "bytes 1000-1023/1024"
+        assert response.content == data[1000:]
+        response = client.get("/video/a.mp4", headers={"Range": "bytes=-24"})
+        assert response.headers["content-range"] == "bytes 1000-1023/1024"
+        assert response.content == data[-24:]
+        response = client.get("/video/a.mp4", headers={"Range": "bytes=10-5000"})
+        assert response.content == data[10:]
+
+        for bad in ("bytes=-", "bytes=0-1,5-6", "items=0-1", "bytes=2000-", "bytes=9-3"):
+            response = client.get("/video/a.mp4", headers={"Range": bad})
+            assert response.status_code == 416, bad
+            assert response.headers["content-range"] == "bytes */1024"
+
 class TestSecurity:
     """Test basic security measures."""
     
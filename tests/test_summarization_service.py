@@ -1,9 +1,18 @@
 """
 Fast unit tests for Ollama summarization service (mocked operations)
 """
+import asyncio
+import io
+import json
+
+import httpx
 import pytest
+import requests
+from requests.adapters import BaseAdapter
 from unittest.mock import patch, MagicMock
 
+from app.ai_summary.summarization import SummarizationService, _OllamaStream
+
 
 class MockSummarizationService:
     """Mock summarization service for fast testing"""
@@ -228,3 +237,315 @@ class TestSummarizationService:
             result = summarization_service.summarize_transcript(transcript, model)
             assert result['success'] is True
             assert result['summary'] is not None
+
+
+# ---------------------------------------------------------------------------
+# The real SummarizationService, with HTTP answered in-process
+# ---------------------------------------------------------------------------
+
+def _ndjson(*chunks):
+    return b''.join(json.dumps(chunk).encode() + b'\n' for chunk in chunks)
+
+
+class _FakeAdapter(BaseAdapter):
+    """requests transport that answers from a handler: request -> (status, body bytes)"""
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.requests = []
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        self.requests.append(request)
+        status, body = self.handler(request)
+        response = requests.Response()
+        response.status_code = status
+        response.raw = io.BytesIO(body)
+        response.request = request
+        response.url = request.url
+        response.encoding = 'utf-8'
+        return response
+
+    def close(self):
+        pass
+
+
+def _serve(service, handler):
+    """Answer the service's HTTP requests with handler; returns the adapter"""
+    adapter = _FakeAdapter(handler)
+    service._session.mount('http://', adapter)
+    return adapter
+
+
+@pytest.fixture()
+def real_service(monkeypatch):
+    """SummarizationService talking to Ollama at http://ollama:11434"""
+    monkeypatch.delenv('TRTLLM_ENDPOINT', raising=False)
+    monkeypatch.delenv('OLLAMA_MODEL', raising=False)
+    return SummarizationService(ollama_url='http://ollama:11434', model_name='test-model')
+
+
+class TestOllamaStream:
+    """Test accumulation of Ollama's NDJSON stream"""
+
+    def test_done_chunk_ends_the_stream(self):
+        """Text is joined up to the done chunk, whose stats are reported"""
+        stream = _OllamaStream()
+        assert stream.feed(b'{"response": "Hello", "done": false}') is False
+        assert stream.feed(b'{"response": " world", "done": true, "eval_count": 7, "total_duration": 2000000000}') is True
+        result = stream.result(started=0)
+        assert result == {'ok': True, 'text': 'Hello world', 'tokens': 7, 'seconds': 2.0, 'error': None}
+
+    def test_stop_sequence_split_across_chunks(self):
+        """A stop sequence spread over several pieces still stops the stream and is cut off"""
+        stream = _OllamaStream(stop=['</summary>'])
+        assert stream.feed(b'{"response": "Key points </sum"}') is False
+        assert stream.feed(b'{"response": "mary> trailing"}') is True
+        assert stream.result(started=0)['text'] == 'Key points '
+
+    def test_tail_stays_bounded(self):
+        """Only the last few characters are kept for stop matching"""
+        stream = _OllamaStream(stop=['\n\n---'])
+        for _ in range(100):
+            stream.feed(b'{"response": "abcdefghij"}')
+        assert len(stream.tail) <= len('\n\n---') + len('abcdefghij')
+        assert stream.result(started=0)['text'] == 'abcdefghij' * 100
+
+    def test_error_chunk(self):
+        """An error line stops the stream and fails the result"""
+        stream = _OllamaStream()
+        assert stream.feed(b'{"error": "model not found"}') is True
+        assert stream.result(started=0) == {'ok': False, 'error': 'Ollama API error: model not found'}
+
+
+    @pytest.mark.parametrize("loads", ["orjson", "json"])
+    def test_raw_utf8_bytes_decode_with_either_parser(self, monkeypatch, loads):
+        """Lines are parsed straight from bytes, with orjson or the stdlib fallback"""
+        from app.ai_summary import summarization
+        monkeypatch.setattr(summarization, "_loads", pytest.importorskip(loads).loads)
+
+        stream = _OllamaStream()
+        stream.feed('{"response": "Résumé – "}'.encode())
+        stream.feed(json.dumps({'response': 'naïve ✓', 'done': True}).encode())
+        assert stream.result(started=0)['text'] == 'Résumé – naïve ✓'
+
+
+class TestGenerateStreaming:
+    """Test _generate against a streamed /api/generate response"""
+
+    def test_generate_streams_and_ignores_lines_after_done(self, real_service):
+        """Sends a streaming request with the Ollama options; stops reading at done"""
+        adapter = _serve(real_service, lambda request: (200, _ndjson(
+            {'response': 'Part one.', 'done': False},
+            {'response': ' Part two.', 'done': True, 'eval_count': 3},
+            {'response': ' never read', 'done': False},
+        )))
+
+        result = real_service._generate('test-model', 'prompt', temperature=0.4, top_p=0.9,
+                                        max_tokens=100, stop=['</summary>'])
+        assert result['ok'] is True
+        assert result['text'] == 'Part one. Part two.'
+        assert result['tokens'] == 3
+
+        request = adapter.requests[0]
+        assert request.url == 'http://ollama:11434/api/generate'
+        body = json.loads(request.body)
+        assert body['stream'] is True
+        assert body['options']['num_predict'] == 100
+        assert body['options']['stop'] == ['</summary>']
+
+    def test_generate_reports_http_errors(self, real_service):
+        """A non-200 response becomes an API error and drops the health cache"""
+        _serve(real_service, lambda request: (500, b'boom'))
+        real_service._health_cache = (0, 'x', {'healthy': True})
+
+        result = real_service._generate('test-model', 'prompt', temperature=0.4, top_p=0.9, max_tokens=100)
+        assert result == {'ok': False, 'error': 'Ollama API error: 500 - boom'}
+        assert real_service._health_cache is None
+
+
+class TestBackendHealthCache:
+    """Test reuse of healthy backend probes"""
+
+    def test_healthy_probe_is_reused_within_ttl(self, real_service, monkeypatch):
+        """One /api/tags call serves repeat checks until the TTL runs out"""
+        adapter = _serve(real_service, lambda request: (200, b'{"models": [{"name": "test-model"}]}'))
+        clock = [100.0]
+        monkeypatch.setattr('app.ai_summary.summarization.time.monotonic', lambda: clock[0])
+
+        first = real_service.check_backend_health()
+        assert first['healthy'] is True and first['model_ready'] is True
+        clock[0] += real_service.health_cache_ttl - 1
+        assert real_service.check_backend_health() is first
+        assert len(adapter.requests) == 1
+
+        clock[0] += 2
+        real_service.check_backend_health()
+        assert len(adapter.requests) == 2
+
+    def test_unhealthy_probe_is_not_cached(self, real_service):
+        """A failed probe is repeated on the next check"""
+        adapter = _serve(real_service, lambda request: (503, b''))
+
+        assert real_service.check_backend_health()['healthy'] is False
+        assert real_service.check_backend_health()['healthy'] is False
+        assert len(adapter.requests) == 2
+        assert real_service._health_cache is None
+
+
+class TestTensorRTRouting:
+    """Test routing to a TensorRT-LLM server when TRTLLM_ENDPOINT is set"""
+
+    def test_summary_goes_to_trtllm_completions(self, monkeypatch):
+        """Health and generation use the OpenAI-style endpoints, not Ollama"""
+        monkeypatch.setenv('TRTLLM_ENDPOINT', 'http://trtllm:8000/')
+        monkeypatch.setenv('TRTLLM_MODEL', 'engine-model')
+        service = SummarizationService(ollama_url='http://ollama:11434')
+
+        def handler(request):
+            if request.url.endswith('/health'):
+                return 200, b''
+            return 200, json.dumps({
+                'choices': [{'text': '• The main point of the video explained clearly'}],
+                'usage': {'completion_tokens': 12},
+            }).encode()
+        adapter = _serve(service, handler)
+
+        result = service.summarize_transcript('A transcript about deployment.')
+        assert result['success'] is True
+        assert result['summary'] == '• The main point of the video explained clearly'
+        assert result['tokens_used'] == 12
+
+        assert [r.url for r in adapter.requests] == [
+            'http://trtllm:8000/health', 'http://trtllm:8000/v1/completions',
+        ]
+        body = json.loads(adapter.requests[1].body)
+        assert body['model'] == 'engine-model'
+        assert body['max_tokens'] == service.num_predict
+        assert body['stop'] == ['</summary>', '\n\n---']
+        assert 'options' not in body and 'stream' not in body
+
+    def test_unreachable_trtllm_is_reported_by_name(self, monkeypatch):
+        """Health failures name the TensorRT-LLM backend"""
+        monkeypatch.setenv('TRTLLM_ENDPOINT', 'http://trtllm:8000')
+        service = SummarizationService(ollama_url='http://ollama:11434')
+        _serve(service, lambda request: (502, b''))
+
+        result = service.summarize_transcript('A transcript.')
+        assert result['success'] is False
+        assert result['error'] == 'TensorRT-LLM service unavailable: TensorRT-LLM returned status 502'
+
+
+class TestSummarizeTranscriptAsync:
+    """Test the httpx-based async summary path"""
+
+    @staticmethod
+    def _summarize(service, handler, transcript='A transcript about docker deployment.'):
+        async def run():
+            service._aclient = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                return await service.summarize_transcript_async(transcript)
+            finally:
+                await service.aclose()
+        return asyncio.run(run())
+
+    def test_streams_summary_from_ollama(self, real_service):
+        """The async path streams /api/generate and post-processes like the sync one"""
+        _serve(real_service, lambda request: (200, b'{"models": [{"name": "test-model"}]}'))
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            return httpx.Response(200, content=_ndjson(
+                {'response': '- First takeaway from the video', 'done': False},
+                {'response': '\n- Second takeaway</summary>', 'done': False},
+                {'response': 'ignored', 'done': True},
+            ))
+
+        result = self._summarize(real_service, handler)
+        assert result['success'] is True
+        assert result['summary'] == '• First takeaway from the video\n• Second takeaway'
+        assert result['model_used'] == 'test-model'
+        assert str(sent[0].url) == 'http://ollama:11434/api/generate'
+        assert json.loads(sent[0].content)['stream'] is True
+        assert real_service._aclient is None
+
+    def test_transport_error_reports_connection_failure(self, real_service):
+        """httpx transport errors map to the same message as the sync path"""
+        _serve(real_service, lambda request: (200, b'{"models": []}'))
+
+        def handler(request):
+            raise httpx.ConnectError('refused', request=request)
+
+        result = self._summarize(real_service, handler)
+        assert result == {'success': False, 'summary': None, 'error': 'Connection to Ollama service failed'}
+
+    def test_empty_transcript_fails_before_any_request(self, real_service):
+        """Local validation runs first; no HTTP is attempted"""
+        adapter = _serve(real_service, lambda request: (200, b'{"models": []}'))
+
+        def handler(request):
+            raise AssertionError('no request expected')
+
+        result = self._summarize(real_service, handler, transcript='   ')
+        assert result['error'] == 'Empty transcript provided'
+        assert adapter.requests == []
+
+
+class TestKeyTopics:
+    """Test the precompiled per-topic keyword patterns"""
+
+    def test_topics_match_plain_substring_search(self, real_service):
+        """Same topics as checking every keyword with `in`, overlapping keywords included"""
+        from app.ai_summary.summarization import _TOPIC_KEYWORDS
+
+        for summary in (
+            "We design a Database schema and run SQL queries.",
+            "Deploying with Docker and CI/CD on AWS.",
+            "Nothing relevant here.",
+        ):
+            lower = summary.lower()
+            expected = [topic for topic, words in _TOPIC_KEYWORDS.items() if any(w in lower for w in words)]
+            assert real_service.extract_key_topics(summary) == expected
+        # "database" contains "data": both topics are found
+        topics = real_service.extract_key_topics("A database tour")
+        assert "Database" in topics and "Data Science" in topics
+
+
+class TestGenerateJumpPoints:
+    """Test LLM jump point parsing and the keyword-biased fallback"""
+
+    SEGMENTS = [
+        {'start': 0.2, 'end': 25.0, 'text': 'Welcome. First window opens here'},
+        {'start': 0.4, 'end': 30.0, 'text': 'Intro to the course. Same second as before'},
+        {'start': 60.0, 'end': 85.0, 'text': 'Some filler talk that goes on'},
+        {'start': 120.0, 'end': 145.0, 'text': 'Recap of the setup. Done'},
+    ]
+
+    def test_llm_array_is_parsed_sorted_and_filtered(self, real_service):
+        """The first JSON array in the reply is used; bad items are dropped"""
+        reply = 'Sure! [{"seconds": 120, "title": "Recap"}, {"seconds": 0, "title": "Intro"}, "x", {"seconds": 5, "title": " "}]'
+
+        def handler(request):
+            if request.url.endswith('/api/tags'):
+                return 200, b'{"models": []}'
+            return 200, _ndjson({'response': reply, 'done': True})
+        _serve(real_service, handler)
+
+        points = real_service.generate_jump_points(self.SEGMENTS)
+        assert points == [{'seconds': 0, 'title': 'Intro'}, {'seconds': 120, 'title': 'Recap'}]
+
+    def test_fallback_keeps_one_point_per_second(self, real_service):
+        """Windows starting in the same second collapse to one, in time order
+
+        As with the dict this replaced, the last pick wins: the keyword window
+        "Intro..." is picked first by score, then "Welcome..." fills a slot.
+        """
+        _serve(real_service, lambda request: (503, b''))
+
+        points = real_service.generate_jump_points(self.SEGMENTS)
+        assert points == [
+            {'seconds': 0, 'title': 'Welcome'},
+            {'seconds': 60, 'title': 'Some filler talk that goes on'},
+            {'seconds': 120, 'title': 'Recap of the setup'},
+        ]
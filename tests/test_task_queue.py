@@ -0,0 +1,171 @@
+"""
+Test the in-memory TaskQueue (no worker thread is started)
+"""
+from app.ai_summary.task_queue import TaskQueue
+
+
+class TestActiveTaskIndex:
+    """Test the video_path -> active task index"""
+
+    def test_active_task_tracks_add_process_and_cancel(self):
+        """Tasks are findable by video path until they finish or are cancelled"""
+        queue = TaskQueue()
+        queue.register_handler('video_summary', lambda task: {'success': True})
+
+        first = queue.add_task('video_summary', {'video_path': '/videos/a.mp4'})
+        second = queue.add_task('video_summary', {'video_path': '/videos/b.mp4'})
+        assert queue.find_active_task('/videos/a.mp4') == first
+        assert queue.find_active_task('/videos/b.mp4') == second
+        assert queue.find_active_task('/videos/missing.mp4') is None
+
+        queue._process_task(first)
+        assert queue.find_active_task('/videos/a.mp4') is None
+
+        assert queue.cancel_task(second)
+        assert queue.find_active_task('/videos/b.mp4') is None
+
+    def test_finished_older_task_keeps_newer_entry(self):
+        """A restarted video stays active while its older task winds down"""
+        queue = TaskQueue()
+        queue.register_handler('video_summary', lambda task: {'success': True})
+
+        old = queue.add_task('video_summary', {'video_path': '/videos/a.mp4'})
+        new = queue.add_task('video_summary', {'video_path': '/videos/a.mp4'})
+        queue._process_task(old)
+        assert queue.find_active_task('/videos/a.mp4') == new
+
+    def test_cancelled_task_is_skipped_when_dequeued(self):
+        """A task cancelled while queued is not run when the worker reaches it"""
+        queue = TaskQueue()
+        calls = []
+        queue.register_handler('video_summary', lambda task: calls.append(task.task_id))
+
+        task_id = queue.add_task('video_summary', {'video_path': '/videos/a.mp4'})
+        assert queue.cancel_task(task_id)
+        queue._process_task(task_id)
+        assert calls == []
+        assert queue.get_task(task_id).status.value == 'cancelled'
+
+
+class TestTaskLifecycle:
+    """Test cleanup and status snapshots of Task objects"""
+
+    def test_cleanup_leaves_held_tasks_untouched(self):
+        """A Task removed by cleanup keeps its state for anyone still holding it"""
+        queue = TaskQueue()
+        queue.register_handler('video_summary', lambda task: {'success': True})
+
+        old_id = queue.add_task('video_summary', {'video_path': '/videos/a.mp4'})
+        queue._process_task(old_id)
+        old_task = queue.get_task(old_id)
+        queue.cleanup_old_tasks(max_age_hours=-1)
+        assert queue.get_task(old_id) is None
+
+        new_id = queue.add_task('video_summary', {'video_path': '/videos/b.mp4'})
+        assert queue.get_task(new_id) is not old_task
+        assert old_task.task_id == old_id
+        assert old_task.status.value == 'completed'
+        assert old_task.result == {'success': True}
+        assert old_task.data == {'video_path': '/videos/a.mp4'}
+
+    def test_status_timestamps_match_the_task(self):
+        """The preformatted timestamps follow the task through its run"""
+        queue = TaskQueue()
+        queue.register_handler('video_summary', lambda task: {'success': True})
+        task_id = queue.add_task('video_summary', {'video_path': '/videos/a.mp4'})
+        task = queue.get_task(task_id)
+
+        status = queue.get_task_status(task_id)
+        assert status['created_at'] == task.created_at.isoformat()
+        assert status['started_at'] is None and status['completed_at'] is None
+
+        queue._process_task(task_id)
+        status = queue.get_task_status(task_id)
+        assert status['started_at'] == task.started_at.isoformat()
+        assert status['completed_at'] == task.completed_at.isoformat()
+
+    def test_status_is_a_fresh_dict_per_poll(self):
+        """Each poll reflects the latest progress, and callers may modify what they get"""
+        queue = TaskQueue()
+        task_id = queue.add_task('video_summary', {'video_path': '/videos/a.mp4'})
+
+        first = queue.get_task_status(task_id)
+        first['progress'] = 'changed by caller'
+        assert queue.get_task_status(task_id)['progress'] == ''
+
+        queue.update_task_progress(task_id, 'Transcribing', 40)
+        status = queue.get_task_status(task_id)
+        assert status['progress'] == 'Transcribing' and status['progress_percent'] == 40
+
+
+class TestQueueStatus:
+    """Test the incrementally maintained status counters"""
+
+    def test_status_counts_follow_every_transition(self):
+        """Counts match the tasks' actual statuses through add, run, cancel and cleanup"""
+        queue = TaskQueue()
+        queue.register_handler('video_summary', lambda task: {'success': True})
+        queue.register_handler('broken', lambda task: 1 / 0)
+
+        done = queue.add_task('video_summary', {'video_path': '/videos/a.mp4'})
+        failed = queue.add_task('broken', {})
+        cancelled = queue.add_task('video_summary', {'video_path': '/videos/b.mp4'})
+        queue.add_task('video_summary', {'video_path': '/videos/c.mp4'})
+        queue._process_task(done)
+        queue._process_task(failed)
+        queue.cancel_task(cancelled)
+
+        status = queue.get_queue_status()
+        assert status['pending_tasks'] == 1
+        assert status['status_counts'] == {
+            'pending': 1, 'processing': 0, 'completed': 1, 'failed': 1, 'cancelled': 1,
+        }
+
+        queue.cleanup_old_tasks(max_age_hours=-1)
+        status = queue.get_queue_status()
+        assert status['total_tasks'] == 2
+        assert status['status_counts']['completed'] == 0
+        assert status['status_counts']['failed'] == 0
+
+    def test_task_cancelled_before_start_is_never_submitted(self):
+        """Cancelling before start() leaves a tombstone that start() skips"""
+        queue = TaskQueue(max_workers=1)
+        ran = []
+        queue.register_handler('video_summary', lambda task: ran.append(task.data['video_path']))
+
+        cancelled = queue.add_task('video_summary', {'video_path': '/videos/a.mp4'})
+        queue.add_task('video_summary', {'video_path': '/videos/b.mp4'})
+        assert queue.cancel_task(cancelled)
+        queue.start()
+        assert queue.get_task(cancelled).future is None
+        # Drain the executor (runs everything submitted) before stopping the queue
+        queue._executor.shutdown(wait=True)
+        queue.stop()
+        assert ran == ['/videos/b.mp4']
+
+    def test_stop_cancels_queued_tasks(self):
+        """Tasks still queued at stop() are cancelled and leave the index; the running one finishes"""
+        import threading
+        queue = TaskQueue(max_workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def handler(task):
+            started.set()
+            release.wait(5)
+            return {'success': True}
+        queue.register_handler('video_summary', handler)
+
+        queue.start()
+        running = queue.add_task('video_summary', {'video_path': '/videos/a.mp4'})
+        queued = queue.add_task('video_summary', {'video_path': '/videos/b.mp4'})
+        assert started.wait(5)
+        queue.stop()
+
+        assert queue.get_task(queued).status.value == 'cancelled'
+        assert queue.find_active_task('/videos/b.mp4') is None
+        assert queue.get_queue_status()['status_counts']['pending'] == 0
+
+        future = queue.get_task(running).future
+        release.set()
+        future.result(timeout=5)
+        assert queue.get_task(running).status.value == 'completed'
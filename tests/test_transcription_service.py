@@ -137,3 +137,31 @@ class TestTranscriptionService:
         transcript = result['transcript']
         assert 'This is a mock transcript' in transcript
         # In real implementation, could test for language detection
+
+
+class TestAudioDecoding:
+    """Test the cached audio decode used ahead of model.transcribe"""
+
+    def test_wav_segment_is_decoded_once(self, tmp_path):
+        """16 kHz mono WAV segments are read directly and reused on repeat calls"""
+        import wave
+        from app.ai_summary.transcription import _load_audio
+
+        path = tmp_path / "segment.wav"
+        with wave.open(str(path), 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes((16384).to_bytes(2, 'little', signed=True) * 1600)
+
+        samples = _load_audio(str(path))
+        assert samples.dtype.name == 'float32'
+        assert len(samples) == 1600
+        assert samples[0] == pytest.approx(0.5)
+        assert _load_audio(str(path)) is samples
+
+        # Only the latest decode stays cached
+        other = tmp_path / "other.wav"
+        other.write_bytes(path.read_bytes())
+        _load_audio(str(other))
+        assert _load_audio(str(path)) is not samples